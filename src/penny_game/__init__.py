@@ -0,0 +1,52 @@
+# penny_game
+# The Penny Game: the game engine, COM strategies, simulation and analysis.
+# Names are imported from their modules on first use, so `import penny_game`
+# is instant and embedding the engine only loads the parts that are used.
+# A name is never the same as a submodule's: the import system sets the
+# submodule as an attribute of the package, and the two would replace each
+# other. The replay() and snapshot() functions are imported from their modules.
+
+# Usage Example:
+# from penny_game import Game, simulate_game
+# result = simulate_game(3, seed=1, strategies=["threshold"] * 3)
+
+import importlib
+
+_EXPORTS = {
+    "BitmaskBoard": "bitmask_board",
+    "DiceStream": "dice",
+    "Game": "game",
+    "GameBoard": "game_board",
+    "GameMetrics": "metrics",
+    "GameRecord": "replay",
+    "GameResult": "simulation",
+    "GameStats": "stats",
+    "MCTSStrategy": "mcts",
+    "Player": "player",
+    "ResultStore": "store",
+    "Rules": "rules",
+    "build_strategy": "strategies",
+    "compare_strategies": "compare",
+    "get_rules": "rules",
+    "get_strategy": "strategies",
+    "restore": "snapshot",
+    "run_batch": "batch",
+    "run_sweep": "sweep",
+    "run_tournament": "tournament",
+    "simulate_game": "simulation",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'penny_game' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
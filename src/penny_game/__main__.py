@@ -0,0 +1,8 @@
+# __main__.py
+# Runs the command line interface: python -m penny_game <command>.
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
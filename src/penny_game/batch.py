@@ -0,0 +1,306 @@
+# batch.py
+# This file contains the batch simulator behind `python -m penny_game simulate`.
+# It plays many COM games across worker processes and streams one row per game
+# to a JSONL or CSV file or a ResultStore as shards finish, so a run of any size holds only a
+# few shards in memory. An interrupted run keeps every row already written.
+
+# Dependencies:
+#   - array, concurrent.futures, csv, io, os, signal, sys, time
+#   - DiceStream class
+#   - simulation (simulate_game)
+#   - stats (GameStats)
+#   - rules (get_rules)
+#   - strategies (build_strategy)
+#   - sweep (expand_grid)
+#   - store (ResultStore), imported for store output
+
+# Usage Example:
+# stats = run_batch(100000, players=3, strategies="threshold", seed=1,
+#                   output="games.jsonl", progress=print_progress)
+# print(stats.games, stats.win_interval(1))
+
+
+# How it works:
+# - Games are split into shards of consecutive game numbers. Game n plays from
+#   child n of the root DiceStream, as in sweeps, so a row can be replayed from
+#   the seed and its game number, whatever the worker count.
+# - Workers return each shard as one flat array of integers. The main process
+#   writes shards in game order with one large write per shard, and keeps only
+#   a few shards in flight at a time.
+# - Workers ignore Ctrl-C. The main process stops handing out shards, writes
+#   nothing partial and closes the file, so the output ends on a whole row.
+
+import csv
+import io
+import os
+import signal
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .dice import DiceStream
+from .rules import get_rules
+from .simulation import simulate_game
+from .stats import GameStats
+from .strategies import build_strategy
+from .sweep import expand_grid
+
+FORMATS = ("jsonl", "csv", "store")
+FIELDS = 4 # winner (0 for none), first player, turns, crashes; then the hands
+
+
+class JsonlWriter:
+    """
+    The JsonlWriter class writes one JSON object per game and line.
+    """
+
+    def __init__(self, file, num_players, seed):
+        self.file = file
+        self.num_players = num_players
+        self.seed = seed
+
+    def write_shard(self, first_game, rows):
+        """
+        Writes the rows of a shard, starting at game number first_game.
+        """
+        width = FIELDS + self.num_players
+        seed = "null" if self.seed is None else self.seed
+        lines = []
+        for game, start in enumerate(range(0, len(rows), width), first_game):
+            winner, first, turns, crashes = rows[start:start + FIELDS]
+            hands = ",".join(map(str, rows[start + FIELDS:start + width]))
+            lines.append(
+                f'{{"game":{game},"seed":{seed},"winner":{winner or "null"},'
+                f'"first_player":{first},"turns":{turns},"crashes":{crashes},'
+                f'"hands":[{hands}]}}\n'
+            )
+        self.file.write("".join(lines))
+
+
+class CsvWriter:
+    """
+    The CsvWriter class writes a header and one CSV row per game, with a
+    column for each player's final hand.
+    """
+
+    def __init__(self, file, num_players, seed):
+        self.file = file
+        self.num_players = num_players
+        self.seed = "" if seed is None else seed
+        header = ["game", "seed", "winner", "first_player", "turns", "crashes"]
+        header += [f"hand_{seat}" for seat in range(1, num_players + 1)]
+        file.write(",".join(header) + "\n")
+
+    def write_shard(self, first_game, rows):
+        """
+        Writes the rows of a shard, starting at game number first_game.
+        """
+        width = FIELDS + self.num_players
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows(
+            (game, self.seed, rows[start] or "") + tuple(rows[start + 1:start + width])
+            for game, start in enumerate(range(0, len(rows), width), first_game)
+        )
+        self.file.write(buffer.getvalue())
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter}
+
+
+def output_format(path, fmt=None):
+    """
+    Returns the output format for a path: fmt if given, else from the extension.
+
+    Raises:
+    -------
+    ValueError: If the format is unknown.
+    """
+    if fmt is None:
+        extension = os.path.splitext(path)[1].lower()
+        fmt = {".csv": "csv", ".store": "store"}.get(extension, "jsonl")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}. Choose from: {', '.join(FORMATS)}.")
+    return fmt
+
+
+def play_rows(config, seed, first_game, num_games, max_turns=10000):
+    """
+    Plays games first_game to first_game + num_games - 1 of a sweep cell.
+
+    Returns:
+    --------
+    array: One flat array of integers with, per game, the winner (0 for none),
+    first player, turns, crashes and every final hand.
+    """
+    rules = get_rules(config["rules"])
+    strategies = [
+        build_strategy(spec if isinstance(spec, str) else tuple(spec)) if spec is not None
+        else None for spec in config["strategies"]
+    ]
+    root = DiceStream(seed, faces=rules.die_faces)
+    rows = array("l")
+    for index in range(first_game, first_game + num_games):
+        result = simulate_game(config["players"], config["com"], dice=root.child(index),
+                               strategies=strategies, max_turns=max_turns, rules=rules)
+        rows.extend((result.winner or 0, result.first_player, result.turns, result.crashes))
+        rows.extend(result.hands)
+    return rows
+
+
+def _ignore_interrupts():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _add_rows(stats, rows, num_players):
+    """
+    Adds a shard of rows to the running statistics.
+    """
+    width = FIELDS + num_players
+    row = _Row()
+    for start in range(0, len(rows), width):
+        row.winner, row.first_player, row.turns, row.crashes = rows[start:start + FIELDS]
+        row.hands = rows[start + FIELDS:start + width]
+        stats.add(row)
+
+
+class _Row:
+    __slots__ = ("winner", "first_player", "turns", "crashes", "hands")
+
+
+def run_batch(games, players=2, com=None, strategies=None, rules=None, seed=0, output=None,
+              fmt=None, workers=None, shard_size=1000, max_turns=10000, progress=None):
+    """
+    Plays a batch of COM games, streaming one row per game to a file.
+
+    Parameters:
+    -----------
+    games: int
+        The number of games to play.
+    players, com: int
+        Seats per game and how many are COM players (default: all). Human seats
+        need a strategy, since nobody can be asked.
+    strategies: str, tuple or list
+        A strategy spec (a registered name or a (name, params) pair) for every
+        seat, or a list with one per seat (default: the original COM choice).
+    rules: Rules or str
+        The rules to play by (default: the standard rules).
+    seed: int
+        The root seed; game n plays from its child n.
+    output: str, file or ResultStore
+        Where rows go: a path ("-" for standard output), an open text file or
+        a store.ResultStore, which also records the cell's settings. None plays
+        the games for their statistics only.
+    fmt: str
+        "jsonl", "csv" or "store" (default: from the file extension, else JSONL).
+    workers: int
+        Worker processes (default: one per CPU); 1 plays in this process.
+    shard_size: int
+        Games per shard, which is also the unit of writing.
+    max_turns: int
+        Stops a game that has not been won after this many turns.
+    progress: callable
+        Called as progress(done, total, seconds) after every shard.
+
+    Returns:
+    --------
+    GameStats: Statistics over every game written. If the run was interrupted
+    its `interrupted` attribute is True and it covers the games written so far.
+
+    Raises:
+    -------
+    ValueError: If the settings are invalid.
+    """
+    if isinstance(strategies, list): # One per seat, not a grid of choices
+        strategies = [strategies]
+    config = expand_grid({"players": players, "com": com, "rules": rules,
+                          "strategies": strategies})[0]
+    play_rows(config, seed, 0, 0) # Fails on a bad strategy before any work starts
+
+    close = False
+    file = writer = None
+    if isinstance(output, str):
+        fmt = output_format(output, fmt)
+        if fmt == "store":
+            from .store import ResultStore
+
+            output = ResultStore(output, players)
+        elif output == "-":
+            file = sys.stdout
+        else:
+            file = open(output, "w", newline="", buffering=1 << 20)
+            close = True
+    elif output is not None and not hasattr(output, "writer"):
+        if output_format("", fmt) == "store":
+            raise ValueError("Store output needs a directory path or a ResultStore.")
+        fmt = output_format("", fmt)
+        file = output
+    if hasattr(output, "writer"): # A ResultStore appends the shards itself
+        writer = output.writer(config, seed)
+    elif file is not None:
+        writer = WRITERS[fmt](file, players, seed)
+
+    stats = GameStats(players)
+    stats.interrupted = False
+    shards = [(first, min(shard_size, games - first)) for first in range(0, games, shard_size)]
+    job = (config, seed)
+    start = time.perf_counter()
+
+    def finish(first, rows):
+        if writer is not None:
+            writer.write_shard(first, rows)
+        _add_rows(stats, rows, players)
+        if progress is not None:
+            progress(stats.games, games, time.perf_counter() - start)
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers == 1 or len(shards) <= 1:
+            for first, count in shards:
+                finish(first, play_rows(*job, first, count, max_turns))
+        else:
+            _run_parallel(job, shards, max_turns, workers, finish)
+    except KeyboardInterrupt:
+        stats.interrupted = True
+    finally:
+        if file is not None:
+            file.flush()
+        if close:
+            file.close()
+    return stats
+
+
+def _run_parallel(job, shards, max_turns, workers, finish):
+    """
+    Plays shards in worker processes, finishing them in game order with at
+    most two shards per worker in flight.
+    """
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=_ignore_interrupts)
+    pending = []
+    try:
+        next_shard = 0
+        while next_shard < len(shards) or pending:
+            while next_shard < len(shards) and len(pending) < 2 * workers:
+                first, count = shards[next_shard]
+                pending.append((first, executor.submit(play_rows, *job, first, count, max_turns)))
+                next_shard += 1
+            first, future = pending.pop(0)
+            finish(first, future.result())
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def print_progress(done, total, seconds, stream=None):
+    """
+    Writes a one-line progress report to standard error, overwriting the last one.
+    """
+    stream = stream if stream is not None else sys.stderr
+    rate = done / seconds if seconds else 0.0
+    remaining = (total - done) / rate if rate else 0.0
+    stream.write(f"\r{done:,}/{total:,} games, {rate:,.0f} games/s, {remaining:.0f}s left ")
+    if done >= total:
+        stream.write("\n")
+    stream.flush()
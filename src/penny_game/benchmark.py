@@ -0,0 +1,321 @@
+# benchmark.py
+# This file contains the benchmark suite. Micro-benchmarks time the hot calls
+# of the game one at a time; macro-benchmarks time complete headless games.
+# Results can be saved as a baseline and later runs fail when a benchmark's
+# throughput drops too far below it.
+
+# Dependencies:
+#   - argparse, json, time
+#   - Game, Player, GameBoard and BitmaskBoard classes
+#   - DiceStream class
+#   - GameMetrics class
+#   - simulation (simulate_game)
+#   - snapshot (snapshot, restore)
+
+# Usage Example:
+# python -m penny_game bench                      # compare with benchmarks/baseline.json
+# python -m penny_game bench --tolerance 10       # fail on a drop of more than 10%
+# python -m penny_game bench --save               # record a new baseline
+# python -m penny_game bench --only games_4p add_penny
+
+
+# How it works:
+# - A benchmark is a function that takes a count n and performs n operations.
+# - Each one is run with growing n until a run takes at least `min_time`
+#   seconds, then repeated, and the best run's operations per second is kept.
+#   The best run is the one least disturbed by the rest of the machine.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from .bitmask_board import BitmaskBoard
+from .dice import DiceStream
+from .game import Game
+from .game_board import GameBoard
+from .metrics import GameMetrics
+from .player import Player
+from .simulation import simulate_game
+from .snapshot import restore, snapshot
+
+DEFAULT_BASELINE = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "benchmarks", "baseline.json"))
+DEFAULT_TOLERANCE = 25 # Percent drop in throughput that counts as a regression
+
+
+def _rolls(count, seed=0):
+    """
+    Returns a list of `count` fixed dice rolls, so the benchmarks time the code
+    under test and not the dice.
+    """
+    dice = DiceStream(seed)
+    return [dice.roll() for _ in range(count)]
+
+
+_ROLLS = _rolls(4096)
+
+
+def bench_add_penny(n, board_class=GameBoard):
+    """
+    Adds n pennies, clearing the board after each crash like the game does.
+    """
+    board = board_class()
+    rolls = _ROLLS
+    add_penny = board.add_penny
+    for index in range(n):
+        add_penny(rolls[index & 4095])
+        if board.crash:
+            board.clear_board()
+
+
+def bench_clear_board(n, board_class=GameBoard):
+    """
+    Clears n boards holding three pennies each.
+    """
+    board = board_class()
+    for _ in range(n):
+        board.add_penny(1)
+        board.add_penny(3)
+        board.add_penny(5)
+        board.clear_board()
+
+
+def bench_who_first(n, num_players=4):
+    """
+    Decides who goes first n times, without any output.
+    """
+    game = Game(dice=DiceStream(0))
+    game.numplayers = num_players
+    game.numcom = num_players
+    game.create_players()
+    for _ in range(n):
+        game.who_first(announce=False)
+
+
+def bench_check_reroll(n):
+    """
+    Makes n default COM reroll decisions.
+    """
+    player = Player(dice=DiceStream(0))
+    check_reroll = player.check_reroll
+    for _ in range(n):
+        check_reroll()
+
+
+def bench_play_turn(n, num_players=4, metrics=None):
+    """
+    Plays n turns of headless games, starting a new game whenever one is won.
+    """
+    game = Game(board=BitmaskBoard(), dice=DiceStream(0))
+    game.numplayers = num_players
+    game.numcom = num_players
+    game.create_players()
+    game.metrics = metrics
+    game.start(announce=False)
+    for _ in range(n):
+        if game.game_winner:
+            game.reset()
+            game.start(announce=False)
+        game.play_turn()
+
+
+def _game_in_progress(num_players=4, turns=30):
+    """
+    Returns a headless game that has played a few turns.
+    """
+    game = Game(board=BitmaskBoard(), dice=DiceStream(0))
+    game.numplayers = num_players
+    game.numcom = num_players
+    game.create_players()
+    game.start(announce=False)
+    while game.turns < turns and not game.game_winner:
+        game.play_turn()
+    return game
+
+
+def bench_snapshot(n):
+    """
+    Snapshots a game in progress n times.
+    """
+    game = _game_in_progress()
+    for _ in range(n):
+        snapshot(game)
+
+
+def bench_restore(n):
+    """
+    Restores a game in progress from its snapshot n times.
+    """
+    data = snapshot(_game_in_progress())
+    for _ in range(n):
+        restore(data, board=BitmaskBoard())
+
+
+def bench_games(n, num_players):
+    """
+    Plays n complete headless games.
+    """
+    for seed in range(n):
+        simulate_game(num_players, seed=seed)
+
+
+BENCHMARKS = {
+    "add_penny": bench_add_penny,
+    "clear_board": bench_clear_board,
+    "bitmask_add_penny": lambda n: bench_add_penny(n, BitmaskBoard),
+    "bitmask_clear_board": lambda n: bench_clear_board(n, BitmaskBoard),
+    "who_first": bench_who_first,
+    "check_reroll": bench_check_reroll,
+    "play_turn": bench_play_turn,
+    "play_turn_metrics": lambda n: bench_play_turn(n, metrics=GameMetrics()),
+    "snapshot": bench_snapshot,
+    "restore": bench_restore,
+}
+for _players in range(2, 6):
+    BENCHMARKS[f"games_{_players}p"] = lambda n, players=_players: bench_games(n, players)
+
+
+def measure(benchmark, min_time=0.2, repeat=5):
+    """
+    Times a benchmark and returns its best throughput.
+
+    Parameters:
+    -----------
+    benchmark: callable
+        Called as benchmark(n) to perform n operations.
+    min_time: float
+        The shortest run, in seconds, that counts as a measurement.
+    repeat: int
+        The number of measured runs.
+
+    Returns:
+    --------
+    float: Operations per second in the fastest run.
+    """
+    n = 1
+    while True:
+        start = time.perf_counter()
+        benchmark(n)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        n *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed * 1.2) + 1))
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        benchmark(n)
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def run_benchmarks(names=None, min_time=0.2, repeat=5):
+    """
+    Runs benchmarks and returns their throughputs.
+
+    Parameters:
+    -----------
+    names: list
+        The benchmarks to run (default: all of BENCHMARKS).
+
+    Returns:
+    --------
+    dict: Benchmark name to operations per second.
+
+    Raises:
+    -------
+    ValueError: If a name is not a known benchmark.
+    """
+    names = list(BENCHMARKS) if not names else names
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmarks: {', '.join(unknown)}. Choose from: {', '.join(BENCHMARKS)}."
+        )
+    return {name: measure(BENCHMARKS[name], min_time, repeat) for name in names}
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Finds benchmarks whose throughput fell more than `tolerance` percent below
+    the baseline. Benchmarks missing from the baseline are skipped.
+
+    Returns:
+    --------
+    list: (name, baseline ops/s, current ops/s, percent change) for each regression.
+    """
+    regressions = []
+    for name, current in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        change = (current - expected) / expected * 100
+        if change < -tolerance:
+            regressions.append((name, expected, current, change))
+    return regressions
+
+
+def load_baseline(path=DEFAULT_BASELINE):
+    """
+    Reads a baseline file, returning an empty baseline if there is none.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def save_baseline(results, path=DEFAULT_BASELINE):
+    """
+    Writes results as the new baseline, keeping earlier entries for benchmarks
+    that were not run.
+    """
+    merged = dict(load_baseline(path))
+    merged.update(results)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {"python": sys.version.split()[0],
+             "results": {name: round(value, 1) for name, value in sorted(merged.items())}},
+            file, indent=2,
+        )
+        file.write("\n")
+
+
+def main(argv=None):
+    """
+    Runs the suite from the command line. Returns 1 if anything regressed.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark The Penny Game.")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="benchmarks to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed drop in throughput, in percent (default: %(default)s)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="shortest timed run, in seconds (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--save", action="store_true", help="save the results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.min_time, args.repeat)
+    baseline = load_baseline(args.baseline)
+    for name, value in results.items():
+        expected = baseline.get(name)
+        change = f"{(value - expected) / expected * 100:+6.1f}%" if expected else "    new"
+        print(f"{name:20} {value:14,.0f} ops/s  {change}")
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, expected, current, change in regressions:
+        print(f"REGRESSION {name}: {current:,.0f} ops/s is {-change:.1f}% below "
+              f"the baseline of {expected:,.0f} ops/s")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+# bitmask_board.py
+# This file contains the BitmaskBoard class, a drop-in replacement for GameBoard
+# that stores which slots hold a penny in the bits of a single integer.
+
+# Dependencies:
+# - sinks (DEFAULT_SINK)
+# - rules (DEFAULT_RULES)
+
+# Usage Example:
+# board = BitmaskBoard()
+# board.add_penny(3)
+# board.print_board()
+
+
+# Class Responsibilities:
+# - Track slot occupancy as a 6-bit integer (bit k - 1 is slot k), or as many
+#   bits as the rules have slots.
+# - Detect crashes with a bit test and count pickups with a popcount.
+# - Offer the same public API as GameBoard, including a `state` dict view.
+
+from .rules import DEFAULT_RULES
+from .sinks import DEFAULT_SINK
+
+SLOT_BITS = DEFAULT_RULES.slot_bits
+FREE_SLOT_BIT = DEFAULT_RULES.free_bit
+# Number of set bits in every 6-bit mask
+POPCOUNT = DEFAULT_RULES.popcount
+
+
+class BitmaskBoard:
+    """
+    The BitmaskBoard class manages the game board (6 slots by default) with a bitmask.
+    It behaves like GameBoard, but adding a penny is a bit test and a bit set,
+    and clearing the board is a table lookup and a reset of the mask.
+
+    Attributes:
+    ----------
+    mask: int
+        The occupied slots, with bit k - 1 set when slot k holds a penny.
+        Equal boards have equal masks, so it can be used as a cache key.
+    crash: bool
+        A flag that indicates whether a crash (penny collision) has occured
+    state: dict
+        A dictionary view of the board, built on demand, in the same form as
+        GameBoard.state. Assigning a dictionary loads it into the board.
+    metrics: GameMetrics
+        Counts every penny placed when set (default: None).
+    sink: ConsoleSink
+        Where print_board writes the board (default: the console).
+    rules: Rules
+        The rules the board follows: its slots and which slot empties itself.
+
+    Methods:
+    ---------
+    print_board():
+        Prints a visual representation of the current board state.
+
+    add_penny(slot):
+        Adds a penny to the specified slot. If a penny is already in that slot,
+        it sets the crash flag to True.
+
+    clear_board():
+        Resets the board and returns the number of pennies collected from all slots.
+
+    reset():
+        Empties the board for a new game.
+    """
+    __slots__ = ("mask", "crash", "_spill", "metrics", "sink", "rules", "_bits", "_keep",
+                 "_popcount")
+
+    def __init__(self, sink=None, rules=None):
+        """
+        Initializes the BitmaskBoard with empty slots (six by default) and sets the crash
+        flag to False.
+
+        Parameters:
+        -----------
+        sink: ConsoleSink
+            Where print_board writes the board (default: the console).
+        rules: Rules
+            The rules to play by (default: the standard 6-slot rules).
+        """
+        self.rules = rules = rules if rules is not None else DEFAULT_RULES
+        self._bits = rules.slot_bits
+        self._keep = rules.crash_mask # Every slot but the free one
+        self._popcount = rules.popcount
+        self.mask = 0 # Sets all slots as empty
+        self.crash = False # There is no penny collision
+        self._spill = [] # Slots of pennies that landed on an occupied slot
+        self.metrics = None # No metrics are collected
+        self.sink = sink if sink is not None else DEFAULT_SINK
+
+    @property
+    def occupancy(self):
+        """
+        The occupied slots as a bitmask (bit k - 1 is slot k).
+        """
+        return self.mask
+
+    @property
+    def state(self):
+        """
+        A dictionary of slot number to the number of pennies in that slot.
+        """
+        mask = self.mask
+        state = {slot: 1 if mask & bit else 0 for slot, bit in self._bits.items()}
+        for slot in self._spill:
+            state[slot] += 1
+        return state
+
+    @state.setter
+    def state(self, state):
+        mask = 0
+        spill = []
+        for slot, count in state.items():
+            if count > 0:
+                mask |= self._bits[slot]
+                spill.extend([slot] * (count - 1))
+        self.mask = mask
+        self._spill = spill
+
+    def print_board(self):
+        """
+        Prints a visual representation of the current state of the game board.
+
+        Each slot number is displayed next to its corresponding value:
+        ( ) for empty, (O) for one penny, (X) for a crash
+        """
+        if not self.sink.enabled:
+            return
+        board_string = ""
+        for key, value in self.state.items():
+            if value == 0:
+                board_string += f"{key} ( ) "
+            elif value == 1:
+                board_string += f"{key} (O) "
+            else:
+                board_string += f"{key} (X) "
+        self.sink.emit(board_string)
+
+    def add_penny(self, slot):
+        """
+        Adds a penny to the specified slot on the board.
+
+        Attributes:
+        -----------
+        slot: int
+            The slot number (1-6) where the penny is to be added
+
+        Raises:
+        -------
+        ValueError: If the slot number is outside the range from 1 to 6
+        """
+        try:
+            bit = self._bits[slot]
+        except (KeyError, TypeError):
+            raise ValueError(f"Slot number must be between 1 and {len(self._bits)}.") from None
+
+        if self.metrics is not None:
+            self.metrics.penny(slot, self.mask & ~self._keep)
+        mask = self.mask & self._keep # The free slot (normally slot 6) resets to empty
+        if self._spill and self.rules.free_slot in self._spill:
+            free_slot = self.rules.free_slot
+            self._spill = [spilled for spilled in self._spill if spilled != free_slot]
+        if mask & bit:
+            self._spill.append(slot)
+            self.crash = True
+        else:
+            mask |= bit
+        self.mask = mask
+
+    def clear_board(self):
+        """
+        Resets the board by clearing all pennies and resetting the crash flag.
+
+        Returns:
+        --------
+        penny_return: int
+            The total number of pennies collected from all slots before the board was reset.
+        """
+        penny_return = self._popcount[self.mask] + len(self._spill)
+        self.mask = 0 # Reset all slots to empty
+        if self._spill:
+            self._spill = []
+        self.crash = False
+        return penny_return
+
+    def reset(self):
+        """
+        Empties the board and resets the crash flag, ready for a new game.
+        """
+        self.clear_board()
@@ -0,0 +1,249 @@
+# cli.py
+# This file contains the command line interface, run with `python -m penny_game`.
+# Each subcommand imports what it needs when it runs, so starting a game does
+# not pay for the simulation and analysis modules.
+
+# Dependencies:
+#   - argparse, os
+#   - main (play), batch (run_batch), sweep (run_sweep), store (ResultStore),
+#     compare (compare_strategies) and benchmark (main), imported on use
+
+# Usage Example:
+# python -m penny_game play --rules legacy --record game.json
+# python -m penny_game simulate --games 100000 --players 3 --strategy threshold
+# python -m penny_game simulate --games 1000000 --strategy random threshold --output games.csv
+# python -m penny_game simulate --games 1000000 --players 3 --output games.store
+# python -m penny_game query games.store winner=3 turns=:50 --limit 5
+# python -m penny_game compare threshold legacy --players 3 --pairs 20000
+# python -m penny_game bench --tolerance 10
+
+import argparse
+import json
+import os
+import sys
+
+
+def _play(args):
+    from .main import play
+
+    play(rules=args.rules, record_path=args.record)
+    return 0
+
+
+def _simulate(args):
+    from .batch import print_progress, run_batch
+    from .sweep import run_sweep
+
+    strategies = args.strategy or [None]
+    if args.params:
+        if len(strategies) != 1 or strategies[0] is None:
+            raise SystemExit("--params needs exactly one --strategy")
+        strategies = [(strategies[0], _parse_params(args.params))]
+    strategies = strategies[0] if len(strategies) == 1 else strategies
+    if args.cache_dir:
+        if args.output:
+            raise SystemExit("--output plays every game and cannot use --cache-dir")
+        stats = run_sweep(
+            {"players": args.players, "com": args.com, "rules": args.rules,
+             # One per seat, not a grid of choices, as in run_batch
+             "strategies": [strategies] if isinstance(strategies, list) else strategies},
+            args.games, seed=args.seed, shard_size=args.shard_size, workers=args.workers,
+            cache_dir=args.cache_dir, max_turns=args.max_turns,
+        )[0].stats
+    else:
+        try:
+            stats = run_batch(
+                args.games, players=args.players, com=args.com, strategies=strategies,
+                rules=args.rules, seed=args.seed, output=args.output, fmt=args.format,
+                workers=args.workers, shard_size=args.shard_size, max_turns=args.max_turns,
+                progress=print_progress if args.progress else None,
+            )
+        except (OSError, ValueError) as error:
+            raise SystemExit(f"simulate: {error}")
+        if stats.interrupted:
+            print(("\n" if args.progress else "") + f"Interrupted after {stats.games:,} games"
+                  + (f"; every one is in {args.output}" if args.output else ""), file=sys.stderr)
+    # Keep standard output for the rows when they go there
+    out = sys.stderr if args.output == "-" else sys.stdout
+    print(stats, file=out)
+    for seat in range(1, stats.num_players + 1):
+        low, high = stats.win_interval(seat)
+        print(f"  player {seat}: {stats.win_rate(seat):.4f} wins (95% CI {low:.4f}-{high:.4f})",
+              file=out)
+    if stats.games:
+        quantile = stats.turn_quantiles.quantile
+        print(f"  turns: mean {stats.turns.mean:.2f}, median {quantile(0.5):.0f}, "
+              f"99th percentile {quantile(0.99):.0f}", file=out)
+    return 130 if getattr(stats, "interrupted", False) else 0
+
+
+def _query(args):
+    from .store import ResultStore
+
+    if not os.path.isfile(os.path.join(args.store, "meta.json")):
+        raise SystemExit(f"query: no result store at {args.store}")
+    try:
+        store = ResultStore(args.store)
+        if args.index:
+            print(f"Indexed {store.build_index():,} games", file=sys.stderr)
+        filters = _parse_filters(args.filters)
+        if args.count:
+            print(store.count(**filters))
+        else:
+            for row in store.rows(store.where(limit=args.limit, **filters)):
+                print(json.dumps(row))
+    except ValueError as error:
+        raise SystemExit(f"query: {error}")
+    return 0
+
+
+def _compare(args):
+    from .compare import compare_strategies
+
+    try:
+        result = compare_strategies(
+            args.candidate, args.baseline, opponents=args.opponents, num_players=args.players,
+            pairs=args.pairs, seed=args.seed, workers=args.workers, rules=args.rules,
+            max_turns=args.max_turns,
+        )
+    except ValueError as error:
+        raise SystemExit(f"compare: {error}")
+    low, high = result.interval(args.confidence)
+    print(result)
+    print(f"  {args.candidate}: {result.candidate_rate:.4f} wins, "
+          f"{args.baseline}: {result.baseline_rate:.4f} wins, {result.games:,} games")
+    print(f"  difference {result.difference:+.4f} +/- {result.stderr:.4f}, "
+          f"{args.confidence:.0%} CI {low:+.4f} to {high:+.4f}")
+    return 0
+
+
+def _bench(args):
+    from .benchmark import main as benchmark_main
+
+    return benchmark_main(args.extra)
+
+
+def _parse_params(pairs):
+    """
+    Turns ["name=value", ...] into a dictionary, reading numbers as numbers.
+    """
+    params = {}
+    for pair in pairs:
+        name, _, value = pair.partition("=")
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                pass
+        params[name] = value
+    return params
+
+
+def _parse_filters(pairs):
+    """
+    Turns ["column=value", "column=low:high", ...] into ResultStore.where
+    filters. Either end of a range may be left out.
+    """
+    filters = {}
+    for pair in pairs:
+        name, equals, value = pair.partition("=")
+        if not equals:
+            raise ValueError(f"Expected COLUMN=VALUE or COLUMN=LOW:HIGH, got {pair!r}.")
+        try:
+            if ":" in value:
+                low, high = value.split(":")
+                filters[name] = (int(low) if low else None, int(high) if high else None)
+            else:
+                filters[name] = int(value)
+        except ValueError:
+            raise ValueError(f"Expected whole numbers in {pair!r}.") from None
+    return filters
+
+
+def build_parser():
+    """
+    Returns the argument parser for every subcommand.
+    """
+    parser = argparse.ArgumentParser(prog="penny_game", description="The Penny Game.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser("play", help="play a game at the terminal")
+    play.add_argument("--rules", default=os.environ.get("PENNY_GAME_RULES") or None,
+                      help="rules to play by, e.g. legacy (default: $PENNY_GAME_RULES or standard)")
+    play.add_argument("--record", default=os.environ.get("PENNY_GAME_RECORD") or None,
+                      metavar="PATH", help="save a replayable record of the game")
+    play.set_defaults(run=_play)
+
+    simulate = commands.add_parser("simulate", help="play COM games and summarize them")
+    simulate.add_argument("--games", type=int, default=10000)
+    simulate.add_argument("--players", type=int, default=2)
+    simulate.add_argument("--com", type=int, default=None, help="COM players (default: all)")
+    simulate.add_argument("--strategy", nargs="+", default=None, metavar="NAME",
+                          help="strategy for every seat, or one per seat "
+                               "(default: the original COM choice)")
+    simulate.add_argument("--params", nargs="*", metavar="NAME=VALUE",
+                          help="strategy parameters")
+    simulate.add_argument("--rules", default=None, help="rules name (default: standard)")
+    simulate.add_argument("--seed", type=int, default=0)
+    simulate.add_argument("--workers", type=int, default=None,
+                          help="worker processes (default: one per CPU)")
+    simulate.add_argument("--shard-size", type=int, default=1000)
+    simulate.add_argument("--max-turns", type=int, default=10000)
+    simulate.add_argument("--output", default=None, metavar="PATH",
+                          help="stream one row per game to this file, - for standard output")
+    simulate.add_argument("--format", choices=("jsonl", "csv", "store"), default=None,
+                          help="row format (default: from the file extension, else jsonl); "
+                               "store appends to a ResultStore directory")
+    simulate.add_argument("--progress", action="store_true",
+                          help="report progress on standard error")
+    simulate.add_argument("--cache-dir", default=None,
+                          help="reuse and store shards in this sweep cache (no --output)")
+    simulate.set_defaults(run=_simulate)
+
+    query = commands.add_parser("query", help="find games in a result store")
+    query.add_argument("store", help="the result store directory")
+    query.add_argument("filters", nargs="*", metavar="COLUMN=VALUE",
+                       help="e.g. winner=3, turns=:50 (under 50) or seed=7 game=12")
+    query.add_argument("--limit", type=int, default=20, help="games to print (default: 20)")
+    query.add_argument("--count", action="store_true", help="print the number of games only")
+    query.add_argument("--index", action="store_true",
+                       help="build the seed index first, for fast seed lookups")
+    query.set_defaults(run=_query)
+
+    compare = commands.add_parser("compare", help="compare two strategies on common dice")
+    compare.add_argument("candidate", help="strategy name")
+    compare.add_argument("baseline", help="strategy name to compare against")
+    compare.add_argument("--opponents", default=None,
+                         help="strategy of the other seats (default: the original COM choice)")
+    compare.add_argument("--players", type=int, default=2)
+    compare.add_argument("--pairs", type=int, default=10000,
+                         help="dice streams; each plays 2 x players games (default: 10000)")
+    compare.add_argument("--confidence", type=float, default=0.95)
+    compare.add_argument("--rules", default=None, help="rules name (default: standard)")
+    compare.add_argument("--seed", type=int, default=0)
+    compare.add_argument("--workers", type=int, default=None,
+                         help="worker processes (default: one per CPU)")
+    compare.add_argument("--max-turns", type=int, default=10000)
+    compare.set_defaults(run=_compare)
+
+    # Everything after "bench" goes to the benchmark script, --help included
+    bench = commands.add_parser("bench", help="run the benchmarks against the baseline",
+                                add_help=False)
+    bench.set_defaults(run=_bench)
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs a subcommand and returns its exit status.
+    """
+    parser = build_parser()
+    args, args.extra = parser.parse_known_args(argv)
+    if args.run is _query: # argparse leaves filters given after an option over
+        filters = [arg for arg in args.extra if not arg.startswith("-")]
+        args.filters += filters
+        args.extra = [arg for arg in args.extra if arg.startswith("-")]
+    if args.extra and args.run is not _bench:
+        parser.error(f"unrecognized arguments: {' '.join(args.extra)}")
+    return args.run(args)
@@ -0,0 +1,291 @@
+# compare.py
+# This file contains the paired comparison of two COM strategies. Both play
+# the same dice, seat by seat, so the luck the two share cancels out of their
+# difference and fewer games are needed to tell them apart.
+
+# Dependencies:
+#   - concurrent.futures, math, os, statistics
+#   - DiceStream class
+#   - simulation (simulate_game)
+#   - rules (get_rules)
+#   - strategies (build_strategy)
+
+# Usage Example:
+# result = compare_strategies("threshold", "legacy", num_players=3, pairs=20000, seed=1)
+# print(result, result.interval())
+
+
+# How it works:
+# - The unit of comparison is a dice stream: child n of the root DiceStream.
+#   On that stream the candidate takes each seat in turn against the
+#   opponents, and so does the baseline. Every game of the unit rolls the
+#   same dice (each seat rolls from its own child stream and draws its
+#   decisions from it too), so a difference in wins comes from the decisions
+#   and what follows from them (common random numbers). One different choice
+#   changes the board for the rest of the game, so how much luck is shared,
+#   and so the saving, depends on how alike the two strategies play.
+# - Rotating the strategy through every seat on the same dice is antithetic:
+#   a stream that favours one seat favours the candidate and the baseline
+#   alike, and over the rotation every seat's advantage is counted once.
+# - A unit is recorded as the pair (candidate wins, baseline wins) out of the
+#   seat count. The counts of each pair are kept exactly, so the estimate and
+#   its interval do not depend on the worker count.
+# - variance_ratio compares the paired standard error with the one the same
+#   number of independent games would give: it is how many times more games
+#   an independent comparison would need for the same interval.
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import NormalDist
+
+from .dice import DiceStream
+from .rules import get_rules
+from .simulation import simulate_game
+from .strategies import build_strategy
+
+
+class PairedComparison:
+    """
+    The PairedComparison class totals the units of a paired comparison.
+
+    Attributes:
+    -----------
+    candidate, baseline, opponents:
+        The strategy specs compared, and the one every other seat plays.
+    num_players: int
+        Seats per game.
+    counts: dict
+        Units by their (candidate wins, baseline wins) pair.
+    """
+
+    def __init__(self, candidate, baseline, opponents, num_players):
+        self.candidate = candidate
+        self.baseline = baseline
+        self.opponents = opponents
+        self.num_players = num_players
+        self.counts = {}
+
+    @property
+    def pairs(self):
+        """
+        The number of dice streams both strategies were played on.
+        """
+        return sum(self.counts.values())
+
+    @property
+    def games(self):
+        """
+        The number of games played: every seat, for both strategies, per stream.
+        """
+        return 2 * self.num_players * self.pairs
+
+    def add_records(self, records):
+        """
+        Adds per-unit records (flat candidate wins, baseline wins pairs).
+        """
+        counts = self.counts
+        for index in range(0, len(records), 2):
+            key = (records[index], records[index + 1])
+            counts[key] = counts.get(key, 0) + 1
+
+    def merge(self, other):
+        """
+        Adds the units of another comparison of the same strategies.
+
+        Raises:
+        -------
+        ValueError: If the other comparison is of different strategies or seats.
+        """
+        if (other.candidate, other.baseline, other.opponents, other.num_players) != (
+                self.candidate, self.baseline, self.opponents, self.num_players):
+            raise ValueError("Only comparisons of the same strategies can be merged.")
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        return self
+
+    def _rate(self, side):
+        seats = self.num_players * self.pairs
+        if not seats:
+            return 0.0
+        return sum(wins[side] * count for wins, count in self.counts.items()) / seats
+
+    @property
+    def candidate_rate(self):
+        """
+        The fraction of games the candidate won.
+        """
+        return self._rate(0)
+
+    @property
+    def baseline_rate(self):
+        """
+        The fraction of games the baseline won.
+        """
+        return self._rate(1)
+
+    @property
+    def difference(self):
+        """
+        The candidate's win rate minus the baseline's.
+        """
+        return self.candidate_rate - self.baseline_rate
+
+    @property
+    def stderr(self):
+        """
+        The standard error of the difference, from the spread of the units.
+        """
+        pairs = self.pairs
+        if pairs < 2:
+            return 0.0
+        mean = self.difference
+        squares = sum(((wins[0] - wins[1]) / self.num_players - mean) ** 2 * count
+                      for wins, count in self.counts.items())
+        return math.sqrt(squares / (pairs - 1) / pairs)
+
+    @property
+    def independent_stderr(self):
+        """
+        The standard error of the difference that as many games with
+        independent dice for each strategy would give.
+        """
+        seats = self.num_players * self.pairs
+        if not seats:
+            return 0.0
+        candidate, baseline = self.candidate_rate, self.baseline_rate
+        return math.sqrt((candidate * (1 - candidate) + baseline * (1 - baseline)) / seats)
+
+    @property
+    def variance_ratio(self):
+        """
+        How many times more games independent dice would need for the same
+        interval (infinite when the paired differences do not vary).
+        """
+        stderr = self.stderr
+        return (self.independent_stderr / stderr) ** 2 if stderr else math.inf
+
+    def interval(self, confidence=0.95):
+        """
+        Returns the normal confidence interval (low, high) of the difference.
+        """
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        spread = z * self.stderr
+        return (self.difference - spread, self.difference + spread)
+
+    def to_dict(self, confidence=0.95):
+        """
+        Returns the comparison as a dictionary of JSON-ready values.
+        """
+        low, high = self.interval(confidence)
+        return {"candidate": self.candidate, "baseline": self.baseline,
+                "opponents": self.opponents, "players": self.num_players,
+                "pairs": self.pairs, "games": self.games,
+                "candidate_rate": self.candidate_rate, "baseline_rate": self.baseline_rate,
+                "difference": self.difference, "stderr": self.stderr,
+                "interval": [low, high], "variance_ratio": self.variance_ratio}
+
+    def __repr__(self):
+        low, high = self.interval()
+        return (
+            f"{_label(self.candidate)} - {_label(self.baseline)}: {self.difference:+.4f} "
+            f"(95% CI {low:+.4f} to {high:+.4f}) over {self.pairs} paired streams, "
+            f"{self.variance_ratio:.1f}x as efficient as independent dice"
+        )
+
+
+def _label(spec):
+    """
+    Returns a readable name for a strategy spec.
+    """
+    if spec is None:
+        return "default"
+    if isinstance(spec, str):
+        return spec
+    name, params = spec
+    return f"{name}({', '.join(f'{key}={value}' for key, value in sorted(params.items()))})"
+
+
+def play_pairs(candidate, baseline, opponents, num_players, root_seed, first_pair, num_pairs,
+               max_turns=10000, rules=None):
+    """
+    Plays units first_pair to first_pair + num_pairs - 1 of a comparison.
+
+    Returns:
+    --------
+    list: Flat (candidate wins, baseline wins) pairs, one per unit, each out
+    of num_players games.
+    """
+    rules = get_rules(rules)
+    sides = (build_strategy(candidate), build_strategy(baseline))
+    field = build_strategy(opponents) if opponents is not None else None
+    root = DiceStream(root_seed, faces=rules.die_faces)
+    records = []
+    for index in range(first_pair, first_pair + num_pairs):
+        wins = [0, 0]
+        for seat in range(num_players):
+            for side, strategy in enumerate(sides):
+                strategies = [field] * num_players
+                strategies[seat] = strategy
+                result = simulate_game(num_players, dice=root.child(index),
+                                       strategies=strategies, max_turns=max_turns, rules=rules)
+                wins[side] += result.winner == seat + 1
+        records.extend(wins)
+    return records
+
+
+def compare_strategies(candidate, baseline, opponents=None, num_players=2, pairs=10000,
+                       seed=0, workers=None, shard_size=500, max_turns=10000, rules=None):
+    """
+    Compares two strategies on common dice with every seat rotated.
+
+    Parameters:
+    -----------
+    candidate, baseline:
+        Strategy specs: registered names or (name, params) pairs.
+    opponents:
+        The strategy spec of every other seat (default: the original COM choice).
+    num_players: int
+        Seats per game (default: 2).
+    pairs: int
+        Dice streams to play both strategies on. Each costs 2 * num_players games.
+    seed: int
+        The root seed that every stream is derived from.
+    workers: int
+        The number of worker processes (default: one per CPU). With 1, games
+        are played in this process.
+    shard_size: int
+        Streams per job.
+    max_turns: int
+        Stops a game that has not been won after this many turns.
+    rules: Rules or str
+        The rules to play by (default: the standard rules).
+
+    Returns:
+    --------
+    PairedComparison: The paired difference in win rate and its statistics.
+
+    Raises:
+    -------
+    ValueError: If a strategy is unknown or there are fewer than two seats.
+    """
+    if num_players < 2:
+        raise ValueError("A comparison needs at least two seats.")
+    play_pairs(candidate, baseline, opponents, num_players, seed, 0, 0, rules=rules)
+    result = PairedComparison(candidate, baseline, opponents, num_players)
+    jobs = [
+        (candidate, baseline, opponents, num_players, seed, first,
+         min(shard_size, pairs - first), max_turns, rules)
+        for first in range(0, pairs, shard_size)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            result.add_records(play_pairs(*job))
+        return result
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        for future in as_completed([executor.submit(play_pairs, *job) for job in jobs]):
+            result.add_records(future.result())
+    return result
@@ -0,0 +1,200 @@
+# dice.py
+# This file contains the DiceStream class, a reproducible source of dice rolls
+# and random numbers that can be split into independent streams for workers,
+# tables and seats.
+
+# Dependencies:
+#   - hashlib, os, struct
+
+# Usage Example:
+# dice = DiceStream(seed=42)
+# roll = dice.roll()
+# seat_dice = dice.child(3)
+
+
+# How it works:
+# - A stream is identified by a root seed and a path of child indexes. Both are
+#   hashed into a key, so every child is an independent stream.
+# - Rolls come from numbered blocks of SHAKE-256 output (counter mode). Bytes
+#   are mapped to die faces by rejection sampling with bytes.translate, so a
+#   block turns into about 500 rolls in a single C call. Blocks are kept small
+#   because most streams (one per seat) only need a few hundred rolls.
+# - Uniform random numbers for decisions come from a separate numbered lane,
+#   so they never shift the dice sequence.
+# - Because blocks are numbered, jumping ahead and restoring a saved position
+#   cost the same as reading one block.
+
+import hashlib
+import os
+import struct
+
+BLOCK_BYTES = 512
+_UNIFORMS = struct.Struct(f"<{BLOCK_BYTES // 8}Q")
+_FACE_TABLES = {}
+
+
+def _face_table(faces):
+    """
+    Returns the translation table and rejected bytes for a die with `faces` faces.
+    """
+    if faces not in _FACE_TABLES:
+        if not 1 <= faces <= 255:
+            raise ValueError(f"A die needs between 1 and 255 faces, not {faces}.")
+        limit = 256 - 256 % faces # Bytes at or above this would bias the faces
+        table = bytes(value % faces + 1 if value < limit else 0 for value in range(256))
+        _FACE_TABLES[faces] = (table, bytes(range(limit, 256)))
+    return _FACE_TABLES[faces]
+
+
+class DiceStream:
+    """
+    The DiceStream class supplies dice rolls and random numbers from a seed.
+
+    Two streams with the same seed and path produce exactly the same rolls.
+    A stream also offers random() so it can stand in for random.Random where
+    players make random choices.
+
+    Attributes:
+    -----------
+    seed: int
+        The root seed (chosen from os.urandom if not given).
+    path: tuple
+        The child indexes leading from the root stream to this one.
+    faces: int
+        The number of faces on the die.
+
+    Methods:
+    --------
+    roll():
+        Returns the next roll, from 1 to faces.
+    random():
+        Returns the next float in [0, 1).
+    child(*path):
+        Returns an independent stream derived from this one.
+    spawn(count):
+        Returns `count` independent child streams.
+    jump(blocks):
+        Skips the dice lane ahead by whole blocks.
+    tell() / seek(position):
+        Saves and restores the position in both lanes.
+    """
+
+    def __init__(self, seed=None, faces=6, path=()):
+        """
+        Initializes the DiceStream.
+
+        Parameters:
+        -----------
+        seed: int
+            The root seed (default: random from os.urandom).
+        faces: int
+            The number of faces on the die (default: 6).
+        path: tuple
+            Child indexes below the root (normally built with child()).
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed
+        self.faces = faces
+        self.path = tuple(path)
+        self._table, self._reject = _face_table(faces)
+        material = "/".join(str(part) for part in (seed,) + self.path).encode()
+        self._key = hashlib.blake2b(material, digest_size=32).digest()
+        self._block = 0 # Next dice block to read
+        self._rolls = b""
+        self._pos = 0
+        self._uniform_block = 0 # Next uniform block to read
+        self._uniforms = ()
+        self._uniform_pos = 0
+
+    def _dice_block(self, block):
+        raw = hashlib.shake_256(self._key + b"d" + block.to_bytes(8, "little")).digest(BLOCK_BYTES)
+        return raw.translate(self._table, self._reject)
+
+    def _uniform_values(self, block):
+        raw = hashlib.shake_256(self._key + b"u" + block.to_bytes(8, "little")).digest(BLOCK_BYTES)
+        return [(value >> 11) * (1.0 / 9007199254740992) for value in _UNIFORMS.unpack(raw)]
+
+    def roll(self):
+        """
+        Returns the next roll.
+
+        Returns:
+        --------
+        int
+            An integer from 1 to faces, inclusive.
+        """
+        pos = self._pos
+        if pos >= len(self._rolls):
+            self._rolls = self._dice_block(self._block)
+            self._block += 1
+            pos = 0
+        self._pos = pos + 1
+        return self._rolls[pos]
+
+    def random(self):
+        """
+        Returns the next random float in [0, 1).
+        """
+        pos = self._uniform_pos
+        if pos >= len(self._uniforms):
+            self._uniforms = self._uniform_values(self._uniform_block)
+            self._uniform_block += 1
+            pos = 0
+        self._uniform_pos = pos + 1
+        return self._uniforms[pos]
+
+    def randint(self, low, high):
+        """
+        Returns a random integer in [low, high], like random.randint.
+        """
+        return low + int(self.random() * (high - low + 1))
+
+    def child(self, *path):
+        """
+        Returns an independent stream derived from this one.
+
+        Parameters:
+        -----------
+        path: int
+            One or more indexes, e.g. child(table, seat).
+        """
+        return DiceStream(self.seed, self.faces, self.path + path)
+
+    def spawn(self, count):
+        """
+        Returns a list of `count` independent child streams.
+        """
+        return [self.child(index) for index in range(count)]
+
+    def jump(self, blocks=1):
+        """
+        Drops the rest of the current block of rolls and skips the next `blocks`
+        blocks (about 500 rolls each) without generating them.
+        """
+        self._block += blocks
+        self._rolls = b""
+        self._pos = 0
+
+    def tell(self):
+        """
+        Returns the stream's position as a tuple of four integers.
+        """
+        dice_block = self._block - 1 if self._rolls else self._block
+        uniform_block = self._uniform_block - 1 if self._uniforms else self._uniform_block
+        return (dice_block, self._pos, uniform_block, self._uniform_pos)
+
+    def seek(self, position):
+        """
+        Restores a position returned by tell().
+        """
+        dice_block, pos, uniform_block, uniform_pos = position
+        self._rolls = self._dice_block(dice_block) if pos else b""
+        self._block = dice_block + 1 if pos else dice_block
+        self._pos = pos
+        self._uniforms = self._uniform_values(uniform_block) if uniform_pos else ()
+        self._uniform_block = uniform_block + 1 if uniform_pos else uniform_block
+        self._uniform_pos = uniform_pos
+
+    def __repr__(self):
+        return f"DiceStream(seed={self.seed}, faces={self.faces}, path={self.path})"
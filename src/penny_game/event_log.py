@@ -0,0 +1,289 @@
+# event_log.py
+# This file contains a compact binary log of game events. Every event is one
+# fixed-width record, so a log can be appended to quickly and read back with
+# mmap without parsing the whole file.
+
+# Dependencies:
+#   - mmap, os, struct
+
+# Usage Example:
+# with EventLogWriter("games.log") as log:
+#     game.event_log = log
+#     ...
+# with EventLogReader("games.log") as reader:
+#     for event in reader.game_events(0):
+#         print(event)
+
+
+# File layout:
+# - An 8-byte header, b"PENNYEV1".
+# - Then one 8-byte record per event: game index (uint32), event kind, seat and
+#   two small values (uint8 each), little-endian.
+# - Records are written in game order, so the records of one game are together
+#   and the game index never goes down. That lets the reader binary search for
+#   a game.
+
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+MAGIC = b"PENNYEV1"
+RECORD = struct.Struct("<IBBBB")
+RECORD_SIZE = RECORD.size
+
+# Event kinds and what the two values hold
+GAME = 0 # seat: first player, a: number of players, b: number of COM players
+ROLL = 1 # a: the roll
+PLACE = 2 # a: slot, b: board occupancy bitmask after the penny
+CRASH = 3 # a: slot that crashed
+PICKUP = 4 # a: pennies picked up, b: new hand (capped at 255)
+REROLL = 5 # a: 1 to reroll, 0 to pass
+WIN = 6 # seat: the winner, a: unused
+KIND_NAMES = ("game", "roll", "place", "crash", "pickup", "reroll", "win")
+
+Event = namedtuple("Event", "game kind seat a b")
+
+
+class EventLogWriter:
+    """
+    The EventLogWriter class appends events to a log file through a buffer.
+
+    Assign a writer to Game.event_log and the game loop reports every roll,
+    placement, crash, pickup, reroll decision and win.
+
+    Attributes:
+    -----------
+    path: str
+        The log file.
+    game: int
+        The index of the game being written (-1 before the first game).
+
+    Methods:
+    --------
+    start_game(first_player, num_players, num_com):
+        Starts the records of a new game.
+    roll(), place(), crash(), pickup(), reroll(), win():
+        Record one event each.
+    flush():
+        Writes the buffer to the file.
+    close():
+        Flushes and closes the file.
+    """
+
+    def __init__(self, path, buffer_records=65536):
+        """
+        Opens a log for appending, writing the header if the file is new.
+
+        Parameters:
+        -----------
+        path: str
+            The log file.
+        buffer_records: int
+            The number of records to collect before writing (default: 65536).
+        """
+        self.path = path
+        self._limit = buffer_records * RECORD_SIZE
+        self._buffer = bytearray()
+        self.game = -1
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size:
+            # Carry on numbering after the last game already in the file
+            with open(path, "rb") as existing:
+                if existing.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{path} is not a penny game event log.")
+                whole = size - (size - len(MAGIC)) % RECORD_SIZE
+                if whole >= len(MAGIC) + RECORD_SIZE:
+                    existing.seek(whole - RECORD_SIZE)
+                    self.game = RECORD.unpack(existing.read(RECORD_SIZE))[0]
+            if whole != size:
+                os.truncate(path, whole) # Drop a record cut short by a crash
+        self._file = open(path, "ab")
+        if not size:
+            self._file.write(MAGIC)
+
+    def _write(self, kind, seat, a=0, b=0):
+        buffer = self._buffer
+        buffer += RECORD.pack(self.game, kind, seat, a, b)
+        if len(buffer) >= self._limit:
+            self.flush()
+
+    def start_game(self, first_player, num_players, num_com):
+        """
+        Starts the records of a new game.
+        """
+        self.game += 1
+        self._write(GAME, first_player, num_players, num_com)
+
+    def roll(self, seat, roll):
+        """
+        Records a roll.
+        """
+        self._write(ROLL, seat, roll)
+
+    def place(self, seat, slot, occupancy):
+        """
+        Records a penny placed in a slot and the board occupancy after it.
+        """
+        self._write(PLACE, seat, slot, occupancy)
+
+    def crash(self, seat, slot):
+        """
+        Records a crash in a slot.
+        """
+        self._write(CRASH, seat, slot)
+
+    def pickup(self, seat, pennies, hand):
+        """
+        Records the pennies picked up after a crash and the new hand.
+        """
+        self._write(PICKUP, seat, min(pennies, 255), min(hand, 255))
+
+    def reroll(self, seat, decision):
+        """
+        Records a decision to reroll (True) or pass (False).
+        """
+        self._write(REROLL, seat, 1 if decision else 0)
+
+    def win(self, seat):
+        """
+        Records the winner.
+        """
+        self._write(WIN, seat)
+
+    def flush(self):
+        """
+        Writes buffered records to the file.
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        """
+        Flushes and closes the file.
+        """
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EventLogReader:
+    """
+    The EventLogReader class reads a log through mmap.
+
+    Methods:
+    --------
+    len(reader), reader[index]:
+        The number of events, and one event by position.
+    iter(reader):
+        Every event in order.
+    game_events(game):
+        The events of one game, found by binary search.
+    kind_counts():
+        The number of events of each kind.
+    close():
+        Releases the mapping.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(MAGIC):
+            self._map = b""
+        else:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:len(MAGIC)] != MAGIC:
+                self.close()
+                raise ValueError(f"{path} is not a penny game event log.")
+        # Ignore a partly written record at the end
+        self._count = max(0, size - len(MAGIC)) // RECORD_SIZE
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("event index out of range")
+        return Event(*RECORD.unpack_from(self._map, len(MAGIC) + index * RECORD_SIZE))
+
+    def __iter__(self):
+        return self._iter_range(0, self._count)
+
+    def _iter_range(self, start, stop, chunk_records=1 << 16):
+        # Unpack a chunk of the mapping at a time, never the whole file
+        for first in range(start, stop, chunk_records):
+            last = min(stop, first + chunk_records)
+            chunk = self._map[len(MAGIC) + first * RECORD_SIZE:len(MAGIC) + last * RECORD_SIZE]
+            for record in RECORD.iter_unpack(chunk):
+                yield Event(*record)
+
+    def _game_at(self, index):
+        return RECORD.unpack_from(self._map, len(MAGIC) + index * RECORD_SIZE)[0]
+
+    def find_game(self, game):
+        """
+        Returns the position of the first event of a game, or of the first later
+        game if it is missing.
+        """
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._game_at(middle) < game:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def game_events(self, game):
+        """
+        Returns a list of the events of one game.
+        """
+        events = []
+        for event in self._iter_range(self.find_game(game), self._count):
+            if event.game != game:
+                break
+            events.append(event)
+        return events
+
+    def kind_counts(self, chunk_records=1 << 20):
+        """
+        Counts the events of each kind without unpacking records one by one.
+
+        Returns:
+        --------
+        dict: Event kind name to count.
+        """
+        counts = [0] * len(KIND_NAMES)
+        kind_offset = len(MAGIC) + 4 # The kind is the fifth byte of a record
+        for first in range(0, self._count, chunk_records):
+            last = min(self._count, first + chunk_records)
+            kinds = self._map[kind_offset + first * RECORD_SIZE:
+                              kind_offset + last * RECORD_SIZE:RECORD_SIZE]
+            for kind in range(len(KIND_NAMES)):
+                counts[kind] += kinds.count(kind)
+        return dict(zip(KIND_NAMES, counts))
+
+    def close(self):
+        """
+        Releases the mapping and closes the file.
+        """
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
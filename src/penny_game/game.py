@@ -0,0 +1,579 @@
+# game.py
+# This file contains the Game class, which is responsible for the logic
+# concerning general gameplay functions.
+
+# Author: Eva Anderson
+# Created:11/10/24
+# Last Modified: 12/08/24
+
+# Dependencies:
+#   - Player class
+#   - GameBoard class
+#   - DiceStream class
+#   - time (perf_counter, for metrics)
+#   - sinks (DEFAULT_SINK)
+#   - rules (DEFAULT_RULES)
+
+# Usage Example:
+# game1 = Game()
+# game1.who_first()
+
+from time import perf_counter
+
+from .player import Player
+from .game_board import GameBoard
+from .dice import DiceStream
+from .rules import DEFAULT_RULES
+from .sinks import DEFAULT_SINK
+
+_MARK, _ROLL_TIME, _DECIDE_TIME, _ROLLS = range(4) # Fields of Game._timing
+
+
+class Game:
+    """
+    The Game class manages the gameplay logic and controls the flow of the game.
+
+    Attributes
+    ----------
+    numplayers: int
+        An integer representing the total number of players
+    numcom: int
+        An integer representing the total number of computer (COM) players.
+    players: dict
+        A dictionary that stores all of the player objects.
+    game_winner: bool
+        A flag that indicates whether a player has won the game
+    board: GameBoard
+        The shared game board.
+    dice: DiceStream
+        The root dice stream; each player rolls from their own child of it.
+    current_player: int
+        The number of the player whose turn it is.
+    turns: int
+        The number of completed turns.
+    crashes: int
+        The number of crashes so far.
+    deciding: bool
+        Whether a turn begun with begin_turn is waiting for a reroll decision.
+    event_log: EventLogWriter
+        Receives every game event when set (default: None).
+    metrics: GameMetrics
+        Collects counters and timings when set (default: None). Setting it also
+        attaches it to the board.
+    sink: ConsoleSink
+        Where the game's messages go (default: the console).
+    rules: Rules
+        The rules of the game, shared with its board and players.
+
+    Methods
+    -------
+    create_players():
+        Creates the players dictionary containing all participating human and COM players.
+    get_numplayers():
+        Prompts the user to enter the number of players.
+    get_numcom():
+        Prompts the user to enter the number of COM players.
+    who_first():
+        Determines which player goes first by rolling dice for each player.
+        If there is a tie, players with the highest roll will reroll until there is a single winner.
+    final_scores():
+        Displays the scores of all players.
+    assign_strategies(strategies):
+        Gives each player their reroll strategy.
+    reset(dice=None):
+        Gets the game, its board and its players ready for a new game.
+    start(announce=True, dice=None):
+        Decides who goes first and starts the game there.
+    roll_penny(player):
+        Rolls for a player and places one of their pennies on the board.
+    play_turn(strategy=None):
+        Plays a full turn for the current player without any terminal output.
+    begin_turn() / continue_turn(reroll):
+        Play a turn one decision at a time, for decisions made elsewhere.
+    end_turn():
+        Settles crashes and wins and passes play to the next player.
+    """
+
+    __slots__ = (
+        "numplayers", "numcom", "players", "game_winner", "board", "dice",
+        "current_player", "turns", "crashes", "deciding", "event_log", "_metrics", "sink",
+        "rules", "_timing",
+    )
+
+    def __init__(self, board=None, dice=None, sink=None, rules=None):
+        """
+        Initializes the Game class
+
+        Parameters
+        ----------
+        board: GameBoard
+            The board to play on (default: a new GameBoard). Any board with the
+            GameBoard API, such as a BitmaskBoard, can be used.
+        dice: DiceStream
+            The root dice stream (default: a new, randomly seeded stream).
+        sink: ConsoleSink
+            Where the game, its players and a new board send their messages: a
+            ConsoleSink, BufferedSink or NullSink (default: the console).
+        rules: Rules
+            The rules to play by (default: the board's rules, or the standard
+            rules for a new board). The dice must have as many faces as the
+            rules' die.
+
+        Raises
+        ------
+        ValueError: If the rules differ from the board's or the dice's.
+
+        Attributes
+        ----------
+        numplayers: int
+            An integer representing the total number of players
+        numcom: int
+            An integer representing the total number of computer (COM) players.
+        players: dict
+            A dictionary that stores all of the player objects.
+        game_winner: bool
+            A flag that indicates whether a player has won the game
+        board: GameBoard
+            The shared game board, initially empty.
+        dice: DiceStream
+            The root dice stream of the game.
+        current_player: int
+            The number of the player whose turn it is (0 until play starts).
+        turns: int
+            The number of completed turns.
+        crashes: int
+            The number of crashes so far.
+        deciding: bool
+            Whether a turn is waiting for a reroll decision (initially False).
+        event_log: EventLogWriter
+            Receives every game event when set (default: None).
+        metrics: GameMetrics
+            Collects counters and timings when set (default: None).
+        """
+        self.numplayers = 0
+        self.numcom = 0
+        self.players = {}
+        self.game_winner = False
+        if rules is None:
+            rules = board.rules if board is not None else DEFAULT_RULES
+        elif board is not None and board.rules != rules:
+            raise ValueError(f"The board plays by {board.rules}, not {rules}.")
+        self.rules = rules
+        self._check_dice(dice)
+        self.sink = sink if sink is not None else DEFAULT_SINK
+        self.board = board if board is not None else GameBoard(sink=self.sink, rules=rules)
+        self.dice = dice if dice is not None else DiceStream(faces=rules.die_faces)
+        self.current_player = 0
+        self.turns = 0
+        self.crashes = 0
+        self.deciding = False
+        self.event_log = None
+        self._metrics = None
+        self._timing = None # [last mark, roll seconds, decide seconds, rolls] of a measured turn
+
+    def _check_dice(self, dice):
+        """
+        Raises a ValueError if a dice stream does not roll the rules' die.
+        """
+        if dice is not None and dice.faces != self.rules.die_faces:
+            raise ValueError(
+                f"The rules need a {self.rules.die_faces}-sided die, not {dice.faces} faces."
+            )
+
+    @property
+    def metrics(self):
+        """
+        The GameMetrics collecting from this game and its board, or None.
+        """
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        if metrics is not None:
+            metrics.use_slots(self.rules.slots)
+        self._metrics = metrics
+        self.board.metrics = metrics
+
+    def create_players(self, dice=None, strategies=None):
+        """
+        Creates the players dictionary containing all participating human and COM players.
+
+        Parameters:
+        -----------
+        dice: DiceStream
+            Replaces the game's root dice stream. Player n rolls from its child n,
+            so each seat's rolls do not depend on what the other seats do.
+        strategies: sequence or dict
+            Reroll strategies by player number (a dict) or in player order (a sequence).
+            Players without one use the default COM choice, or are asked if human.
+        """
+        if dice is not None:
+            self._check_dice(dice)
+            self.dice = dice
+
+        # Create players (human and COM), numbered from 1 within this game
+        self.players = {}
+        for i in range(self.numplayers):
+            is_human = i < (self.numplayers - self.numcom)
+            self.players[i + 1] = Player(
+                is_human=is_human, dice=self.dice.child(i + 1), player_number=i + 1,
+                sink=self.sink, rules=self.rules,
+            )
+        self.assign_strategies(strategies)
+
+    def assign_strategies(self, strategies):
+        """
+        Gives each player their reroll strategy.
+
+        Parameters:
+        -----------
+        strategies: sequence or dict
+            Reroll strategies by player number (a dict) or in player order (a sequence).
+            Players without one get None.
+        """
+        if strategies is None:
+            strategies = {}
+        elif not isinstance(strategies, dict):
+            strategies = dict(enumerate(strategies, start=1))
+        for number, player in self.players.items():
+            player.strategy = strategies.get(number)
+
+    def reset(self, dice=None):
+        """
+        Gets the game ready to be played again with the same players, reusing the
+        board and player objects instead of building new ones.
+
+        Parameters:
+        -----------
+        dice: DiceStream
+            A new root dice stream; player n then rolls from its child n.
+            By default the players keep rolling where they left off.
+        """
+        if dice is not None:
+            self._check_dice(dice)
+            self.dice = dice
+        for number, player in self.players.items():
+            player.reset(dice=dice.child(number) if dice is not None else None)
+        self.board.reset()
+        self.game_winner = False
+        self.current_player = 0
+        self.turns = 0
+        self.crashes = 0
+        self.deciding = False
+        self._timing = None
+
+    def get_numplayers(self):
+        """
+        Prompts the user to input the number of players and sets numplayers to that input.
+        """
+        while True:
+            self.sink.flush()
+            try:
+                numplayers = int(input("Enter the number of players (2-5): "))
+                if 2 <= numplayers <= 5:
+                    self.numplayers = numplayers
+                    break
+                else:
+                    self.sink.emit("Please enter a number between 2 and 5.")
+            except ValueError:
+                self.sink.emit("Invalid input. Please enter an integer between 2 and 5.")
+
+    def get_numcom(self):
+        """
+        Prompts the user to enter the number of COM players and sets numcom to that value.
+        """
+        while True:
+            self.sink.flush()
+            try:
+                num_com = int(
+                    input(
+                        f"How many COM players would you like? (0-{self.numplayers}): "
+                    )
+                )
+                if 0 <= num_com <= self.numplayers:
+                    self.numcom = num_com
+                    break
+                else:
+                    self.sink.emit("Please enter a number between 0 and {}.", self.numplayers)
+            except ValueError:
+                self.sink.emit(
+                    "Invalid input. Please enter an integer between 0 and {}.", self.numplayers
+                )
+
+    def who_first(self, announce=True, dice=None):
+        """
+        Determines which player goes first by rolling dice for each player.
+        If there is a tie, players with the highest roll will reroll until there is a single winner.
+
+        Parameters:
+        -----------
+        announce: bool
+            Whether to print the rolls and the result (default: True).
+        dice: DiceStream
+            Rolls every roll-off die from this stream instead of each player's own.
+
+        Returns:
+        --------
+        int: The player number who goes first.
+        """
+        rolls_dict = {key: 0 for key in range(1, self.numplayers + 1)}
+
+        # Initial roll for all players
+        for player in rolls_dict.keys():
+            rolls_dict[player] = self._first_roll(player, announce, dice)
+
+        max_value = max(rolls_dict.values())
+        players_with_max_roll = [
+            key for key, value in rolls_dict.items() if value == max_value
+        ]
+
+        # Handle ties by rerolling
+        while len(players_with_max_roll) > 1:
+            if announce:
+                self.sink.emit("Tie detected! Players {} will reroll.", players_with_max_roll)
+            rolls_dict = {key: 0 for key in players_with_max_roll}
+            for player in rolls_dict.keys():
+                rolls_dict[player] = self._first_roll(player, announce, dice)
+            max_value = max(rolls_dict.values())
+            players_with_max_roll = [
+                key for key, value in rolls_dict.items() if value == max_value
+            ]
+
+        winner = players_with_max_roll[0]
+        if announce:
+            self.sink.emit("Player {} goes first!", winner)
+        return winner
+
+    def _first_roll(self, player_num, announce, dice):
+        """
+        Rolls for a player during who_first, announcing it only when asked to.
+        """
+        player = self.players[player_num]
+        if dice is None:
+            return player.player_roll() if announce else player.roll_dice()
+        roll = dice.roll()
+        if announce:
+            player.announce_roll(roll)
+        return roll
+
+    def final_scores(self):
+        """
+        Prints the final score of each player.
+        """
+        sorting_dict = {}
+        for player in self.players.values():
+            sorting_dict[player.player_number] = player.hand
+        sorted_dict = {
+            key: value
+            for key, value in sorted(sorting_dict.items(), key=lambda item: item[1])
+        }
+
+        self.sink.emit("Final Scores")
+        self.sink.emit("------------")
+
+        for player_no, hand in sorted_dict.items():
+            self.sink.emit("   {} : {}", player_no, hand)
+
+    def start(self, announce=True, dice=None):
+        """
+        Decides who goes first with who_first and makes it their turn.
+
+        Returns:
+        --------
+        int: The player number who goes first.
+        """
+        self.current_player = self.who_first(announce, dice)
+        if self.event_log is not None:
+            self.event_log.start_game(self.current_player, self.numplayers, self.numcom)
+        if self._metrics is not None:
+            self._metrics.games += 1
+        return self.current_player
+
+    def roll_penny(self, player):
+        """
+        Rolls the die for a player, takes a penny from their hand and places it on the board.
+
+        Parameters:
+        -----------
+        player: Player
+            The player taking the roll.
+
+        Returns:
+        --------
+        int: The rolled value.
+        """
+        roll = player.roll_dice()
+        player.drop_penny()
+        self.board.add_penny(roll)
+        log = self.event_log
+        if log is not None:
+            seat = player.player_number
+            log.roll(seat, roll)
+            log.place(seat, roll, self.board.occupancy)
+            if self.board.crash:
+                log.crash(seat, roll)
+        return roll
+
+    def play_turn(self, strategy=None):
+        """
+        Plays a full turn for the current player without any terminal output.
+
+        The player always rolls once, then keeps rolling while the board has not
+        crashed, they still have pennies and they choose to reroll. With metrics
+        attached the turn is counted and timed as well.
+
+        Parameters:
+        -----------
+        strategy: callable
+            Called as strategy(player, board, game) to decide whether to reroll.
+            Defaults to the player's own strategy, then to their check_reroll().
+        """
+        player = self.players[self.current_player]
+        board = self.board
+        log = self.event_log
+        if strategy is None:
+            strategy = player.strategy
+        timing = None if self._metrics is None else self._start_timing()
+        self.roll_penny(player)
+        if timing is not None:
+            self._mark(_ROLL_TIME)
+        passed = False
+        while not board.crash and player.hand:
+            if strategy is not None:
+                reroll = strategy(player, board, self)
+            else:
+                reroll = player.check_reroll()
+            if timing is not None:
+                self._mark(_DECIDE_TIME)
+            if log is not None:
+                log.reroll(player.player_number, reroll)
+            if not reroll:
+                passed = True
+                break
+            self.roll_penny(player)
+            if timing is not None:
+                self._mark(_ROLL_TIME)
+        if timing is None:
+            self.end_turn()
+        else:
+            self._end_timed_turn(player, passed)
+
+    def _start_timing(self):
+        """
+        Starts timing a turn when metrics are attached, returning the timing
+        record (None without metrics).
+        """
+        if self._metrics is None:
+            return None
+        self._timing = [perf_counter(), 0.0, 0.0, 0]
+        return self._timing
+
+    def _mark(self, phase):
+        """
+        Adds the time since the last mark to a phase of the turn being timed,
+        counting a roll when the phase is rolling.
+        """
+        timing = self._timing
+        now = perf_counter()
+        timing[phase] += now - timing[_MARK]
+        timing[_MARK] = now
+        if phase == _ROLL_TIME:
+            timing[_ROLLS] += 1
+
+    def _end_timed_turn(self, player, passed):
+        """
+        Ends a timed turn with end_turn and adds it to the metrics.
+        """
+        timing = self._timing
+        self._timing = None
+        crashed = self.board.crash
+        hand = player.hand
+        settling = perf_counter()
+        self.end_turn()
+        settle_time = perf_counter() - settling
+        metrics = self._metrics
+        rolls = timing[_ROLLS]
+        metrics.turn(rolls, rolls - 1, passed, player.hand - hand if crashed else None,
+                     (timing[_ROLL_TIME], timing[_DECIDE_TIME], settle_time))
+        if self.game_winner:
+            metrics.game_won(self.turns)
+
+    def begin_turn(self):
+        """
+        Starts the current player's turn with its first roll, for callers that
+        get reroll decisions from elsewhere, such as a network client. Follows
+        the same rules as play_turn and counts the turn in the same metrics,
+        the time spent waiting for each answer being its deciding time.
+
+        Returns:
+        --------
+        bool: True if the player must now decide whether to reroll (answer with
+        continue_turn), False if the turn is already over.
+        """
+        player = self.players[self.current_player]
+        timing = self._start_timing()
+        self.roll_penny(player)
+        if timing is not None:
+            self._mark(_ROLL_TIME)
+        return self._step_decided(player, False)
+
+    def continue_turn(self, reroll):
+        """
+        Applies the current player's reroll decision.
+
+        Parameters:
+        -----------
+        reroll: bool
+            True to roll again, False to pass.
+
+        Returns:
+        --------
+        bool: True if the player must decide again, False if the turn is over.
+        """
+        player = self.players[self.current_player]
+        timing = self._timing
+        if timing is not None:
+            self._mark(_DECIDE_TIME)
+        if self.event_log is not None:
+            self.event_log.reroll(player.player_number, reroll)
+        if not reroll:
+            return self._step_decided(player, True)
+        self.roll_penny(player)
+        if timing is not None:
+            self._mark(_ROLL_TIME)
+        return self._step_decided(player, False)
+
+    def _step_decided(self, player, passed):
+        """
+        Ends a stepped turn if it is over, or else leaves the player deciding.
+        A turn begun before metrics were attached is not counted.
+        """
+        self.deciding = not passed and not self.board.crash and player.hand > 0
+        if not self.deciding:
+            if self._timing is None:
+                self.end_turn()
+            else:
+                self._end_timed_turn(player, passed)
+        return self.deciding
+
+    def end_turn(self):
+        """
+        Ends the current player's turn. After a crash the player picks up every penny
+        on the board; a player with an empty hand wins. Otherwise play passes on.
+        """
+        player = self.players[self.current_player]
+        log = self.event_log
+        if self.board.crash:
+            pennies = self.board.clear_board()
+            player.hand += pennies
+            self.crashes += 1
+            if log is not None:
+                log.pickup(self.current_player, pennies, player.hand)
+        elif player.hand == 0:
+            player.is_winner = True
+            self.game_winner = self.current_player
+            if log is not None:
+                log.win(self.current_player)
+        self.turns += 1
+        if not self.game_winner:
+            self.current_player = self.current_player % self.numplayers + 1
@@ -7,7 +7,8 @@
 # Last Modified: 11/22/24
 
 # Dependencies:
-# - No external dependencies
+# - sinks (DEFAULT_SINK)
+# - rules (DEFAULT_RULES)
 
 # Usage Example:
 # board = GameBoard()
@@ -16,13 +17,17 @@
 
 
 # Class Responsibilities:
-# - Track the game board state using slots 1 to 6.
+# - Track the game board state using slots 1 to 6 (or as many as the rules say).
 # - Handle adding pennies to slots and checking for penny collisions.
 # - Print the current state of the board and reset the board when needed.
 
+from .rules import DEFAULT_RULES
+from .sinks import DEFAULT_SINK
+
 class GameBoard:
     """
-    The GameBoard class manages the virtual 6-slot game board.
+    The GameBoard class manages the virtual 6-slot game board (or a board with
+    the slots given by its rules).
     It tracks the state of each slot, checks for crashes (instances where more than one 
     penny is added to the same slot), and provides methods to update and reset the board.
     
@@ -33,6 +38,14 @@ class GameBoard:
         (1 to 6), and values are 0 (empty), 1 (occupied), or >1 (crashed).
     crash: bool
         A flag that indicates whether a crash (penny collision) has occured
+    occupancy: int
+        The occupied slots as a bitmask (bit k - 1 is slot k), matching BitmaskBoard.mask.
+    metrics: GameMetrics
+        Counts every penny placed when set (default: None).
+    sink: ConsoleSink
+        Where print_board writes the board (default: the console).
+    rules: Rules
+        The rules the board follows: its slots and which slot empties itself.
 
     Methods:
     ---------
@@ -45,10 +58,16 @@ class GameBoard:
 
     clear_board():
         Resets the board and returns the number of pennies collected from all slots.
+
+    reset():
+        Empties the board in place for a new game.
     """
-    def __init__(self):
+    __slots__ = ("state", "crash", "metrics", "sink", "rules", "_empty")
+
+    def __init__(self, sink=None, rules=None):
         """
-        Initializes the GameBoard with six empty slots and sets the crash flag to False.
+        Initializes the GameBoard with empty slots (six by default) and sets the crash
+        flag to False.
 
         Attributes:
         -----------
@@ -56,9 +75,24 @@ class GameBoard:
             Initalizes all slots (1-6) with a value of 0 (empty)
         crash: bool
             Initalizes the crash flag to False
+        sink: ConsoleSink
+            Where print_board writes the board (default: the console).
+        rules: Rules
+            The rules to play by (default: the standard 6-slot rules).
         """
-        self.state = {1:0, 2:0, 3:0, 4:0, 5:0, 6:0} # Sets all slots as empty
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self._empty = dict.fromkeys(self.rules.slot_bits, 0)
+        self.state = self._empty.copy() # Sets all slots as empty
         self.crash = False # There is no penny collision
+        self.metrics = None # No metrics are collected
+        self.sink = sink if sink is not None else DEFAULT_SINK
+
+    @property
+    def occupancy(self):
+        """
+        The occupied slots as a bitmask (bit k - 1 is slot k).
+        """
+        return sum(1 << (slot - 1) for slot, value in self.state.items() if value)
     
     def print_board(self):
         """
@@ -67,6 +101,8 @@ class GameBoard:
         Each slot number is displayed next to its corresponding value:
         ( ) for empty, (O) for one penny, (X) for a crash
         """
+        if not self.sink.enabled:
+            return
         board_string = ""
         for key, value in self.state.items():
             if value == 0:
@@ -75,7 +111,7 @@ class GameBoard:
                 board_string += f"{key} (O) "
             else:
                 board_string += f"{key} (X) "
-        print(board_string)
+        self.sink.emit(board_string)
 
     def add_penny(self, slot):
         """
@@ -90,12 +126,17 @@ class GameBoard:
         -------
         ValueError: If the slot number is outside the range from 1 to 6
         """
-        if slot not in self.state:
-            raise ValueError("Slot number must be between 1 and 6.")
-    
-        self.state[6] = 0 # The sixth slot resets to empty
-        self.state[slot] += 1
-        if self.state[slot] > 1:
+        state = self.state
+        if slot not in state:
+            raise ValueError(f"Slot number must be between 1 and {len(state)}.")
+
+        free_slot = self.rules.free_slot
+        if self.metrics is not None:
+            self.metrics.penny(slot, free_slot and state[free_slot] > 0)
+        if free_slot:
+            state[free_slot] = 0 # The free slot (normally slot 6) resets to empty
+        state[slot] += 1
+        if state[slot] > 1:
             self.crash = True
     
     def clear_board(self):
@@ -108,7 +149,16 @@ class GameBoard:
             The total number of pennies collected from all slots before the board was reset. 
         """
         penny_return = sum(self.state.values())
-        self.state = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}  # Reset all slots to empty
+        self.state = self._empty.copy()  # Reset all slots to empty
         self.crash = False
         return penny_return
-    
\ No newline at end of file
+    
+
+    def reset(self):
+        """
+        Empties the board in place and resets the crash flag, ready for a new game.
+        """
+        state = self.state
+        for slot in state:
+            state[slot] = 0
+        self.crash = False
@@ -0,0 +1,114 @@
+# main.py
+# This file contains the interactive game played at the terminal. Nothing
+# happens on import; `python -m penny_game play` calls play().
+
+# Dependencies:
+#   - Game class
+#   - replay (GameRecord)
+#   - rules (get_rules)
+#   - sinks (ConsoleSink)
+
+# Usage Example:
+# play(rules="legacy", record_path="game.json")
+
+from .game import Game
+from .replay import GameRecord
+from .rules import get_rules
+from .sinks import ConsoleSink
+
+
+def basic_roll(current_player, myBoard):
+    """
+    Simulates a basic turn for the current player, including rolling the dice,
+    dropping a penny, and updating the game board.
+
+    The function performs the following steps:
+    1. Rolls a die to determine where to place the penny on the board.
+    2. Removes a penny from the current player's hand.
+    3. Adds the penny to the appropriate slot on the game board.
+    4. Checks if the game board has crashed after the penny is placed.
+    5. If no crash occurs, checks if the current player meets the winning condition.
+    6. Displays the current state of the game board.
+
+    Parameters:
+    current_player: Player
+        The player taking the roll.
+    myBoard: GameBoard
+        The board the penny is placed on.
+
+    Returns:
+    None
+    """
+     # get dice roll
+    roll_result = current_player.player_roll()
+    # take penny from player
+    current_player.drop_penny()
+    # place penny in proper slot
+    myBoard.add_penny(roll_result)
+    if myBoard.crash == False:
+        current_player.check_winner()
+     # show board
+    myBoard.print_board()
+
+
+def play(rules=None, record_path=None, sink=None):
+    """
+    Plays one game at the terminal, asking for the players and every human decision.
+
+    Parameters:
+    -----------
+    rules: Rules or str
+        The rules to play by (default: the standard rules).
+    record_path: str
+        Saves a GameRecord of the game here for replay.replay() when given.
+    sink: ConsoleSink
+        Where the game's messages go (default: a new ConsoleSink).
+
+    Returns:
+    --------
+    Game: The finished game.
+    """
+    input("Welcome to The Penny Game!\nPress Enter to continue:")
+    # initalize game and the board it plays on, both writing to the console
+    mySink = sink if sink is not None else ConsoleSink()
+    myRules = get_rules(rules)
+    myGame = Game(sink=mySink, rules=myRules)
+    myBoard = myGame.board
+    myGame.get_numplayers()
+    myGame.get_numcom()
+    myGame.create_players()
+    # record the seed and every human choice so the game can be replayed
+    myRecord = GameRecord(myGame.dice.seed, myGame.numplayers, myGame.numcom, rules=myRules)
+    for player in myGame.players.values():
+        if player.is_human:
+            player.strategy = myRecord.recorder()
+
+    # Set up play order
+    current_player_num = myGame.who_first()
+    # Main game loop
+    while not myGame.game_winner:
+        # set current player
+        current_player = myGame.players[current_player_num]
+        basic_roll(current_player, myBoard)
+
+        # Check for rerolls until the player passes or crashes
+        while not myBoard.crash and current_player.check_reroll(board=myBoard, game=myGame):
+            basic_roll(current_player, myBoard)
+        if myBoard.crash:
+            mySink.emit("Oh no! There has been a crash!")
+            player_pennies = myBoard.clear_board()
+            mySink.emit("Player {} picked up {}", current_player.player_number, player_pennies)
+            current_player.hand += player_pennies
+            mySink.emit("Their new hand size is  {} pennies.", current_player.hand)
+        else:
+            mySink.emit("{} has {} pennies remaining", current_player_num, current_player.hand)
+        if current_player.hand == 0:
+            myGame.game_winner = current_player.player_number
+        current_player_num = current_player.player_number % myGame.numplayers + 1
+    myGame.final_scores()
+    # save the game for replay.replay()
+    if record_path:
+        myRecord.save(record_path)
+        mySink.emit("Game record saved to {}", record_path)
+    mySink.flush()
+    return myGame
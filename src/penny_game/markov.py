@@ -0,0 +1,331 @@
+# markov.py
+# This file contains an exact analysis of The Penny Game as a Markov chain.
+# For a player count and COM strategies it works out the distribution of game
+# length, each seat's chance of winning and the pennies picked up per crash,
+# with no sampling error.
+
+# Dependencies:
+#   - numpy
+#   - bitmask_board (popcount table)
+#   - strategies (RandomStrategy, build_strategy)
+
+# Usage Example:
+# analysis = analyze(2, "threshold")
+# print(analysis.win_by_position, analysis.expected_turns)
+
+
+# How it works:
+# - The chain moves one turn at a time. A state is the board (slots 1-5; slot 6
+#   always empties before the next penny) and every hand, listed from the
+#   player to move.
+# - During a turn only the mover's hand and the board change, so the outcome of
+#   a turn (a win, a pass onto some board, or a crash and a new hand) depends
+#   only on the board and the mover's hand. Those turn outcomes are worked out
+#   once and shared by every state.
+# - Play always moves one seat along, so the player to move on turn t is known
+#   from t and the first player. The length distribution, split by turn number,
+#   therefore also gives the winner's seat.
+# - The distribution over states is pushed forward turn by turn until the
+#   chance that the game is still going is below `tolerance`.
+
+import numpy as np
+
+from .bitmask_board import POPCOUNT
+from .strategies import RandomStrategy, build_strategy
+
+SLOT6 = 32 # Occupancy bit of slot 6
+WIN = -1 # Turn outcome: the mover emptied their hand
+MAX_PICKUP = 6 # A crash picks up slots 1-5 and the penny just played
+PICKUP_BITS = 3 # Low bits of a crash outcome that hold the pennies picked up
+PICKUP_MASK = (1 << PICKUP_BITS) - 1
+_RESULTS = {} # Memoized analyses by rule set
+
+
+class MarkovAnalysis:
+    """
+    The MarkovAnalysis class holds the exact results for one set of rules.
+
+    Attributes:
+    -----------
+    num_players: int
+        The number of players.
+    starting_hand: int
+        The number of pennies each player starts with.
+    length: numpy.ndarray
+        length[t] is the probability that the game ends on turn t (1-based;
+        length[0] is 0).
+    unfinished: float
+        The probability left over when the analysis stopped.
+    win_by_position: numpy.ndarray
+        The chance of winning for the player who goes first, second, and so on.
+    win_by_seat: numpy.ndarray
+        The chance of winning for each seat (player 1 first) when who_first
+        picks the first player uniformly at random.
+    expected_turns: float
+        The mean game length in turns.
+    expected_crashes: float
+        The mean number of crashes per game.
+    pickup: numpy.ndarray
+        pickup[k] is the probability that a crash returns k pennies.
+    expected_pickup: float
+        The mean number of pennies picked up per crash.
+    states: int
+        The number of reachable turn-start states.
+    """
+
+    def __init__(self, num_players, starting_hand, length, unfinished, win_by_position,
+                 win_by_seat, expected_crashes, pickup, states):
+        self.num_players = num_players
+        self.starting_hand = starting_hand
+        self.length = length
+        self.unfinished = unfinished
+        self.win_by_position = win_by_position
+        self.win_by_seat = win_by_seat
+        self.expected_turns = float(np.dot(np.arange(len(length)), length))
+        self.expected_crashes = expected_crashes
+        self.pickup = pickup
+        self.expected_pickup = float(np.dot(np.arange(len(pickup)), pickup))
+        self.states = states
+
+    def length_quantile(self, fraction):
+        """
+        Returns the smallest number of turns by which the game has ended with at
+        least the given probability.
+        """
+        return int(np.searchsorted(np.cumsum(self.length), fraction))
+
+    def __repr__(self):
+        positions = ", ".join(f"{value:.4f}" for value in self.win_by_position)
+        return (
+            f"MarkovAnalysis({self.num_players} players, {self.starting_hand} pennies: "
+            f"win by position [{positions}], {self.expected_turns:.2f} turns, "
+            f"{self.expected_crashes:.2f} crashes, {self.expected_pickup:.2f} pennies per crash)"
+        )
+
+
+class _TurnOutcomes:
+    """
+    Works out the outcomes of a turn for one strategy, from a board and the
+    mover's hand. Outcomes are WIN, a passing state (board | hand << 5, zero or
+    more) or a crash (-2 - (new hand << 3 | pennies picked up)).
+    """
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self._decisions = {}
+        self._rolls = {}
+
+    def _reroll(self, occupancy, hand):
+        key = occupancy | hand << 6
+        chance = self._decisions.get(key)
+        if chance is None:
+            chance = self._decisions[key] = min(
+                1.0, max(0.0, float(self.strategy.reroll_probability(occupancy, hand))))
+        return chance
+
+    def roll(self, mask, hand):
+        """
+        Returns {outcome: probability} for rolling with `hand` pennies on `mask`.
+        """
+        key = mask | hand << 5
+        outcomes = self._rolls.get(key)
+        if outcomes is not None:
+            return outcomes
+        outcomes = {}
+        left = hand - 1
+        for face in range(6):
+            if face == 5:
+                placed, occupancy = mask, mask | SLOT6
+            else:
+                bit = 1 << face
+                if mask & bit:
+                    # Crash: the mover picks up the board and the penny just played
+                    picked = POPCOUNT[mask] + 1
+                    crash = -2 - ((left + picked) << PICKUP_BITS | picked)
+                    outcomes[crash] = outcomes.get(crash, 0.0) + 1 / 6
+                    continue
+                placed = occupancy = mask | bit
+            if left == 0:
+                outcomes[WIN] = outcomes.get(WIN, 0.0) + 1 / 6
+                continue
+            chance = self._reroll(occupancy, left)
+            if chance < 1.0:
+                passed = placed | left << 5
+                outcomes[passed] = outcomes.get(passed, 0.0) + (1.0 - chance) / 6
+            if chance > 0.0:
+                for outcome, probability in self.roll(placed, left).items():
+                    outcomes[outcome] = outcomes.get(outcome, 0.0) + chance * probability / 6
+        self._rolls[key] = outcomes
+        return outcomes
+
+
+def _resolve(spec):
+    """
+    Turns a strategy spec (an object, a registered name, a (name, params) pair or
+    None for the default COM choice) into a strategy object.
+    """
+    if spec is None:
+        return RandomStrategy(0.7) # Player.check_reroll rerolls 70% of the time
+    strategy = build_strategy(spec) if isinstance(spec, (str, tuple)) else spec
+    if not hasattr(strategy, "reroll_probability"):
+        raise ValueError(f"{strategy!r} decides from more than the board and its own hand, "
+                         "which the exact analysis cannot follow.")
+    return strategy
+
+
+def analyze(num_players, strategies=None, starting_hand=20, tolerance=1e-12,
+            max_turns=100000):
+    """
+    Analyzes a game exactly. Results are memoized per rule set.
+
+    Parameters:
+    -----------
+    num_players: int
+        The number of players.
+    strategies: strategy or list
+        One strategy for every seat, or a list with one per seat (player 1
+        first). Each is a Strategy, a registered name, a (name, params) pair or
+        None for the default COM choice (default: None).
+    starting_hand: int
+        The number of pennies each player starts with (default: 20).
+    tolerance: float
+        Stops once the chance the game is still going falls below this.
+    max_turns: int
+        Stops after this many turns regardless.
+
+    Returns:
+    --------
+    MarkovAnalysis: The exact results.
+
+    Raises:
+    -------
+    ValueError: If the player count, hand or strategy list is invalid.
+    """
+    if num_players < 1 or starting_hand < 1:
+        raise ValueError("An analysis needs at least one player and one penny each.")
+    if isinstance(strategies, list):
+        if len(strategies) != num_players:
+            raise ValueError(f"Expected {num_players} strategies, got {len(strategies)}.")
+        seats = [_resolve(spec) for spec in strategies]
+    else:
+        seats = [_resolve(strategies)] * num_players
+    key = (num_players, starting_hand, tolerance, max_turns,
+           tuple(seat.cache_key() for seat in seats))
+    result = _RESULTS.get(key)
+    if result is None:
+        result = _RESULTS[key] = _analyze(num_players, starting_hand, seats, tolerance,
+                                          max_turns)
+    return result
+
+
+def clear_results():
+    """
+    Forgets every memoized analysis.
+    """
+    _RESULTS.clear()
+
+
+def _analyze(n, starting_hand, seats, tolerance, max_turns):
+    # One set of turn outcomes per distinct strategy
+    kinds = {}
+    seat_kind = []
+    for seat in seats:
+        seat_kind.append(kinds.setdefault(seat.cache_key(), len(kinds)))
+    outcome_tables = [None] * len(kinds)
+    for seat, kind in zip(seats, seat_kind):
+        if outcome_tables[kind] is None:
+            outcome_tables[kind] = _TurnOutcomes(seat)
+
+    # Find every reachable turn-start state: (board, hands from the mover on)
+    start = (0, (starting_hand,) * n)
+    index = {start: 0}
+    states = [start]
+    transitions = [[] for _ in outcome_tables] # Per strategy: (from, to, probability)
+    finishing = [[] for _ in outcome_tables] # Per strategy: (state, win probability)
+    crashing = [[] for _ in outcome_tables] # Per strategy: (state, pennies picked up, probability)
+    position = 0
+    while position < len(states):
+        mask, hands = states[position]
+        others = hands[1:]
+        for kind, outcomes in enumerate(outcome_tables):
+            for outcome, probability in outcomes.roll(mask, hands[0]).items():
+                if outcome == WIN:
+                    finishing[kind].append((position, probability))
+                    continue
+                if outcome >= 0:
+                    following = (outcome & 31, others + (outcome >> 5,))
+                else:
+                    crash = -2 - outcome
+                    following = (0, others + (crash >> PICKUP_BITS,))
+                    crashing[kind].append((position, crash & PICKUP_MASK, probability))
+                target = index.get(following)
+                if target is None:
+                    target = index[following] = len(states)
+                    states.append(following)
+                transitions[kind].append((position, target, probability))
+        position += 1
+    count = len(states)
+
+    matrices = []
+    for kind in range(len(outcome_tables)):
+        edges = transitions[kind] or [(0, 0, 0.0)] # A one-penny game never passes
+        rows, cols, values = (np.array(column) for column in zip(*edges))
+        wins = np.zeros(count)
+        if finishing[kind]:
+            where, chance = zip(*finishing[kind])
+            np.add.at(wins, np.array(where), np.array(chance))
+        matrices.append((rows.astype(np.int64), cols.astype(np.int64), values, wins))
+
+    crash_rates = []
+    pickups = []
+    for kind in range(len(outcome_tables)):
+        rate = np.zeros(count)
+        sizes = None
+        if crashing[kind]:
+            where, picked, chance = (np.array(column) for column in zip(*crashing[kind]))
+            np.add.at(rate, where, chance)
+            sizes = (where, picked, chance)
+        crash_rates.append(rate)
+        pickups.append(sizes)
+
+    # Push the state distribution forward from each possible first player. When
+    # every seat plays the same strategy one first player stands for them all.
+    length = np.zeros(max_turns + 1)
+    win_by_position = np.zeros(n)
+    win_by_seat = np.zeros(n)
+    expected_crashes = 0.0
+    pickup = np.zeros(MAX_PICKUP + 1)
+    unfinished = 0.0
+    last_turn = 0
+    first_players = range(n) if len(kinds) > 1 else (0,)
+    weight = 1.0 / len(first_players)
+    for first in first_players:
+        current = np.zeros(count)
+        current[0] = 1.0
+        turn = 0
+        while turn < max_turns:
+            kind = seat_kind[(first + turn) % n]
+            rows, cols, values, wins = matrices[kind]
+            ended = float(np.dot(current, wins))
+            length[turn + 1] += weight * ended
+            win_by_position[turn % n] += weight * ended
+            win_by_seat[(first + turn) % n] += weight * ended
+            expected_crashes += weight * float(np.dot(current, crash_rates[kind]))
+            if pickups[kind] is not None:
+                where, picked, chance = pickups[kind]
+                np.add.at(pickup, picked, weight * current[where] * chance)
+            current = np.bincount(cols, weights=current[rows] * values, minlength=count)
+            turn += 1
+            if current.sum() < tolerance:
+                break
+        unfinished += weight * float(current.sum())
+        last_turn = max(last_turn, turn)
+    if len(kinds) == 1:
+        # who_first picks the first player uniformly, so every seat is alike
+        win_by_seat = np.full(n, win_by_position.sum() / n)
+
+    total_pickups = pickup.sum()
+    return MarkovAnalysis(
+        n, starting_hand, length[:last_turn + 1], unfinished, win_by_position, win_by_seat,
+        expected_crashes, pickup / total_pickups if total_pickups else pickup, count,
+    )
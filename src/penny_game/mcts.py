@@ -0,0 +1,264 @@
+# mcts.py
+# This file contains the Monte Carlo tree search COM player. Unlike the table
+# strategies it looks at every hand at the table, and it decides within a
+# fixed wall-clock budget, so a server can bound how long a COM turn takes
+# for any rules and any number of players.
+
+# Dependencies:
+#   - collections, math, random, time
+#   - rules (the board's lookup tables)
+
+# Usage Example:
+# strategy = MCTSStrategy(budget=0.005)
+# result = simulate_game(3, seed=1, strategies=[strategy, "threshold", "threshold"])
+# get_strategy("mcts", budget=None, iterations=500) # a fixed amount of search
+
+
+# How it works:
+# - A state is (board, hands, player to move) at a reroll decision, right
+#   after a roll that did not crash. The free slot empties before every
+#   penny, so only the other slots are kept in the board.
+# - Each search runs from the decision in front of the player: down the
+#   known states choosing reroll or pass by UCB1, through dice rolled from a
+#   private generator, until it reaches a state it has not seen. From there a
+#   quick playout finishes the game with the bust rule (reroll while the next
+#   roll crashes at most a third of the time, or with one penny left). Every
+#   decision on the way is credited with a win when the player who made it
+#   won. Everyone plays for their own win.
+# - The statistics of every state live in a transposition table keyed by
+#   (board, hands, player to move), the least recently used entry making room
+#   for a new one. The decision after a reroll, or the next turn's, usually
+#   starts from a state the last search already visited, so that work is
+#   kept rather than repeated.
+# - Searching stops at the budget or the iteration cap, whichever comes
+#   first. A search overruns the budget by at most one playout, which is cut
+#   off after max_rolls rolls, with the smallest hand taken as the winner.
+# - The generator is seeded from the player's dice for each decision, so with
+#   budget=None and an iteration cap, a game seed plays the same game again
+#   from a fresh strategy. With a wall-clock budget the number of searches,
+#   and so a close decision, can change from run to run.
+
+import math
+import random
+import time
+from collections import OrderedDict
+
+REROLL_VISITS, REROLL_WINS, PASS_VISITS, PASS_WINS = range(4) # Fields of a table entry
+
+
+class MCTSStrategy:
+    """
+    The MCTSStrategy class decides rerolls by Monte Carlo tree search.
+
+    Attributes:
+    -----------
+    name: str
+        The name the strategy is registered under.
+    budget: float
+        Seconds of search per decision, or None for no time limit.
+    iterations: int
+        The most searches per decision, or None for no cap.
+    exploration: float
+        The UCB1 exploration constant.
+    table_size: int
+        The most states kept in the transposition table.
+    max_rolls: int
+        Rolls after which a playout is scored by the smallest hand.
+    table: OrderedDict
+        Search statistics by (board, hands, player to move), least recently used first.
+    last_iterations: int
+        The number of searches behind the last decision.
+
+    Methods:
+    --------
+    should_reroll(occupancy, hands, mover, rules, seed):
+        Searches from a decision and returns True to reroll.
+    __call__(player, board, game):
+        Decides for a player during a game, as simulate_game's strategies do.
+    """
+    name = "mcts"
+
+    def __init__(self, budget=0.005, iterations=None, exploration=1.0, table_size=200000,
+                 max_rolls=400):
+        if budget is None and iterations is None:
+            raise ValueError("A search needs a time budget, an iteration cap or both.")
+        if table_size < 1:
+            raise ValueError("The transposition table needs room for at least one state.")
+        self.budget = budget
+        self.iterations = iterations
+        self.exploration = exploration
+        self.table_size = table_size
+        self.max_rolls = max_rolls
+        self.table = OrderedDict()
+        self.last_iterations = 0
+        self._random = random.Random()
+        self._layout = None
+
+    def _use_rules(self, rules):
+        """
+        Builds the per-face bits and the playout rule for a board layout. The
+        table is emptied, since states of different layouts cannot be mixed.
+        """
+        self._layout = (rules.slots, rules.die_faces, rules.free_slot)
+        self._bits = tuple(0 if face == rules.free_slot else rules.slot_bits[face]
+                           for face in range(1, rules.die_faces + 1))
+        self._popcount = rules.popcount
+        self._safe = tuple(risk <= 1 / 3 for risk in rules.bust)
+        self._crash_mask = rules.crash_mask
+        self.table.clear()
+
+    def should_reroll(self, occupancy, hands, mover, rules, seed=None):
+        """
+        Searches from a decision and returns whether to roll again.
+
+        Parameters:
+        -----------
+        occupancy: int
+            The board's occupancy bitmask.
+        hands: sequence
+            Every player's hand, in seat order.
+        mover: int
+            The seat (from 0) of the player deciding.
+        rules: Rules
+            The rules being played.
+        seed: float
+            Seeds the dice the search rolls (default: fresh randomness).
+
+        Returns:
+        --------
+        bool
+            True to reroll, False to pass.
+        """
+        if (rules.slots, rules.die_faces, rules.free_slot) != self._layout:
+            self._use_rules(rules)
+        self._random.seed(seed)
+        mask = occupancy & self._crash_mask
+        hands = tuple(hands)
+        deadline = None if self.budget is None else time.perf_counter() + self.budget
+        limit = self.iterations
+        count = 0
+        while limit is None or count < limit:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._search(mask, hands, mover)
+            count += 1
+        self.last_iterations = count
+
+        node = self.table.get((mask, hands, mover))
+        if node is None or node[REROLL_VISITS] == node[PASS_VISITS]:
+            return hands[mover] == 1 or self._safe[mask]
+        return node[REROLL_VISITS] > node[PASS_VISITS]
+
+    def _search(self, mask, hands, mover):
+        """
+        Runs one search from a decision and credits every decision on its path.
+        """
+        table = self.table
+        bits = self._bits
+        popcount = self._popcount
+        safe = self._safe
+        roll = self._random.random
+        faces = len(bits)
+        seats = len(hands)
+        c = self.exploration
+        hands = list(hands)
+        path = []
+        winner = -1
+
+        while True:
+            key = (mask, tuple(hands), mover)
+            node = table.get(key)
+            if node is None:
+                node = table[key] = [0, 0, 0, 0]
+                if len(table) > self.table_size:
+                    table.popitem(last=False)
+                reroll = hands[mover] == 1 or safe[mask]
+                path.append((node, reroll, mover))
+                break
+            table.move_to_end(key)
+            reroll_visits, pass_visits = node[REROLL_VISITS], node[PASS_VISITS]
+            if not reroll_visits:
+                reroll = True
+            elif not pass_visits:
+                reroll = False
+            else:
+                spread = c * math.sqrt(math.log(reroll_visits + pass_visits))
+                reroll = (node[REROLL_WINS] / reroll_visits + spread / math.sqrt(reroll_visits)
+                          >= node[PASS_WINS] / pass_visits + spread / math.sqrt(pass_visits))
+            path.append((node, reroll, mover))
+            mask, mover, winner = _advance(mask, hands, mover, reroll, bits, faces, popcount,
+                                           seats, roll)
+            if winner >= 0:
+                break
+
+        if winner < 0:
+            # Play the game out with the bust rule from the new state
+            # (the rolls of _advance, inlined as this is where the time goes)
+            if not path[-1][1]:
+                mover = (mover + 1) % seats
+            for _ in range(self.max_rolls):
+                bit = bits[int(roll() * faces)]
+                hand = hands[mover] - 1
+                if mask & bit:
+                    hands[mover] = hand + popcount[mask] + 1
+                    mask = 0
+                    mover = (mover + 1) % seats
+                    continue
+                hands[mover] = hand
+                if not hand:
+                    winner = mover
+                    break
+                mask |= bit
+                if hand != 1 and not safe[mask]:
+                    mover = (mover + 1) % seats
+            else:
+                winner = hands.index(min(hands))
+
+        for node, reroll, decider in path:
+            won = decider == winner
+            if reroll:
+                node[REROLL_VISITS] += 1
+                node[REROLL_WINS] += won
+            else:
+                node[PASS_VISITS] += 1
+                node[PASS_WINS] += won
+
+    def __call__(self, player, board, game):
+        """
+        Decides whether a player rolls again in a game.
+        """
+        players = game.players
+        hands = [players[number].hand for number in range(1, game.numplayers + 1)]
+        return self.should_reroll(board.occupancy, hands, game.current_player - 1, board.rules,
+                                  player.dice.random())
+
+    def __repr__(self):
+        return (f"MCTSStrategy(budget={self.budget!r}, iterations={self.iterations!r}, "
+                f"exploration={self.exploration!r}, table_size={self.table_size!r}, "
+                f"max_rolls={self.max_rolls!r})")
+
+
+def _advance(mask, hands, mover, reroll, bits, faces, popcount, seats, roll):
+    """
+    Plays a decision out to the next one. Passing hands the dice on; the
+    player to move then rolls, and after a crash picks up the board and the
+    penny just played and the next player rolls. Updates hands in place.
+
+    Returns:
+    --------
+    tuple: (board, player to move, winner), the winner being -1 while the
+    game goes on.
+    """
+    if not reroll:
+        mover = (mover + 1) % seats
+    while True:
+        bit = bits[int(roll() * faces)]
+        hand = hands[mover] - 1
+        if mask & bit:
+            hands[mover] = hand + popcount[mask] + 1
+            mask = 0
+            mover = (mover + 1) % seats
+            continue
+        hands[mover] = hand
+        mask |= bit
+        return mask, mover, mover if hand == 0 else -1
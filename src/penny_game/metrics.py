@@ -0,0 +1,327 @@
+# metrics.py
+# This file contains gameplay metrics: counters and histograms that the turn
+# loop and the board update while games are played, and exporters that write
+# them to a local file as JSON or as Prometheus text.
+
+# Dependencies:
+#   - bisect, json, os
+
+# Usage Example:
+# metrics = GameMetrics()
+# game.metrics = metrics # also attaches the metrics to the game's board
+# ... play ...
+# metrics.write("penny_game.prom") # or "penny_game.json"
+
+
+# How it works:
+# - Metrics are off unless a GameMetrics is attached, and the game only checks
+#   for one once per turn and once per penny, so the disabled cost is a
+#   comparison against None.
+# - There is one turn loop. With metrics attached it also times each phase of
+#   the turn (rolling, deciding and settling), whether the turn is played by
+#   Game.play_turn or a decision at a time with begin_turn and continue_turn.
+# - Attaching metrics to a game sizes the per-slot counts to its rules.
+# - Metrics from several games or worker processes can be combined with merge().
+
+import bisect
+import json
+import os
+
+PHASES = ("roll", "decide", "settle")
+
+
+class Histogram:
+    """
+    The Histogram class counts observations into fixed buckets.
+
+    Attributes:
+    -----------
+    bounds: tuple
+        The upper bound of each bucket, in increasing order. Values above the
+        last bound fall into a final overflow bucket.
+    counts: list
+        The number of observations in each bucket (len(bounds) + 1 of them).
+    total: float
+        The sum of all observations.
+    count: int
+        The number of observations.
+    """
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        Adds one observation.
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def mean(self):
+        """
+        Returns the mean observation, or 0.0 if there are none.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other):
+        """
+        Adds another histogram with the same bounds into this one.
+        """
+        if other.bounds != self.bounds:
+            raise ValueError("Only histograms with the same bounds can be merged.")
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.count += other.count
+
+    def to_dict(self):
+        """
+        Returns the histogram as a dictionary of JSON-ready values.
+        """
+        return {"bounds": list(self.bounds), "counts": list(self.counts),
+                "sum": self.total, "count": self.count}
+
+
+class GameMetrics:
+    """
+    The GameMetrics class collects counters and histograms from games.
+
+    Attributes:
+    -----------
+    games: int
+        Games started.
+    wins: int
+        Games won.
+    turns: int
+        Turns played.
+    pennies: list
+        Pennies placed in each slot (index 0 is slot 1), one per roll. There is
+        one entry per slot of the rules played (six by default).
+    slot6_resets: int
+        Times a penny in slot 6 was swept off by the next roll.
+    rerolls, passes: int
+        Reroll decisions, by answer.
+    crashes: int
+        Turns that ended in a crash.
+    pennies_picked_up: int
+        Pennies taken back after crashes.
+    phase_seconds: dict
+        Time spent in each turn phase ("roll", "decide", "settle").
+    pickup: Histogram
+        Pennies picked up per crash.
+    turn_rolls: Histogram
+        Rolls per turn.
+    turn_seconds: Histogram
+        Time per turn.
+    game_turns: Histogram
+        Turns per won game.
+
+    Methods:
+    --------
+    penny(slot, slot6_reset):
+        Counts one penny placed on a board.
+    turn(...):
+        Counts one finished turn.
+    merge(other):
+        Adds another GameMetrics into this one.
+    to_dict() / to_prometheus():
+        Export as JSON-ready data or as Prometheus text.
+    write(path):
+        Writes the metrics to a file, as Prometheus text for a .prom file and
+        JSON otherwise.
+    """
+
+    __slots__ = (
+        "games", "wins", "turns", "pennies", "slot6_resets", "rerolls", "passes",
+        "crashes", "pennies_picked_up", "phase_seconds", "pickup", "turn_rolls",
+        "turn_seconds", "game_turns",
+    )
+
+    def __init__(self, slots=6):
+        self.games = 0
+        self.wins = 0
+        self.turns = 0
+        self.pennies = [0] * slots
+        self.slot6_resets = 0
+        self.rerolls = 0
+        self.passes = 0
+        self.crashes = 0
+        self.pennies_picked_up = 0
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.pickup = Histogram((1, 2, 3, 4, 5, 6, 8, 10, 15, 20))
+        self.turn_rolls = Histogram((1, 2, 3, 4, 5, 6, 8, 10))
+        self.turn_seconds = Histogram((1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 1e-3))
+        self.game_turns = Histogram((10, 20, 30, 40, 50, 75, 100, 200, 500, 1000))
+
+    def use_slots(self, slots):
+        """
+        Sizes the per-slot penny counts for a board with `slots` slots.
+
+        Raises:
+        -------
+        ValueError: If pennies have already been counted for a different board.
+        """
+        if len(self.pennies) == slots:
+            return
+        if any(self.pennies):
+            raise ValueError(
+                f"These metrics counted pennies on {len(self.pennies)} slots; "
+                f"the game has {slots}."
+            )
+        self.pennies = [0] * slots
+
+    @property
+    def rolls(self):
+        """
+        The number of pennies placed, which is the number of rolls.
+        """
+        return sum(self.pennies)
+
+    def penny(self, slot, slot6_reset):
+        """
+        Counts a penny placed in a slot, and whether it swept a penny off slot 6.
+        """
+        self.pennies[slot - 1] += 1
+        if slot6_reset:
+            self.slot6_resets += 1
+
+    def turn(self, rolls, rerolls, passed, pickup, timings):
+        """
+        Counts one finished turn.
+
+        Parameters:
+        -----------
+        rolls: int
+            Rolls during the turn.
+        rerolls: int
+            Times the player chose to roll again.
+        passed: bool
+            Whether the player chose to stop (rather than crashing or running out).
+        pickup: int
+            Pennies picked up after a crash, or None if the turn did not crash.
+        timings: tuple
+            Seconds spent rolling, deciding and settling the turn.
+        """
+        self.turns += 1
+        self.rerolls += rerolls
+        if passed:
+            self.passes += 1
+        if pickup is not None:
+            self.crashes += 1
+            self.pennies_picked_up += pickup
+            self.pickup.observe(pickup)
+        self.turn_rolls.observe(rolls)
+        phase_seconds = self.phase_seconds
+        for phase, seconds in zip(PHASES, timings):
+            phase_seconds[phase] += seconds
+        self.turn_seconds.observe(sum(timings))
+
+    def game_won(self, turns):
+        """
+        Counts a won game and its length in turns.
+        """
+        self.wins += 1
+        self.game_turns.observe(turns)
+
+    def merge(self, other):
+        """
+        Adds the counts of another GameMetrics into this one.
+        """
+        if len(other.pennies) != len(self.pennies):
+            raise ValueError("Only metrics for boards with the same slots can be merged.")
+        for name in ("games", "wins", "turns", "slot6_resets", "rerolls", "passes",
+                     "crashes", "pennies_picked_up"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for index, count in enumerate(other.pennies):
+            self.pennies[index] += count
+        for phase, seconds in other.phase_seconds.items():
+            self.phase_seconds[phase] += seconds
+        for name in ("pickup", "turn_rolls", "turn_seconds", "game_turns"):
+            getattr(self, name).merge(getattr(other, name))
+
+    def to_dict(self):
+        """
+        Returns the metrics as a dictionary of JSON-ready values.
+        """
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "turns": self.turns,
+            "rolls": self.rolls,
+            "pennies_by_slot": {str(slot): count for slot, count in enumerate(self.pennies, 1)},
+            "slot6_resets": self.slot6_resets,
+            "rerolls": self.rerolls,
+            "passes": self.passes,
+            "crashes": self.crashes,
+            "pennies_picked_up": self.pennies_picked_up,
+            "phase_seconds": dict(self.phase_seconds),
+            "pickup": self.pickup.to_dict(),
+            "turn_rolls": self.turn_rolls.to_dict(),
+            "turn_seconds": self.turn_seconds.to_dict(),
+            "game_turns": self.game_turns.to_dict(),
+        }
+
+    def to_prometheus(self, prefix="penny_game"):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+
+        def counter(name, help_text, value, labels=None):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            if labels is None:
+                lines.append(f"{prefix}_{name} {value}")
+            else:
+                for label, labelled_value in zip(labels, value):
+                    lines.append(f"{prefix}_{name}{{{label}}} {labelled_value}")
+
+        def histogram(name, help_text, values):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            cumulative = 0
+            for bound, count in zip(values.bounds + ("+Inf",), values.counts):
+                cumulative += count
+                lines.append(f'{prefix}_{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{prefix}_{name}_sum {values.total}")
+            lines.append(f"{prefix}_{name}_count {values.count}")
+
+        counter("games_total", "Games started.", self.games)
+        counter("wins_total", "Games won.", self.wins)
+        counter("turns_total", "Turns played.", self.turns)
+        counter("pennies_total", "Pennies placed, by slot.", self.pennies,
+                [f'slot="{slot}"' for slot in range(1, len(self.pennies) + 1)])
+        counter("slot6_resets_total", "Pennies swept off slot 6.", self.slot6_resets)
+        counter("rerolls_total", "Decisions to roll again.", self.rerolls)
+        counter("passes_total", "Decisions to stop rolling.", self.passes)
+        counter("crashes_total", "Turns that ended in a crash.", self.crashes)
+        counter("pennies_picked_up_total", "Pennies taken back after crashes.",
+                self.pennies_picked_up)
+        counter("phase_seconds_total", "Time spent in each turn phase.",
+                list(self.phase_seconds.values()), [f'phase="{phase}"' for phase in PHASES])
+        histogram("pickup_pennies", "Pennies picked up per crash.", self.pickup)
+        histogram("turn_rolls", "Rolls per turn.", self.turn_rolls)
+        histogram("turn_seconds", "Time per turn.", self.turn_seconds)
+        histogram("game_turns", "Turns per won game.", self.game_turns)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Writes the metrics to a file, replacing it in one step so a reader never
+        sees a half-written file. Files ending in .prom get Prometheus text, and
+        any other file gets JSON.
+        """
+        if path.endswith(".prom"):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.to_dict(), indent=2) + "\n"
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            file.write(text)
+        os.replace(temporary, path)
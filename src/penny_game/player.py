@@ -6,7 +6,9 @@
 # Created: 10/01/24
 
 # Dependencies:
-# - random
+# - DiceStream class
+# - sinks (DEFAULT_SINK)
+# - rules (DEFAULT_RULES)
 
 # Usage Example:
 # player = Player(is_human=True)
@@ -24,7 +26,9 @@
 # - Provide methods for adding or removing pennies and 
 #   checking win conditions
 
-import random
+from .dice import DiceStream
+from .rules import DEFAULT_RULES
+from .sinks import DEFAULT_SINK
 
 
 class Player:
@@ -36,18 +40,28 @@ class Player:
     Attributes:
     -----------
     player_number: int
-        Tracks the player number in sequence.
+        The player's seat number within their game, starting at 1.
     hand: int
         The number of pennies each player has in their hand.
     is_human: bool
         Whether the player is human or a computer.
     is_winner: bool
         Indicates if the player has won the game.
+    dice: DiceStream
+        The source of the player's dice rolls and random COM choices.
+    strategy: callable
+        The reroll strategy, called as strategy(player, board, game), or None
+        for the default COM choice.
+    sink: ConsoleSink
+        Where the player's messages go (default: the console).
+    rules: Rules
+        The rules of the player's game, which set the starting hand.
     
     Methods:
     --------
     roll_dice(): 
-        Rolls a virtual die and returns an integer in [1, 6].
+        Rolls a virtual die and returns an integer in [1, 6] (or up to the
+        number of faces the rules give the die).
     announce_roll(roll: int):
         Announces the player's roll value.
     player_roll():
@@ -56,12 +70,16 @@ class Player:
         Adds a specified number of pennies to the player's hand.
     drop_penny():
         Removes a single penny from the player's hand.
-    check_reroll(input_method='default'):
+    check_reroll(input_method='default', board=None, game=None):
         Determines if the player will reroll the dice or pass their turn.
+    reset(hand=None, dice=None):
+        Gets the player ready for a new game.
     """
-    player_number = 0
+    __slots__ = ("player_number", "hand", "is_human", "is_winner", "dice", "strategy", "sink",
+                 "rules")
 
-    def __init__(self, is_human=False):
+    def __init__(self, is_human=False, dice=None, strategy=None, player_number=1, sink=None,
+                 rules=None):
         """
         Initializes the Player class with the provided parameters.
 
@@ -69,12 +87,46 @@ class Player:
         -----------
         is_human: bool
             Determines if the player is human or a computer (default: False).
+        dice: DiceStream
+            The source of the player's dice rolls and random COM choices
+            (default: a new, randomly seeded stream).
+        strategy: callable
+            The reroll strategy (default: None, the original COM choice). A human
+            player with a strategy is played automatically.
+        player_number: int
+            The player's seat number, assigned by Game.create_players (default: 1).
+        sink: ConsoleSink
+            Where the player's messages go: a ConsoleSink, BufferedSink or NullSink
+            (default: the console).
+        rules: Rules
+            The rules to play by, which set the starting hand and the die
+            (default: the standard rules, 20 pennies and a six-sided die).
         """
-        Player.player_number += 1
-        self.player_number = Player.player_number
-        self.hand = 20
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.player_number = player_number
+        self.hand = self.rules.starting_hand
         self.is_human = is_human
         self.is_winner = False
+        self.dice = dice if dice is not None else DiceStream(faces=self.rules.die_faces)
+        self.strategy = strategy
+        self.sink = sink if sink is not None else DEFAULT_SINK
+
+    def reset(self, hand=None, dice=None):
+        """
+        Gets the player ready for a new game, keeping their seat and strategy.
+
+        Parameters:
+        -----------
+        hand: int
+            The number of pennies to start with (default: the rules' starting
+            hand, normally 20).
+        dice: DiceStream
+            A new source of rolls (default: keep the current one).
+        """
+        self.hand = hand if hand is not None else self.rules.starting_hand
+        self.is_winner = False
+        if dice is not None:
+            self.dice = dice
 
     def announce_hand(self):
         """
@@ -86,7 +138,7 @@ class Player:
         Player 2 has 5 pennies.
         """
         penny_label = "penny" if self.hand == 1 else "pennies"
-        print(f"Player {self.player_number} has {self.hand} {penny_label}.")
+        self.sink.emit("Player {} has {} {}.", self.player_number, self.hand, penny_label)
 
     def roll_dice(self):
         """
@@ -95,9 +147,9 @@ class Player:
         Returns:
         --------
         int
-            A random integer from 1 to 6, inclusive.
+            A random integer from 1 to 6 (the number of die faces), inclusive.
         """
-        return random.randint(1, 6)
+        return self.dice.roll()
 
     def announce_roll(self, roll):
         """
@@ -108,7 +160,7 @@ class Player:
         roll: int
             The rolled value, an integer in [1, 6].
         """
-        print(f"Player {self.player_number} rolled a {roll}!") 
+        self.sink.emit("Player {} rolled a {}!", self.player_number, roll)
 
     def player_roll(self):
         """
@@ -119,8 +171,9 @@ class Player:
         int
             The result of the dice roll.
         """
-        print(f"Player {self.player_number}, it's your turn.")
+        self.sink.emit("Player {}, it's your turn.", self.player_number)
         if self.is_human:
+            self.sink.flush()
             input("Press Enter to roll.")
         roll = self.roll_dice()
         self.announce_roll(roll)
@@ -157,7 +210,7 @@ class Player:
             raise ValueError("Cannot drop a penny. Player has no pennies left.")
         self.hand -= 1
 
-    def check_reroll(self, input_method='default'):
+    def check_reroll(self, input_method='default', board=None, game=None):
         """
         Determines if the player wants to reroll the dice.
 
@@ -165,6 +218,10 @@ class Player:
         -----------
         input_method: str or callable
             The method to get input for human players. Defaults to 'default'.
+        board: GameBoard
+            The current board, which the player's strategy decides from.
+        game: Game
+            The current game, passed on to the player's strategy.
 
         Returns:
         --------
@@ -175,7 +232,12 @@ class Player:
             self.is_winner = True
             return False
 
+        if self.strategy is not None and board is not None:
+            return self.strategy(self, board, game)
+
         if self.is_human:
+            if input_method == 'default':
+                self.sink.flush()
             user_reroll = input_method if input_method != 'default' else input(
                 f"Player {self.player_number}, would you like to roll again? (y/n): "
             )
@@ -183,10 +245,10 @@ class Player:
                 return True
             if user_reroll.lower() in {"n", "no"}:
                 return False
-            print(f"{user_reroll} is not valid. Please answer 'yes' or 'no'.")
+            self.sink.emit("{} is not valid. Please answer 'yes' or 'no'.", user_reroll)
         else:
             # Simulate computer's choice (can be adjusted with game logic)
-            return random.random() > 0.3
+            return self.dice.random() > 0.3
 
     def check_winner(self):
         """
@@ -0,0 +1,322 @@
+# policy_solver.py
+# This file contains an exact solver for the reroll decision. It computes, for
+# every board and every combination of hands, whether rolling again or passing
+# gives the player to move the better chance of winning, and stores the answer
+# in a compact table that COM players can look up in constant time.
+
+# Dependencies:
+#   - hashlib, math, os, struct, tempfile
+#   - bitmask_board (slot bits and popcount table)
+
+# Usage Example:
+# policy = load_policy(num_players=2, starting_hand=20)
+# result = simulate_game(2, seed=1, strategies=[policy, None])
+
+
+# How it works:
+# - Slot 6 empties before every penny, so only slots 1-5 matter for the future.
+#   A board is the 5-bit mask of those slots.
+# - Hands are listed starting with the player to move. Everyone maximizes their
+#   own chance of winning.
+# - The number of pennies in play (hands plus slots 1-5) never goes up, and only
+#   a roll of 6 brings it down. The solver works through these levels from the
+#   bottom, running value iteration inside each level.
+# - At a decision every hand holds at least one penny and the hands add up to
+#   at most the pennies dealt. The table has one entry per board for each
+#   such combination of hands, found by its rank (the combinatorial number
+#   system), so it grows with the states a game can reach rather than with
+#   every hand up to the total for every player.
+
+import hashlib
+import math
+import os
+import struct
+import tempfile
+
+from .bitmask_board import POPCOUNT
+
+SOLVER_VERSION = 2
+BOARD_MASKS = 32 # Occupancy of slots 1-5
+MAX_TABLE_ENTRIES = 1 << 26 # Larger tables take too long to solve and too much memory to hold
+CRASH_SLOT_BITS = (1, 2, 4, 8, 16)
+CACHE_ENV = "PENNY_GAME_CACHE"
+_HEADER = struct.Struct("<4sBBH")
+_MAGIC = b"PPOL"
+
+
+class OptimalPolicy:
+    """
+    The OptimalPolicy class holds a solved reroll table and acts as a COM strategy.
+
+    A table entry is 1 when rolling again is at least as likely to win as passing.
+
+    Attributes:
+    -----------
+    num_players: int
+        The number of players the table was solved for.
+    starting_hand: int
+        The number of pennies each player started with.
+    table: bytes
+        One byte per (board, hands) state, 1 to reroll and 0 to pass.
+
+    Methods:
+    --------
+    should_reroll(occupancy, hands):
+        Looks up the decision for a board and hands (player to move first).
+    __call__(player, board, game):
+        Decides for a player during a game, as simulate_game's strategies do.
+    """
+
+    def __init__(self, num_players, starting_hand, table):
+        self.num_players = num_players
+        self.starting_hand = starting_hand
+        self.table = bytes(table)
+        self._total = num_players * starting_hand
+        self._ranks = _rank_table(num_players, self._total)
+        expected = table_entries(num_players, starting_hand)
+        if len(self.table) != expected:
+            raise ValueError(f"Policy table has {len(self.table)} entries, expected {expected}.")
+
+    def should_reroll(self, occupancy, hands):
+        """
+        Looks up whether the player to move should roll again.
+
+        Parameters:
+        -----------
+        occupancy: int
+            The board's occupancy bitmask (slot 6 is ignored).
+        hands: sequence
+            Every player's hand, starting with the player to move. Each holds
+            at least one penny.
+
+        Returns:
+        --------
+        bool
+            True to reroll, False to pass.
+        """
+        return self.table[_index(occupancy & 0x1F, hands, self._ranks)] == 1
+
+    def __call__(self, player, board, game):
+        """
+        Decides whether a player rolls again in a game.
+
+        Raises:
+        -------
+        ValueError: If the game does not have the number of players or the board,
+        or holds more pennies than, the table was solved for.
+        """
+        if game.numplayers != self.num_players:
+            raise ValueError(
+                f"Policy solved for {self.num_players} players, game has {game.numplayers}."
+            )
+        rules = board.rules
+        if (rules.slots, rules.die_faces, rules.free_slot) != (6, 6, 6):
+            raise ValueError(f"Policy solved for the standard board, game plays by {rules}.")
+        players = game.players
+        number = game.current_player
+        hands = [players[(number + offset - 1) % game.numplayers + 1].hand
+                 for offset in range(game.numplayers)]
+        if sum(hands) > self._total:
+            raise ValueError(
+                f"Policy solved for {self.starting_hand} pennies each, game has more in play."
+            )
+        return self.should_reroll(board.occupancy, hands)
+
+
+def table_entries(num_players, starting_hand):
+    """
+    Returns the number of entries in a policy table: one per board for every
+    combination of hands of at least one penny that add up to at most the
+    pennies dealt.
+    """
+    return BOARD_MASKS * math.comb(num_players * starting_hand, num_players)
+
+
+def _rank_table(num_players, total):
+    """
+    Returns ranks[k][c] = comb(c, k + 1), the binomials _index adds up.
+    """
+    return [[math.comb(c, k + 1) for c in range(total)] for k in range(num_players)]
+
+
+def _index(mask, hands, ranks):
+    """
+    Maps a board and hands to a position in the policy table.
+
+    The running totals of the hands less one, each moved up by its position,
+    are a strictly increasing set of numbers below the pennies dealt, and the
+    combinatorial number system ranks that set.
+    """
+    rank = 0
+    running = 0
+    for k, hand in enumerate(hands):
+        running += hand - 1
+        rank += ranks[k][running + k]
+    return rank * BOARD_MASKS + mask
+
+
+def _compositions(total, parts, first_min):
+    """
+    Yields every tuple of `parts` hands that sum to `total`, with the first hand
+    at least `first_min` and every other hand at least 1.
+    """
+    if parts == 1:
+        if total >= first_min:
+            yield (total,)
+        return
+    for first in range(first_min, total - parts + 2):
+        for rest in _compositions(total - first, parts - 1, 1):
+            yield (first,) + rest
+
+
+def solve_policy(num_players, starting_hand, tolerance=1e-10):
+    """
+    Solves the reroll decision exactly for every reachable state.
+
+    Parameters:
+    -----------
+    num_players: int
+        The number of players.
+    starting_hand: int
+        The number of pennies each player starts with.
+    tolerance: float
+        Value iteration inside a level stops once no win probability moves by more than this.
+
+    Returns:
+    --------
+    OptimalPolicy: The solved policy.
+
+    Raises:
+    -------
+    ValueError: If the number of players or the starting hand is less than 1,
+    or the table would have more than MAX_TABLE_ENTRIES entries.
+    """
+    if num_players < 1 or starting_hand < 1:
+        raise ValueError("A policy needs at least one player and one penny each.")
+    entries = table_entries(num_players, starting_hand)
+    if entries > MAX_TABLE_ENTRIES:
+        raise ValueError(
+            f"A policy for {num_players} players with {starting_hand} pennies each needs "
+            f"{entries:,} table entries, more than the {MAX_TABLE_ENTRIES:,} that can be solved."
+        )
+    n = num_players
+    total = n * starting_hand
+    ranks = _rank_table(n, total)
+    table = bytearray(entries)
+    # Win probabilities (relative to the player to move) at the start of a roll
+    values = {}
+    win = (1.0,) + (0.0,) * (n - 1)
+
+    def rotate_back(value):
+        # Values from the next player's point of view, re-ordered for the current player
+        return value[-1:] + value[:-1]
+
+    def decide(mask, hands):
+        # Best of rolling again and passing, after a roll that did not crash
+        reroll = values[mask, hands]
+        if n == 1:
+            return reroll, True
+        passed = rotate_back(values[mask, hands[1:] + hands[:1]])
+        if reroll[0] >= passed[0]:
+            return reroll, True
+        return passed, False
+
+    def roll_value(mask, hands):
+        count = POPCOUNT[mask]
+        after_drop = (hands[0] - 1,) + hands[1:]
+        # Slot 6: the penny leaves play
+        outcome = win if after_drop[0] == 0 else decide(mask, after_drop)[0]
+        parts = [outcome]
+        for bit in CRASH_SLOT_BITS:
+            if mask & bit:
+                # Crash: pick up the board plus the penny just played, turn ends
+                picked = (hands[0] + count,) + hands[1:]
+                if n == 1:
+                    parts.append(values[0, picked])
+                else:
+                    parts.append(rotate_back(values[0, picked[1:] + picked[:1]]))
+            elif after_drop[0] == 0:
+                parts.append(win)
+            else:
+                parts.append(decide(mask | bit, after_drop)[0])
+        return tuple(sum(column) / 6.0 for column in zip(*parts))
+
+    for level in range(1, total + 1):
+        # States in this level, busiest boards first so most updates use fresh values
+        states = []
+        for mask in sorted(range(BOARD_MASKS), key=lambda m: -POPCOUNT[m]):
+            in_hands = level - POPCOUNT[mask]
+            if in_hands >= n:
+                states.extend((mask, hands) for hands in _compositions(in_hands, n, 1))
+        for state in states:
+            values[state] = (1.0 / n,) * n
+        delta = 1.0
+        while delta > tolerance:
+            delta = 0.0
+            for state in states:
+                new = roll_value(*state)
+                change = abs(new[0] - values[state][0])
+                if change > delta:
+                    delta = change
+                values[state] = new
+        for mask, hands in states:
+            if decide(mask, hands)[1]:
+                table[_index(mask, hands, ranks)] = 1
+
+    return OptimalPolicy(num_players, starting_hand, table)
+
+
+def cache_key(num_players, starting_hand):
+    """
+    Returns the cache key for a set of rule parameters.
+    """
+    rules = f"version={SOLVER_VERSION};players={num_players};hand={starting_hand};slots=6;free=6"
+    return hashlib.sha1(rules.encode()).hexdigest()[:16]
+
+
+def default_cache_dir():
+    """
+    Returns the policy cache directory: $PENNY_GAME_CACHE or ~/.cache/penny-game.
+    """
+    return os.environ.get(CACHE_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "penny-game"
+    )
+
+
+def load_policy(num_players=2, starting_hand=20, cache_dir=None):
+    """
+    Loads a solved policy from the disk cache, solving and saving it on a miss.
+
+    Parameters:
+    -----------
+    num_players: int
+        The number of players (default: 2).
+    starting_hand: int
+        The number of pennies each player starts with (default: 20).
+    cache_dir: str
+        Where solved tables are kept (default: default_cache_dir()).
+
+    Returns:
+    --------
+    OptimalPolicy: The solved policy.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    path = os.path.join(cache_dir, f"policy-{cache_key(num_players, starting_hand)}.bin")
+    try:
+        with open(path, "rb") as cache_file:
+            data = cache_file.read()
+        magic, version, players, hand = _HEADER.unpack_from(data)
+        if (magic, version, players, hand) == (_MAGIC, SOLVER_VERSION, num_players, starting_hand):
+            return OptimalPolicy(num_players, starting_hand, data[_HEADER.size:])
+    except (OSError, struct.error, ValueError):
+        pass
+
+    policy = solve_policy(num_players, starting_hand)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first so readers never see a half-written table
+    handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    with os.fdopen(handle, "wb") as cache_file:
+        cache_file.write(_HEADER.pack(_MAGIC, SOLVER_VERSION, num_players, starting_hand))
+        cache_file.write(policy.table)
+    os.replace(temp_path, path)
+    return policy
@@ -0,0 +1,242 @@
+# replay.py
+# This file contains deterministic game replay. A game is fully described by
+# its root seed, its seats and the reroll decisions its human players made, so
+# any game can be rebuilt and fast-forwarded to any turn without prompts or
+# terminal output.
+
+# Dependencies:
+#   - json
+#   - Game class
+#   - GameBoard class
+#   - DiceStream class
+#   - strategies (build_strategy)
+#   - rules (get_rules)
+
+# Usage Example:
+# record = GameRecord(seed=1234, num_players=3, num_com=2)
+# ... play, with record.recorder() as the human seat's strategy ...
+# record.save("game.json")
+# game = replay(GameRecord.load("game.json"), turn=500)
+# game.board.print_board()
+
+
+# How it works:
+# - Every roll comes from a player's child of the game's DiceStream, and COM
+#   players decide with their own stream or a named strategy, so the seed alone
+#   reproduces everything except what the human players chose.
+# - Human reroll answers are recorded in the order the game asked for them and
+#   handed back in the same order. Records store them as a string of "1"
+#   (reroll) and "0" (pass).
+
+import json
+
+from .dice import DiceStream
+from .game import Game
+from .game_board import GameBoard
+from .rules import DEFAULT_RULES, get_rules
+from .strategies import build_strategy
+
+RECORD_VERSION = 1
+
+
+class DecisionRecorder:
+    """
+    The DecisionRecorder class is a reroll strategy that asks another strategy
+    (or the player, through check_reroll) and writes each answer down.
+
+    Attributes:
+    -----------
+    decisions: list
+        The list that answers are appended to, as True or False.
+    strategy: callable
+        The strategy asked for each decision; None asks the player.
+    """
+
+    def __init__(self, decisions, strategy=None):
+        self.decisions = decisions
+        self.strategy = strategy
+
+    def __call__(self, player, board, game=None):
+        if self.strategy is not None:
+            decision = bool(self.strategy(player, board, game))
+        else:
+            decision = bool(player.check_reroll())
+        self.decisions.append(decision)
+        return decision
+
+
+class DecisionReplay:
+    """
+    The DecisionReplay class is a reroll strategy that gives back recorded
+    decisions in order. Every human seat of a replayed game shares one.
+
+    Attributes:
+    -----------
+    decisions: sequence
+        The recorded decisions, True to reroll and False to pass.
+    position: int
+        The number of decisions used so far.
+    """
+
+    def __init__(self, decisions):
+        self.decisions = decisions
+        self.position = 0
+
+    def __call__(self, player, board, game=None):
+        if self.position >= len(self.decisions):
+            raise ValueError(
+                f"The record ran out of human decisions after {self.position} "
+                f"(player {player.player_number} is deciding)."
+            )
+        decision = self.decisions[self.position]
+        self.position += 1
+        return decision
+
+
+class GameRecord:
+    """
+    The GameRecord class holds everything needed to replay one game.
+
+    Attributes:
+    -----------
+    seed: int
+        The root seed of the game's DiceStream.
+    num_players: int
+        The total number of players.
+    num_com: int
+        The number of COM players. Human seats come first.
+    strategies: list
+        A strategy spec (a registered name or a (name, params) pair) for each
+        COM seat in player order, or None for the default COM choice.
+    decisions: list
+        The human reroll decisions (True or False) in the order they were made.
+    rules: Rules
+        The rules the game was played by (default: the standard rules).
+
+    Methods:
+    --------
+    recorder(strategy=None):
+        Returns a DecisionRecorder that appends to this record.
+    to_dict() / from_dict(data):
+        Convert to and from plain JSON-ready data.
+    save(path) / load(path):
+        Write and read the record as JSON.
+    """
+
+    def __init__(self, seed, num_players, num_com, strategies=None, decisions=None,
+                 rules=None):
+        self.seed = seed
+        self.num_players = num_players
+        self.num_com = num_com
+        self.strategies = list(strategies) if strategies is not None else [None] * num_com
+        self.decisions = list(decisions) if decisions is not None else []
+        self.rules = get_rules(rules)
+
+    def recorder(self, strategy=None):
+        """
+        Returns a strategy for a human seat that records each decision here.
+
+        Parameters:
+        -----------
+        strategy: callable
+            Makes the decisions (default: ask the player with check_reroll).
+        """
+        return DecisionRecorder(self.decisions, strategy)
+
+    def to_dict(self):
+        """
+        Returns the record as a dictionary of JSON-ready values. Games played by
+        the standard rules leave the rules out.
+        """
+        data = {
+            "version": RECORD_VERSION,
+            "seed": self.seed,
+            "num_players": self.num_players,
+            "num_com": self.num_com,
+            "strategies": self.strategies,
+            "decisions": "".join("1" if decision else "0" for decision in self.decisions),
+        }
+        if self.rules != DEFAULT_RULES:
+            data["rules"] = self.rules.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a record from the output of to_dict().
+
+        Raises:
+        -------
+        ValueError: If the record was written by an unknown version.
+        """
+        if data.get("version") != RECORD_VERSION:
+            raise ValueError(f"Unsupported game record version: {data.get('version')}.")
+        strategies = [
+            spec if spec is None or isinstance(spec, str) else tuple(spec)
+            for spec in data["strategies"]
+        ]
+        return cls(data["seed"], data["num_players"], data["num_com"], strategies,
+                   [answer == "1" for answer in data["decisions"]], data.get("rules"))
+
+    def save(self, path):
+        """
+        Writes the record to a JSON file.
+        """
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a record from a JSON file.
+        """
+        with open(path) as file:
+            return cls.from_dict(json.load(file))
+
+    def __repr__(self):
+        return (
+            f"GameRecord(seed={self.seed}, num_players={self.num_players}, "
+            f"num_com={self.num_com}, decisions={len(self.decisions)})"
+        )
+
+
+def replay(record, turn=None, board=None):
+    """
+    Rebuilds a recorded game and plays it forward without any terminal I/O.
+
+    Parameters:
+    -----------
+    record: GameRecord
+        The game to rebuild.
+    turn: int
+        Stops once this many turns have been played (default: play to the end).
+        The returned game is then exactly as it was at the start of the next turn.
+    board: GameBoard
+        The board to play on (default: a new GameBoard), built for the
+        record's rules.
+
+    Returns:
+    --------
+    Game: The game, with its board, players, dice and turn count restored.
+
+    Raises:
+    -------
+    ValueError: If the record runs out of human decisions before `turn`.
+    """
+    rules = record.rules
+    game = Game(board=board if board is not None else GameBoard(rules=rules),
+                dice=DiceStream(record.seed, faces=rules.die_faces), rules=rules)
+    game.numplayers = record.num_players
+    game.numcom = record.num_com
+    humans = record.num_players - record.num_com
+    decisions = DecisionReplay(record.decisions)
+    game.create_players(
+        strategies=[decisions] * humans + [
+            build_strategy(spec) if spec is not None else None for spec in record.strategies
+        ]
+    )
+    game.start(announce=False)
+    play_turn = game.play_turn
+    while not game.game_winner and (turn is None or game.turns < turn):
+        play_turn()
+    return game
@@ -0,0 +1,179 @@
+# rules.py
+# This file contains the Rules class, which describes a variant of The Penny
+# Game: how many slots the board has, how many pennies each player starts
+# with, how many faces the die has and which slot empties itself.
+
+# Dependencies:
+#   - None
+
+# Usage Example:
+# rules = Rules(slots=8, starting_hand=15)
+# game = Game(rules=rules) # the board, players and dice follow the rules
+# legacy = get_rules("legacy") # the original game, with 10 pennies each
+
+
+# How it works:
+# - A die face k puts a penny in slot k. A second penny in a slot crashes the
+#   board, except in the free slot, which empties before every penny.
+# - Everything the game looks up while playing (slot bits, popcounts, the
+#   chance that the next roll crashes for every board) is worked out once per
+#   board layout and shared by every Rules object with that layout, so a
+#   variant plays as fast as the standard game.
+# - Boards have at most 8 slots, so an occupancy bitmask fits in one byte (as
+#   in an event log record).
+
+MAX_SLOTS = 8
+MIN_FACES = 2 # who_first rerolls ties, which a one-faced die never breaks
+_TABLES = {} # (slots, die_faces, free_slot) -> derived lookup tables
+
+
+class Rules:
+    """
+    The Rules class holds one set of game rules and its lookup tables.
+
+    Attributes:
+    -----------
+    slots: int
+        The number of slots on the board (default: 6).
+    starting_hand: int
+        The number of pennies each player starts with (default: 20).
+    die_faces: int
+        The number of faces on the die (default: one per slot).
+    free_slot: int
+        The slot that empties before every penny, or 0 for none (default: the
+        last slot).
+    slot_bits: dict
+        The occupancy bit of each slot number.
+    free_bit: int
+        The occupancy bit of the free slot (0 if there is none).
+    crash_mask: int
+        The bits of the slots that can crash (every slot but the free one).
+    popcount: tuple
+        The number of pennies on a board, by occupancy bitmask.
+    bust: tuple
+        The chance that the next roll crashes a board, by occupancy bitmask.
+    """
+
+    __slots__ = ("slots", "starting_hand", "die_faces", "free_slot", "slot_bits", "free_bit",
+                 "crash_mask", "popcount", "bust")
+
+    def __init__(self, slots=6, starting_hand=20, die_faces=None, free_slot=None):
+        """
+        Parameters:
+        -----------
+        slots: int
+            The number of slots, from 2 to 8 (default: 6).
+        starting_hand: int
+            Pennies per player at the start (default: 20).
+        die_faces: int
+            Faces on the die, from 2 to slots (default: slots). A one-faced
+            die could never settle who goes first.
+        free_slot: int
+            The self-emptying slot, or 0 for none (default: slots).
+
+        Raises:
+        -------
+        ValueError: If the rules describe an impossible game.
+        """
+        if die_faces is None:
+            die_faces = slots
+        if free_slot is None:
+            free_slot = slots
+        if not MIN_FACES <= slots <= MAX_SLOTS:
+            raise ValueError(
+                f"A board needs between {MIN_FACES} and {MAX_SLOTS} slots, not {slots}."
+            )
+        if starting_hand < 1:
+            raise ValueError("Players need at least one penny to start with.")
+        if not MIN_FACES <= die_faces <= slots:
+            raise ValueError(
+                f"The die needs between {MIN_FACES} and {slots} faces, not {die_faces}."
+            )
+        if not 0 <= free_slot <= slots:
+            raise ValueError(f"The free slot must be between 0 (none) and {slots}.")
+        self.slots = slots
+        self.starting_hand = starting_hand
+        self.die_faces = die_faces
+        self.free_slot = free_slot
+        layout = (slots, die_faces, free_slot)
+        tables = _TABLES.get(layout)
+        if tables is None:
+            tables = _TABLES[layout] = _build_tables(*layout)
+        self.slot_bits, self.free_bit, self.crash_mask, self.popcount, self.bust = tables
+
+    @property
+    def key(self):
+        """
+        A tuple that identifies the rules.
+        """
+        return (self.slots, self.starting_hand, self.die_faces, self.free_slot)
+
+    def to_dict(self):
+        """
+        Returns the rules as a dictionary of JSON-ready values.
+        """
+        return {"slots": self.slots, "starting_hand": self.starting_hand,
+                "die_faces": self.die_faces, "free_slot": self.free_slot}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds rules from the output of to_dict().
+        """
+        return cls(**data)
+
+    def __eq__(self, other):
+        return isinstance(other, Rules) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return (f"Rules(slots={self.slots}, starting_hand={self.starting_hand}, "
+                f"die_faces={self.die_faces}, free_slot={self.free_slot})")
+
+
+def _build_tables(slots, die_faces, free_slot):
+    """
+    Works out the lookup tables for one board layout.
+    """
+    slot_bits = {slot: 1 << (slot - 1) for slot in range(1, slots + 1)}
+    free_bit = slot_bits.get(free_slot, 0)
+    crash_mask = ((1 << slots) - 1) & ~free_bit
+    popcount = tuple(bin(mask).count("1") for mask in range(1 << slots))
+    crash_faces = [slot_bits[face] for face in range(1, die_faces + 1) if face != free_slot]
+    bust = tuple(
+        sum(1 for bit in crash_faces if mask & bit) / die_faces for mask in range(1 << slots)
+    )
+    return slot_bits, free_bit, crash_mask, popcount, bust
+
+
+DEFAULT_RULES = Rules()
+
+RULES = {
+    "standard": DEFAULT_RULES,
+    "legacy": Rules(starting_hand=10), # old/pennygame.py dealt 10 pennies each
+}
+
+
+def get_rules(spec=None):
+    """
+    Returns rules from a spec: None for the standard rules, a Rules object, a
+    registered name, or a dictionary of Rules parameters.
+
+    Raises:
+    -------
+    ValueError: If no rules have that name.
+    """
+    if spec is None:
+        return DEFAULT_RULES
+    if isinstance(spec, Rules):
+        return spec
+    if isinstance(spec, dict):
+        return Rules.from_dict(spec)
+    try:
+        return RULES[spec]
+    except KeyError:
+        raise ValueError(
+            f"Unknown rules {spec!r}. Choose from: {', '.join(sorted(RULES))}."
+        ) from None
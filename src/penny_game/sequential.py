@@ -0,0 +1,130 @@
+# sequential.py
+# This file contains the scheduler that tournaments and sweeps share. It plays
+# the shards of many units (matchups or sweep cells) across worker processes
+# and can stop each unit as soon as its question is answered, moving the
+# workers on to the units that are still undecided.
+
+# Dependencies:
+#   - concurrent.futures
+
+# Usage Example:
+# run_until_decided([[args, args], [args]], play_shard, finish,
+#                   decided=lambda unit: stats[unit].games > 5000, workers=4)
+
+
+# How it works:
+# - Each unit has a queue of jobs: argument tuples for play(), or Done(result)
+#   for work already done, such as a cached shard.
+# - Jobs are handed out round-robin over the units that are undecided and
+#   still have jobs, keeping two per worker in flight.
+# - Results are finished in each unit's queue order, whatever order workers
+#   return them in, and decided(unit) is asked after each one. A unit stops
+#   at the first prefix of its queue that decides it, so the outcome does not
+#   depend on the worker count. Results for a unit that has already been
+#   decided are dropped.
+# - Stopping on the data is only sound when decided() uses an interval that
+#   holds at every sample size at once, such as stats.confidence_sequence.
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+class Done:
+    """
+    The Done class marks a job whose result is already known.
+    """
+
+    __slots__ = ("result",)
+
+    def __init__(self, result):
+        self.result = result
+
+
+def run_until_decided(queues, play, finish, decided=None, workers=1):
+    """
+    Plays every unit's queue of jobs until it is decided or empty.
+
+    Parameters:
+    -----------
+    queues: list
+        A list of jobs for each unit: argument tuples for play(), or Done objects.
+    play: callable
+        Plays one job. It must be picklable to run in worker processes.
+    finish: callable
+        Called as finish(unit, job_index, result, played) for each result in
+        queue order; played is False for a Done job.
+    decided: callable
+        Called as decided(unit) after each finished result; True stops the
+        unit. None plays every job.
+    workers: int
+        Worker processes. With 1, jobs are played in this process.
+
+    Returns:
+    --------
+    list: The number of jobs finished for each unit.
+    """
+    count = len(queues)
+    submitted = [0] * count # Next job to hand out, per unit
+    finished = [0] * count # Next job to finish, per unit
+    stopped = [False] * count
+    ready = [{} for _ in range(count)] # Results that arrived before their turn
+    cursor = 0
+
+    def next_job():
+        nonlocal cursor
+        for step in range(count):
+            unit = (cursor + step) % count
+            if not stopped[unit] and submitted[unit] < len(queues[unit]):
+                cursor = unit + 1
+                index = submitted[unit]
+                submitted[unit] += 1
+                return unit, index, queues[unit][index]
+        return None
+
+    def deliver(unit, index, result, played):
+        ready[unit][index] = (result, played)
+        results = ready[unit]
+        while not stopped[unit] and finished[unit] in results:
+            result, played = results.pop(finished[unit])
+            finish(unit, finished[unit], result, played)
+            finished[unit] += 1
+            if decided is not None and decided(unit):
+                stopped[unit] = True
+                results.clear()
+
+    workers = min(workers, sum(not isinstance(job, Done) for queue in queues for job in queue))
+    if workers <= 1:
+        job = next_job()
+        while job is not None:
+            unit, index, args = job
+            if isinstance(args, Done):
+                deliver(unit, index, args.result, False)
+            else:
+                deliver(unit, index, play(*args), True)
+            job = next_job()
+        return finished
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    in_flight = {}
+    try:
+        while True:
+            while len(in_flight) < 2 * workers:
+                job = next_job()
+                if job is None:
+                    break
+                unit, index, args = job
+                if isinstance(args, Done):
+                    deliver(unit, index, args.result, False)
+                else:
+                    in_flight[executor.submit(play, *args)] = (unit, index)
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                unit, index = in_flight.pop(future)
+                if not stopped[unit]:
+                    deliver(unit, index, future.result(), True)
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+    return finished
@@ -0,0 +1,430 @@
+# server.py
+# This file contains the asyncio game server, which hosts many tables at once
+# in one event loop, and a load generator that plays against it. Each client
+# connection sits in seat 1 of its own table against COM players; the server
+# plays the COM turns straight away and waits for the client's reroll answers.
+
+# Dependencies:
+#   - asyncio, argparse, gc, json
+#   - simulation (GamePool)
+#   - DiceStream class
+#   - strategies (build_strategy)
+
+# Usage Example:
+# python -m penny_game.server serve --port 7878             # or --unix /tmp/penny.sock
+# python -m penny_game.server serve --port 7878 --offer mcts # let clients ask for MCTS
+# python -m penny_game.server load --port 7878 --clients 10000 --think 1.0
+
+
+# Protocol (one JSON object per line, both ways):
+# - Client: {"op": "new", "players": 3, "seed": 42, "strategy": "threshold"}
+#   starts a game; players defaults to 2 and the seed and COM strategy are
+#   optional. The strategy is one of the names the server offers
+#   (SERVER_STRATEGIES by default); each is built once and shared by every
+#   table, so a client cannot make the server build, or search for longer
+#   than, anything it was not started with.
+# - Server: {"event": "start", "seed": ..., "first": ...}
+# - Server: {"event": "decide", "turn": ..., "board": ..., "hands": [...]} when
+#   seat 1 must choose, with the board's occupancy bitmask after its roll.
+# - Client: {"reroll": true} or {"reroll": false}
+# - Server: {"event": "end", "winner": ..., "turns": ..., "hands": [...], "seed": ...}
+#   after which the client may start another game or disconnect.
+# - Server: {"event": "error", "message": ...} for a bad request.
+# The seed plus the client's answers in order replay the game with replay.py.
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import time
+from array import array
+
+from .dice import DiceStream
+from .simulation import GamePool
+from .strategies import build_strategy
+
+HUMAN_SEAT = 1
+MALFORMED = object() # _receive's answer for a line that could not be read as JSON
+# COM strategies clients may ask for, by name, with their default settings. Each
+# decides from a lookup table. A searching one such as "mcts" runs for milliseconds
+# per decision on the event loop, stalling every table, so an operator has to offer it.
+SERVER_STRATEGIES = {name: name for name in ("random", "threshold", "bust", "legacy")}
+
+
+def _encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+async def _receive(reader):
+    """
+    Reads one message, or returns None when the other side has gone and
+    MALFORMED for a line that is too long or not JSON.
+    """
+    try:
+        line = await reader.readline()
+        if not line:
+            return None
+        return json.loads(line)
+    except ValueError: # Bad JSON, bad UTF-8, or a line over the stream limit
+        return MALFORMED
+
+
+class GameServer:
+    """
+    The GameServer class serves tables over TCP or a Unix socket.
+
+    Attributes:
+    -----------
+    tables: int
+        Tables with a game in progress.
+    games_played: int
+        Games finished since the server started.
+    address: tuple or str
+        The (host, port) or socket path the server listens on, once started.
+
+    Methods:
+    --------
+    start():
+        Starts listening.
+    serve_forever():
+        Serves until cancelled.
+    close():
+        Stops listening and waits for the server to shut down.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, path=None, max_turns=10000, backlog=4096,
+                 gc_interval=None, strategies=None):
+        """
+        Parameters:
+        -----------
+        host, port: str, int
+            The TCP address to listen on (port 0 picks a free port).
+        path: str
+            Listen on this Unix socket instead of TCP.
+        max_turns: int
+            Ends a game without a winner after this many turns.
+        backlog: int
+            Connections that may wait to be accepted.
+        gc_interval: float
+            When set, Python's automatic full garbage collections are turned off
+            while the server runs and one is made every gc_interval seconds
+            instead. With thousands of connections a full collection walks every
+            connection's objects and stalls all tables for 100 ms or more, so it
+            is better made on a schedule than at random.
+        strategies: dict
+            Strategy specs by the name clients ask for them with (default:
+            SERVER_STRATEGIES). Every COM decision runs in the event loop, so
+            only strategies that decide quickly belong here.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_turns = max_turns
+        self.backlog = backlog
+        self.tables = 0
+        self.games_played = 0
+        self.address = None
+        self._server = None
+        self._pool = GamePool()
+        self._strategy_specs = dict(SERVER_STRATEGIES if strategies is None else strategies)
+        self._strategies = {}
+        self.gc_interval = gc_interval
+        self._gc_threshold = None
+        self._gc_task = None
+
+    async def start(self):
+        """
+        Starts listening for clients.
+        """
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._serve_client, self.path, backlog=self.backlog)
+            self.address = self.path
+        else:
+            self._server = await asyncio.start_server(
+                self._serve_client, self.host, self.port, backlog=self.backlog)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        if self.gc_interval:
+            self._gc_threshold = gc.get_threshold()
+            gc.collect()
+            gc.freeze() # Startup objects never need collecting
+            gc.set_threshold(self._gc_threshold[0], self._gc_threshold[1], 1 << 30)
+            self._gc_task = asyncio.create_task(self._collect_periodically())
+        return self
+
+    async def _collect_periodically(self):
+        while True:
+            await asyncio.sleep(self.gc_interval)
+            gc.collect()
+
+    async def serve_forever(self):
+        """
+        Serves clients until the task is cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops accepting clients and waits for the listener to close.
+        """
+        if self._gc_task is not None:
+            self._gc_task.cancel()
+            gc.set_threshold(*self._gc_threshold)
+            gc.unfreeze()
+            self._gc_task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _strategy(self, name):
+        """
+        Returns the COM strategy offered under a name, building each one once.
+
+        Raises:
+        -------
+        ValueError: If the server does not offer a strategy by that name.
+        """
+        if name is None:
+            return None
+        if not isinstance(name, str) or name not in self._strategy_specs:
+            raise ValueError(
+                f"strategy must be one of: {', '.join(sorted(self._strategy_specs))}."
+            )
+        strategy = self._strategies.get(name)
+        if strategy is None:
+            spec = self._strategy_specs[name]
+            strategy = self._strategies[name] = build_strategy(
+                spec if isinstance(spec, str) else tuple(spec))
+        return strategy
+
+    def _new_table(self, request):
+        """
+        Sets up a game for a "new" request.
+
+        Raises:
+        -------
+        ValueError: If the request asks for an impossible game.
+        """
+        players = request.get("players", 2)
+        if not isinstance(players, int) or not 2 <= players <= 5:
+            raise ValueError("players must be an integer from 2 to 5.")
+        strategy = self._strategy(request.get("strategy"))
+        game = self._pool.acquire(players, players - 1, DiceStream(request.get("seed")),
+                                  [None] + [strategy] * (players - 1))
+        return game
+
+    async def _serve_client(self, reader, writer):
+        try:
+            while True:
+                request = await _receive(reader)
+                if request is None:
+                    break
+                if request is MALFORMED:
+                    writer.write(_encode({"event": "error",
+                                          "message": "Expected one JSON object per line."}))
+                    continue
+                if not isinstance(request, dict) or request.get("op") != "new":
+                    writer.write(_encode({"event": "error", "message": "Expected a 'new' request."}))
+                    continue
+                try:
+                    game = self._new_table(request)
+                except (ValueError, TypeError) as error:
+                    writer.write(_encode({"event": "error", "message": str(error)}))
+                    continue
+                self.tables += 1
+                try:
+                    finished = await self._play(game, reader, writer)
+                finally:
+                    self.tables -= 1
+                    self._pool.release(game)
+                if not finished:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _play(self, game, reader, writer):
+        """
+        Plays one game, asking the client for seat 1's decisions.
+
+        Returns:
+        --------
+        bool: True if the game finished, False if the client left.
+        """
+        players = game.players
+        writer.write(_encode({"event": "start", "seed": game.dice.seed,
+                              "first": game.start(announce=False)}))
+        max_turns = self.max_turns
+        while not game.game_winner and game.turns < max_turns:
+            if game.current_player != HUMAN_SEAT:
+                game.play_turn() # COM turns need no waiting
+                continue
+            deciding = game.begin_turn()
+            while deciding:
+                writer.write(_encode({
+                    "event": "decide",
+                    "turn": game.turns,
+                    "board": game.board.occupancy,
+                    "hands": [player.hand for player in players.values()],
+                }))
+                await writer.drain()
+                answer = await _receive(reader)
+                if answer is None:
+                    return False
+                reroll = answer.get("reroll") if isinstance(answer, dict) else None
+                if not isinstance(reroll, bool):
+                    writer.write(_encode({"event": "error",
+                                          "message": "Expected {\"reroll\": true or false}."}))
+                    continue
+                deciding = game.continue_turn(reroll)
+        self.games_played += 1
+        writer.write(_encode({
+            "event": "end",
+            "winner": game.game_winner or None,
+            "turns": game.turns,
+            "hands": [player.hand for player in players.values()],
+            "seed": game.dice.seed,
+        }))
+        await writer.drain()
+        return True
+
+
+def _threshold_player(board):
+    """
+    The load generator's decisions: reroll while fewer than two of slots 1-5 are taken.
+    """
+    return bin(board & 0x1F).count("1") < 2
+
+
+async def _load_client(connect, games, players, think, latencies, rng, delay):
+    await asyncio.sleep(delay)
+    reader, writer = await connect()
+    try:
+        for _ in range(games):
+            sent = time.perf_counter()
+            writer.write(_encode({"op": "new", "players": players}))
+            while True:
+                message = await _receive(reader)
+                if sent is not None: # Time only the first reply to each message
+                    latencies.append(time.perf_counter() - sent)
+                    sent = None
+                event = message["event"]
+                if event == "end":
+                    break
+                if event == "decide":
+                    if think:
+                        await asyncio.sleep(rng.uniform(0, 2 * think))
+                    sent = time.perf_counter()
+                    writer.write(_encode({"reroll": _threshold_player(message["board"])}))
+                elif event == "error":
+                    raise RuntimeError(message["message"])
+    finally:
+        writer.close()
+
+
+async def run_load(clients, games=1, players=3, think=0.0, ramp=0.0, host="127.0.0.1",
+                   port=7878, path=None, seed=0):
+    """
+    Connects many clients to a server, plays games and measures latency.
+
+    Parameters:
+    -----------
+    clients: int
+        The number of concurrent connections.
+    games: int
+        Games played by each client, one after another.
+    players: int
+        Seats per table.
+    think: float
+        Average seconds a client waits before each answer, like a person would
+        (spread evenly from 0 to twice this).
+    ramp: float
+        Seconds over which the clients connect, spread evenly.
+    seed: int
+        Seeds the think times.
+
+    Returns:
+    --------
+    dict: The number of messages, the run time, and latency percentiles in
+    milliseconds from each client message (or previous answer) to the reply.
+    """
+    if path is not None:
+        connect = lambda: asyncio.open_unix_connection(path)
+    else:
+        connect = lambda: asyncio.open_connection(host, port)
+    latencies = array("d")
+    rng = random.Random(seed)
+    # Keep the generator's own full collections from showing up as server latency
+    threshold = gc.get_threshold()
+    gc.set_threshold(threshold[0], threshold[1], 1 << 30)
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _load_client(connect, games, players, think, latencies, rng, ramp * index / clients)
+            for index in range(clients)
+        ))
+    finally:
+        gc.set_threshold(*threshold)
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "clients": clients,
+        "messages": len(ordered),
+        "seconds": elapsed,
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def main(argv=None):
+    """
+    Runs the server or the load generator from the command line.
+    """
+    parser = argparse.ArgumentParser(description="The Penny Game table server.")
+    parser.add_argument("mode", choices=("serve", "load"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--unix", metavar="PATH", help="use a Unix socket instead of TCP")
+    parser.add_argument("--gc-interval", type=float, default=60.0,
+                        help="serve: seconds between full garbage collections (default: %(default)s)")
+    parser.add_argument("--offer", nargs="+", default=[], metavar="NAME",
+                        help="serve: more registered strategies for clients, such as mcts")
+    parser.add_argument("--clients", type=int, default=1000, help="load: connections")
+    parser.add_argument("--games", type=int, default=1, help="load: games per client")
+    parser.add_argument("--players", type=int, default=3, help="load: seats per table")
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="load: average seconds before each answer (default: %(default)s)")
+    parser.add_argument("--ramp", type=float, default=5.0,
+                        help="load: seconds over which clients connect (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.mode == "serve":
+        strategies = dict(SERVER_STRATEGIES, **{name: name for name in args.offer})
+        server = GameServer(args.host, args.port, args.unix, gc_interval=args.gc_interval,
+                            strategies=strategies)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    report = asyncio.run(run_load(args.clients, args.games, args.players, args.think,
+                                  args.ramp, args.host, args.port, args.unix))
+    print(f"{report['clients']} clients, {report['messages']} messages in "
+          f"{report['seconds']:.1f}s")
+    print(f"latency p50 {report['p50_ms']:.2f} ms, p90 {report['p90_ms']:.2f} ms, "
+          f"p99 {report['p99_ms']:.2f} ms, max {report['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
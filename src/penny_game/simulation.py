@@ -0,0 +1,180 @@
+# simulation.py
+# This file contains the headless game engine used for batch simulation.
+# It plays complete games with the Game, Player and GameBoard classes
+# without printing anything or asking for input.
+
+# Dependencies:
+#   - Game class
+#   - DiceStream class
+#   - BitmaskBoard class
+#   - rules (get_rules)
+
+# Usage Example:
+# result = simulate_game(4, seed=1)
+# print(result.winner, result.turns)
+
+from .bitmask_board import BitmaskBoard
+from .dice import DiceStream
+from .game import Game
+from .rules import get_rules
+
+
+class GameResult:
+    """
+    The GameResult class holds the outcome of one simulated game.
+
+    Attributes:
+    -----------
+    seed: int
+        The seed the game was played with (None if unseeded).
+    winner: int
+        The number of the winning player, or None if the turn limit was reached.
+    first_player: int
+        The number of the player who went first.
+    turns: int
+        The number of turns played.
+    crashes: int
+        The number of crashes during the game.
+    hands: tuple
+        The final hand of each player, in player order.
+    """
+
+    __slots__ = ("seed", "winner", "first_player", "turns", "crashes", "hands")
+
+    def __init__(self, seed, winner, first_player, turns, crashes, hands):
+        self.seed = seed
+        self.winner = winner
+        self.first_player = first_player
+        self.turns = turns
+        self.crashes = crashes
+        self.hands = hands
+
+    def __repr__(self):
+        return (
+            f"GameResult(seed={self.seed}, winner={self.winner}, "
+            f"first_player={self.first_player}, turns={self.turns}, "
+            f"crashes={self.crashes}, hands={self.hands})"
+        )
+
+
+class GamePool:
+    """
+    The GamePool class keeps finished games so their Game, Player and board
+    objects can be reset and played again instead of being rebuilt.
+
+    Methods:
+    --------
+    acquire(num_players, num_com, dice, strategies, rules):
+        Returns a game ready to play, reused if one is idle.
+    release(game):
+        Returns a finished game to the pool.
+    """
+
+    def __init__(self):
+        self._idle = {} # (players, COM players, rules) -> idle games
+
+    def acquire(self, num_players, num_com, dice, strategies=None, rules=None):
+        """
+        Returns a game with fresh players, rolling from `dice`, ready for who_first.
+        The game plays by `rules` (default: the standard rules).
+        """
+        rules = get_rules(rules)
+        idle = self._idle.get((num_players, num_com, rules))
+        if idle:
+            game = idle.pop()
+            game.reset(dice)
+        else:
+            game = Game(board=BitmaskBoard(rules=rules), dice=dice, rules=rules)
+            game.numplayers = num_players
+            game.numcom = num_com
+            game.create_players()
+        game.assign_strategies(strategies)
+        return game
+
+    def release(self, game):
+        """
+        Returns a finished game to the pool.
+        """
+        self._idle.setdefault((game.numplayers, game.numcom, game.rules), []).append(game)
+
+
+_POOL = GamePool()
+
+
+def simulate_game(num_players, num_com=None, seed=None, strategies=None, max_turns=10000,
+                  dice=None, event_log=None, metrics=None, rules=None):
+    """
+    Plays a complete game with no terminal I/O and returns its result.
+
+    Parameters:
+    -----------
+    num_players: int
+        The total number of players.
+    num_com: int
+        The number of COM players (default: all of them). Human seats come first,
+        as in Game.create_players, and need a strategy since nobody can be asked.
+    seed: int
+        Seeds the game's own DiceStream, so the same seed always plays the same
+        game. The global `random` module is left untouched.
+    strategies: sequence or dict
+        Reroll strategies by player number (a dict) or in player order (a sequence).
+        A strategy is called as strategy(player, board, game) and returns True to
+        reroll. Seats without one use the player's default COM choice.
+    max_turns: int
+        Stops a game that has not been won after this many turns (default: 10000).
+    dice: DiceStream
+        Plays the game from this stream instead of one seeded with `seed`, e.g. a
+        child stream handed to a worker.
+    event_log: EventLogWriter
+        Records every event of the game when given.
+    metrics: GameMetrics
+        Collects the game's counters and timings when given.
+    rules: Rules
+        The rules to play by: a Rules object, a registered name such as "legacy",
+        or a dictionary of Rules parameters (default: the standard rules).
+
+    Returns:
+    --------
+    GameResult: The outcome of the game.
+
+    Raises:
+    -------
+    ValueError: If the player counts or rules are invalid or a human seat has no
+    strategy.
+    """
+    if num_com is None:
+        num_com = num_players
+    if num_players < 1 or not 0 <= num_com <= num_players:
+        raise ValueError(
+            f"Invalid game size: {num_players} players with {num_com} COM players."
+        )
+
+    rules = get_rules(rules)
+    if dice is None:
+        dice = DiceStream(seed, faces=rules.die_faces)
+    game = _POOL.acquire(num_players, num_com, dice, strategies, rules)
+    game.event_log = event_log
+    game.metrics = metrics
+    try:
+        for number, player in game.players.items():
+            if player.is_human and player.strategy is None:
+                raise ValueError(
+                    f"Player {number} is human and needs a strategy to play headless."
+                )
+
+        first_player = game.start(announce=False)
+        play_turn = game.play_turn
+        while not game.game_winner and game.turns < max_turns:
+            play_turn()
+
+        return GameResult(
+            seed,
+            game.game_winner or None,
+            first_player,
+            game.turns,
+            game.crashes,
+            tuple(player.hand for player in game.players.values()),
+        )
+    finally:
+        _POOL.release(game)
+
@@ -0,0 +1,118 @@
+# sinks.py
+# This file contains the output sinks that the game writes its messages to.
+# A sink replaces direct print() calls, so a run can print as usual, print
+# through a large buffer, or produce no output at all.
+
+# Dependencies:
+#   - sys
+
+# Usage Example:
+# game = Game(sink=NullSink()) # a silent game
+# with BufferedSink() as sink: # output in large writes
+#     game = Game(sink=sink)
+#     ...
+
+
+# Sink protocol:
+# - emit(message, *args) writes one line. The message is a str.format template
+#   and is only formatted when there are args and the sink keeps the output.
+# - enabled is False for sinks that drop everything, so callers can skip
+#   building expensive messages altogether.
+# - flush() writes anything held back. Call it before waiting for input so
+#   prompts appear after the messages that lead up to them.
+
+import sys
+
+
+class ConsoleSink:
+    """
+    The ConsoleSink class prints every message straight away, as the game
+    always has. It looks up sys.stdout on every message, so redirecting
+    sys.stdout redirects the game's output too.
+    """
+    enabled = True
+
+    def emit(self, message, *args):
+        """
+        Prints one message.
+        """
+        print(message.format(*args) if args else message)
+
+    def flush(self):
+        """
+        Does nothing, since nothing is held back.
+        """
+
+
+class NullSink:
+    """
+    The NullSink class drops every message without formatting it.
+    """
+    enabled = False
+
+    def emit(self, message, *args):
+        """
+        Drops one message.
+        """
+
+    def flush(self):
+        """
+        Does nothing, since nothing is held back.
+        """
+
+
+class BufferedSink:
+    """
+    The BufferedSink class collects messages and writes them in large blocks.
+
+    Attributes:
+    -----------
+    stream: file
+        Where the output goes (default: sys.stdout at the time of each write).
+    buffer_size: int
+        The number of characters to collect before writing (default: 65536).
+    """
+    enabled = True
+
+    def __init__(self, stream=None, buffer_size=65536):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._lines = []
+        self._size = 0
+
+    def emit(self, message, *args):
+        """
+        Adds one message to the buffer, writing the buffer out once it is full.
+        """
+        line = message.format(*args) if args else message
+        self._lines.append(line)
+        self._size += len(line) + 1
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes out every buffered message.
+        """
+        if self._lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            self._lines.append("")
+            stream.write("\n".join(self._lines))
+            self._lines.clear()
+            self._size = 0
+            stream.flush()
+
+    def close(self):
+        """
+        Writes out every buffered message.
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+DEFAULT_SINK = ConsoleSink()
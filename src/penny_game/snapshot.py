@@ -0,0 +1,169 @@
+# snapshot.py
+# This file contains snapshot and restore for games in progress. A snapshot is
+# a few dozen bytes that hold everything a game needs to carry on exactly where
+# it stopped, including the position of every dice stream, so a table can be
+# checkpointed every turn and picked up again by another process.
+
+# Dependencies:
+#   - Game class
+#   - DiceStream class
+#   - rules (DEFAULT_RULES)
+
+# Usage Example:
+# data = snapshot(game)
+# ... restart ...
+# game = restore(data, strategies=[None, ThresholdStrategy(2)])
+
+
+# Format (version 1): a version byte, then unsigned LEB128 varints for
+# - the root seed (zigzag encoded, so negative seeds work) and the dice path
+#   (a count, then each index, zigzag encoded),
+# - numplayers, numcom, current_player, game_winner (0 for none), turns,
+#   crashes, a flags value (bit 0: waiting for a reroll decision) and the
+#   board occupancy bitmask,
+# - the root stream's position (four values from DiceStream.tell()),
+# - then for each player in order: hand and dice position (four values).
+# Strategies, sinks, event logs, metrics and the rules are not game state and
+# are passed to restore() again.
+
+from .dice import DiceStream
+from .game import Game
+from .rules import DEFAULT_RULES
+
+VERSION = 1
+DECIDING = 1
+
+
+def _put(out, value):
+    """
+    Appends one unsigned varint.
+    """
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def snapshot(game):
+    """
+    Encodes a game between turns, or mid-turn while it waits for a decision.
+
+    Parameters:
+    -----------
+    game: Game
+        A game whose dice stream has an integer seed, with players made by
+        create_players (player n rolls from the game's child stream n).
+
+    Returns:
+    --------
+    bytes: The encoded game.
+
+    Raises:
+    -------
+    ValueError: If the seed is not an integer or the board is in a crash.
+    """
+    dice = game.dice
+    if not isinstance(dice.seed, int):
+        raise ValueError("Only games with an integer seed can be snapshotted.")
+    if game.board.crash:
+        raise ValueError("A game cannot be snapshotted in the middle of a crash.")
+    out = bytearray((VERSION,))
+    _put(out, _zigzag(dice.seed))
+    _put(out, len(dice.path))
+    for index in dice.path:
+        _put(out, _zigzag(index))
+    for value in (game.numplayers, game.numcom, game.current_player, game.game_winner or 0,
+                  game.turns, game.crashes, DECIDING if game.deciding else 0,
+                  game.board.occupancy):
+        _put(out, value)
+    for value in dice.tell():
+        _put(out, value)
+    for player in game.players.values():
+        _put(out, player.hand)
+        for value in player.dice.tell():
+            _put(out, value)
+    return bytes(out)
+
+
+def restore(data, strategies=None, board=None, sink=None, rules=None):
+    """
+    Rebuilds a game from a snapshot.
+
+    Parameters:
+    -----------
+    data: bytes
+        The output of snapshot().
+    strategies: sequence or dict
+        Reroll strategies, as for Game.create_players.
+    board: GameBoard
+        An empty board to play on (default: a new GameBoard).
+    sink: ConsoleSink
+        Where the game's messages go (default: the console).
+    rules: Rules
+        The rules the game was played by (default: the board's rules, or the
+        standard rules).
+
+    Returns:
+    --------
+    Game: The game as it was, ready for play_turn, or for continue_turn if it
+    was waiting for a decision.
+
+    Raises:
+    -------
+    ValueError: If the data is not a snapshot this version can read.
+    """
+    if not data or data[0] != VERSION:
+        raise ValueError(f"Unsupported snapshot version: {data[0] if data else None}.")
+    values = []
+    value = shift = 0
+    for byte in memoryview(data)[1:]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    # The seed and path depth, the path, then 8 game fields and 4 dice position fields
+    if shift or len(values) < 2 or len(values) < 2 + values[1] + 12:
+        raise ValueError("The snapshot is truncated.")
+
+    seed = _unzigzag(values[0])
+    depth = values[1]
+    path = tuple(_unzigzag(index) for index in values[2:2 + depth])
+    position = 2 + depth
+    (numplayers, numcom, current_player, winner, turns, crashes, flags,
+     occupancy) = values[position:position + 8]
+    root_position = tuple(values[position + 8:position + 12])
+    seats = values[position + 12:]
+    if len(seats) != numplayers * 5:
+        raise ValueError("The snapshot does not match its number of players.")
+
+    if rules is None:
+        rules = board.rules if board is not None else DEFAULT_RULES
+    game = Game(board=board, dice=DiceStream(seed, faces=rules.die_faces, path=path), sink=sink,
+                rules=rules)
+    game.numplayers = numplayers
+    game.numcom = numcom
+    game.create_players(strategies=strategies)
+    game.dice.seek(root_position)
+    for index, player in enumerate(game.players.values()):
+        seat = seats[index * 5:index * 5 + 5]
+        player.hand = seat[0]
+        player.dice.seek(tuple(seat[1:]))
+    game.current_player = current_player
+    game.game_winner = winner or False
+    if winner:
+        game.players[winner].is_winner = True
+    game.turns = turns
+    game.crashes = crashes
+    game.deciding = bool(flags & DECIDING)
+    game.board.state = {slot: occupancy >> (slot - 1) & 1 for slot in range(1, rules.slots + 1)}
+    return game
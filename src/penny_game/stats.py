@@ -0,0 +1,476 @@
+# stats.py
+# This file contains streaming statistics for simulation output. A GameStats
+# takes per-game results one at a time (or a whole batch at once) and keeps
+# running totals, fixed-bucket histograms and quantile sketches, so its memory
+# stays the same whether it has seen a thousand games or a billion. Partial
+# results from worker processes are combined with merge().
+
+# Dependencies:
+#   - math, statistics
+#   - metrics (Histogram)
+#   - numpy, only for GameStats.add_batch
+
+# Usage Example:
+# stats = GameStats(3)
+# for seed in range(100000):
+#     stats.add(simulate_game(3, seed=seed))
+# print(stats.win_interval(1), stats.turns.mean, stats.turn_quantiles.quantile(0.99))
+
+
+# How it works:
+# - RunningMoments keeps the count, mean and sum of squared deviations with
+#   Welford's update, which stays accurate over long runs, and merges two
+#   partial results exactly with Chan's formula.
+# - QuantileSketch counts values into buckets whose width grows with the value
+#   (as in DDSketch), so every quantile it reports is within `accuracy` of the
+#   true value, relatively. Game lengths and hands span a small range, so the
+#   sketch only ever holds a few dozen buckets.
+# - Win counts are plain integers, and their confidence intervals are Wilson
+#   score intervals, which behave well for rare or near-certain wins.
+# - confidence_sequence gives intervals that hold at every sample size at
+#   once, for runs that stop as soon as they have an answer.
+
+import math
+from statistics import NormalDist
+
+from .metrics import Histogram
+
+TURN_BOUNDS = (10, 20, 30, 40, 50, 75, 100, 150, 200, 300, 500, 1000)
+HAND_BOUNDS = (0, 1, 2, 3, 5, 10, 15, 20, 30, 40)
+
+
+class RunningMoments:
+    """
+    The RunningMoments class keeps the mean, variance and range of a stream.
+
+    Attributes:
+    -----------
+    count: int
+        The number of values seen.
+    mean: float
+        The mean of the values.
+    minimum, maximum: float
+        The smallest and largest values (None before the first).
+    """
+
+    __slots__ = ("count", "mean", "_squares", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._squares = 0.0 # Sum of squared deviations from the mean
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        """
+        Adds one value.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squares += delta * (value - self.mean)
+        if self.count == 1:
+            self.minimum = self.maximum = value
+        elif value < self.minimum:
+            self.minimum = value
+        elif value > self.maximum:
+            self.maximum = value
+
+    def add_moments(self, count, mean, squares, minimum, maximum):
+        """
+        Adds a group of values given its count, mean, sum of squared
+        deviations, minimum and maximum.
+        """
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self._squares += squares + delta * delta * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.minimum = minimum if self.minimum is None else min(self.minimum, minimum)
+        self.maximum = maximum if self.maximum is None else max(self.maximum, maximum)
+
+    def merge(self, other):
+        """
+        Adds another RunningMoments into this one.
+        """
+        self.add_moments(other.count, other.mean, other._squares, other.minimum, other.maximum)
+
+    @property
+    def variance(self):
+        """
+        The sample variance (0.0 with fewer than two values).
+        """
+        return self._squares / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        """
+        The sample standard deviation.
+        """
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self):
+        """
+        The standard error of the mean.
+        """
+        return math.sqrt(self.variance / self.count) if self.count else 0.0
+
+    def to_dict(self):
+        """
+        Returns the moments as a dictionary of JSON-ready values.
+        """
+        return {"count": self.count, "mean": self.mean, "stdev": self.stdev,
+                "min": self.minimum, "max": self.maximum}
+
+    def __repr__(self):
+        return f"RunningMoments(count={self.count}, mean={self.mean:.4f}, stdev={self.stdev:.4f})"
+
+
+class QuantileSketch:
+    """
+    The QuantileSketch class estimates quantiles of non-negative values within
+    a fixed relative error, in a bounded amount of memory.
+
+    Attributes:
+    -----------
+    accuracy: float
+        The relative error of every reported quantile (default: 0.01).
+    max_buckets: int
+        The most buckets kept. Past this, the lowest buckets are folded
+        together, which only affects the accuracy of the lowest quantiles.
+    count: int
+        The number of values seen.
+    """
+
+    __slots__ = ("accuracy", "max_buckets", "count", "zeros", "buckets", "_gamma", "_log_gamma")
+
+    def __init__(self, accuracy=0.01, max_buckets=2048):
+        if not 0 < accuracy < 1:
+            raise ValueError("The accuracy must be between 0 and 1.")
+        self.accuracy = accuracy
+        self.max_buckets = max_buckets
+        self.count = 0
+        self.zeros = 0
+        self.buckets = {} # Bucket index -> count; bucket i holds (gamma^(i-1), gamma^i]
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def add(self, value, count=1):
+        """
+        Adds a value, `count` times.
+
+        Raises:
+        -------
+        ValueError: If the value is negative.
+        """
+        if value <= 0:
+            if value < 0:
+                raise ValueError("A QuantileSketch only holds non-negative values.")
+            self.zeros += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            buckets = self.buckets
+            buckets[index] = buckets.get(index, 0) + count
+            if len(buckets) > self.max_buckets:
+                self._collapse()
+        self.count += count
+
+    def _collapse(self):
+        """
+        Folds the lowest buckets into one until the sketch fits again.
+        """
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        folded = sum(self.buckets.pop(key) for key in keys[:excess])
+        self.buckets[keys[excess]] += folded
+
+    def merge(self, other):
+        """
+        Adds another sketch with the same accuracy into this one.
+        """
+        if other.accuracy != self.accuracy:
+            raise ValueError("Only sketches with the same accuracy can be merged.")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, fraction):
+        """
+        Returns an estimate of the given quantile (0 to 1), or None if empty.
+        """
+        if not self.count:
+            return None
+        rank = fraction * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def to_dict(self):
+        """
+        Returns the sketch as a dictionary of JSON-ready values.
+        """
+        return {"accuracy": self.accuracy, "count": self.count, "zeros": self.zeros,
+                "buckets": {str(index): count for index, count in sorted(self.buckets.items())}}
+
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """
+    Returns the Wilson score interval (low, high) for a proportion.
+
+    Parameters:
+    -----------
+    successes: int
+        The number of successes.
+    trials: int
+        The number of trials.
+    confidence: float
+        The coverage of the interval (default: 0.95).
+
+    Returns:
+    --------
+    tuple: The lower and upper bounds, or (0.0, 1.0) with no trials.
+    """
+    if not trials:
+        return (0.0, 1.0)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = successes / trials
+    z2 = z * z / trials
+    centre = (rate + z2 / 2) / (1 + z2)
+    spread = z * math.sqrt(rate * (1 - rate) / trials + z2 / (4 * trials)) / (1 + z2)
+    return (max(0.0, centre - spread), min(1.0, centre + spread))
+
+
+def confidence_sequence(successes, trials, alpha=0.05, rho=1000):
+    """
+    Returns an always-valid confidence interval (low, high) for a proportion.
+
+    With probability at least 1 - alpha the interval covers the true rate at
+    every number of trials at once, so it can be checked as often as wanted
+    and a run stopped as soon as it answers a question.
+
+    Parameters:
+    -----------
+    successes: int
+        The number of successes.
+    trials: int
+        The number of trials.
+    alpha: float
+        The chance of ever excluding the true rate (default: 0.05).
+    rho: float
+        The number of trials the interval is tuned for; it is narrowest
+        relative to a fixed-size interval around there (default: 1000).
+
+    Returns:
+    --------
+    tuple: The lower and upper bounds, or (0.0, 1.0) with no trials.
+    """
+    if not trials:
+        return (0.0, 1.0)
+    # Normal-mixture boundary for sums of 1/4-sub-Gaussian steps (Robbins)
+    spread = (trials + rho) / 4
+    radius = math.sqrt(spread * math.log((trials + rho) / (rho * alpha * alpha))) / trials
+    rate = successes / trials
+    return (max(0.0, rate - radius), min(1.0, rate + radius))
+
+
+class GameStats:
+    """
+    The GameStats class aggregates game results in constant memory.
+
+    Attributes:
+    -----------
+    num_players: int
+        The number of seats in every game.
+    games: int
+        Games added.
+    unfinished: int
+        Games that ended without a winner.
+    wins: list
+        Games won by each seat (index 0 is player 1).
+    wins_by_position: list
+        Games won by the player who went first, second, and so on.
+    turns, crashes: RunningMoments
+        Game length in turns and crashes per game.
+    hands: RunningMoments
+        Pennies left in the losers' hands when a game ends.
+    turn_histogram, hand_histogram: Histogram
+        Game lengths and losers' hands in fixed buckets.
+    turn_quantiles, hand_quantiles: QuantileSketch
+        Game lengths and losers' hands, for quantiles.
+
+    Methods:
+    --------
+    add(result):
+        Adds one GameResult.
+    add_batch(batch):
+        Adds every game of a vector_sim BatchResult.
+    merge(other):
+        Adds another GameStats into this one.
+    win_rate(seat) / win_interval(seat, confidence):
+        A seat's win rate and its Wilson confidence interval.
+    """
+
+    def __init__(self, num_players, accuracy=0.01):
+        self.num_players = num_players
+        self.games = 0
+        self.unfinished = 0
+        self.wins = [0] * num_players
+        self.wins_by_position = [0] * num_players
+        self.turns = RunningMoments()
+        self.crashes = RunningMoments()
+        self.hands = RunningMoments()
+        self.turn_histogram = Histogram(TURN_BOUNDS)
+        self.hand_histogram = Histogram(HAND_BOUNDS)
+        self.turn_quantiles = QuantileSketch(accuracy)
+        self.hand_quantiles = QuantileSketch(accuracy)
+
+    def add(self, result):
+        """
+        Adds one game result: anything with winner, first_player, turns,
+        crashes and hands attributes, like simulation.GameResult.
+        """
+        self.games += 1
+        winner = result.winner
+        if winner:
+            self.wins[winner - 1] += 1
+            self.wins_by_position[(winner - result.first_player) % self.num_players] += 1
+        else:
+            self.unfinished += 1
+        turns = result.turns
+        self.turns.add(turns)
+        self.turn_histogram.observe(turns)
+        self.turn_quantiles.add(turns)
+        self.crashes.add(result.crashes)
+        for seat, hand in enumerate(result.hands, 1):
+            if seat != winner:
+                self.hands.add(hand)
+                self.hand_histogram.observe(hand)
+                self.hand_quantiles.add(hand)
+
+    def add_all(self, results):
+        """
+        Adds every result from an iterable, consuming it one result at a time.
+        """
+        for result in results:
+            self.add(result)
+        return self
+
+    def add_batch(self, batch):
+        """
+        Adds every game of a vector_sim BatchResult with array operations.
+        """
+        import numpy as np
+
+        count = len(batch)
+        if not count:
+            return
+        winner = np.asarray(batch.winner, dtype=np.int64)
+        finished = winner > 0
+        self.games += count
+        self.unfinished += count - int(finished.sum())
+        n = self.num_players
+        for seat, wins in enumerate(np.bincount(winner[finished] - 1, minlength=n)):
+            self.wins[seat] += int(wins)
+        positions = (winner[finished] - np.asarray(batch.first_player)[finished]) % n
+        for position, wins in enumerate(np.bincount(positions, minlength=n)):
+            self.wins_by_position[position] += int(wins)
+
+        hands = np.asarray(batch.hands)
+        losing = np.ones(hands.shape, dtype=bool)
+        losing[np.flatnonzero(finished), winner[finished] - 1] = False
+        for values, moments, histogram, sketch in (
+                (np.asarray(batch.turns), self.turns, self.turn_histogram, self.turn_quantiles),
+                (np.asarray(batch.crashes), self.crashes, None, None),
+                (hands[losing], self.hands, self.hand_histogram, self.hand_quantiles)):
+            if not len(values):
+                continue
+            values = values.astype(np.float64)
+            mean = float(values.mean())
+            moments.add_moments(len(values), mean, float(((values - mean) ** 2).sum()),
+                                values.min().item(), values.max().item())
+            if histogram is not None:
+                buckets = np.searchsorted(histogram.bounds, values, side="left")
+                for index, bucket_count in enumerate(
+                        np.bincount(buckets, minlength=len(histogram.counts))):
+                    histogram.counts[index] += int(bucket_count)
+                histogram.total += values.sum().item()
+                histogram.count += len(values)
+                distinct, counts = np.unique(values, return_counts=True)
+                for value, value_count in zip(distinct.tolist(), counts.tolist()):
+                    sketch.add(value, value_count)
+
+    def merge(self, other):
+        """
+        Adds another GameStats for the same number of players into this one.
+        """
+        if other.num_players != self.num_players:
+            raise ValueError("Only stats for the same number of players can be merged.")
+        self.games += other.games
+        self.unfinished += other.unfinished
+        for seat in range(self.num_players):
+            self.wins[seat] += other.wins[seat]
+            self.wins_by_position[seat] += other.wins_by_position[seat]
+        for name in ("turns", "crashes", "hands", "turn_histogram", "hand_histogram",
+                     "turn_quantiles", "hand_quantiles"):
+            getattr(self, name).merge(getattr(other, name))
+        return self
+
+    def win_rate(self, seat):
+        """
+        Returns the fraction of games won by a seat (player number, 1-based).
+        """
+        return self.wins[seat - 1] / self.games if self.games else 0.0
+
+    def win_interval(self, seat, confidence=0.95):
+        """
+        Returns the Wilson confidence interval for a seat's win rate.
+        """
+        return wilson_interval(self.wins[seat - 1], self.games, confidence)
+
+    def position_interval(self, position, confidence=0.95):
+        """
+        Returns the Wilson confidence interval for the win rate of the player
+        at a turn position (0 for whoever went first).
+        """
+        return wilson_interval(self.wins_by_position[position], self.games, confidence)
+
+    def to_dict(self, confidence=0.95):
+        """
+        Returns a summary as a dictionary of JSON-ready values.
+        """
+        quantiles = (0.5, 0.9, 0.99)
+        return {
+            "players": self.num_players,
+            "games": self.games,
+            "unfinished": self.unfinished,
+            "wins": list(self.wins),
+            "win_intervals": [list(self.win_interval(seat, confidence))
+                              for seat in range(1, self.num_players + 1)],
+            "wins_by_position": list(self.wins_by_position),
+            "turns": self.turns.to_dict(),
+            "turn_quantiles": {str(q): self.turn_quantiles.quantile(q) for q in quantiles},
+            "turn_histogram": self.turn_histogram.to_dict(),
+            "crashes": self.crashes.to_dict(),
+            "hands": self.hands.to_dict(),
+            "hand_quantiles": {str(q): self.hand_quantiles.quantile(q) for q in quantiles},
+            "hand_histogram": self.hand_histogram.to_dict(),
+        }
+
+    def __repr__(self):
+        rates = ", ".join(f"{self.win_rate(seat):.3f}" for seat in range(1, self.num_players + 1))
+        return (
+            f"GameStats({self.games} games: win rates [{rates}], "
+            f"{self.turns.mean:.1f} turns, {self.crashes.mean:.1f} crashes)"
+        )
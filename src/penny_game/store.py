@@ -0,0 +1,507 @@
+# store.py
+# This file contains the ResultStore class, an append-only columnar store of
+# finished games on disk. Each column is a file of fixed-width numbers read
+# through mmap, so questions like "every game seat 3 won in under 50 turns" or
+# "the game for seed X" are answered without loading the store into memory.
+
+# Dependencies:
+#   - json, mmap, os, tempfile
+#   - numpy
+
+# Usage Example:
+# store = ResultStore("games.store", num_players=3)
+# run_batch(1000000, players=3, strategies="threshold", seed=7, output=store)
+# store.build_index()
+# rows = store.where(winner=3, turns=(None, 50))
+# print(len(rows), store.row(rows[0]), store.where(seed=7, game=12))
+
+
+# How it works:
+# - A store is a directory with meta.json (the seat count and the table of
+#   configurations) and one file per column: seed, game, config, winner,
+#   first_player, turns, crashes and hands (one number per seat and game).
+# - Rows are only ever appended, a column at a time. The row count is the
+#   shortest column, so a write cut short leaves a consistent store; the next
+#   append trims the longer columns back before writing.
+# - A game is named by its root seed and game number: game n was played from
+#   DiceStream(seed).child(n), as in batches and sweeps. Game -1 is a game played
+#   from DiceStream(seed) itself, and seed -1 a game with no recorded seed.
+# - The config column holds the index of the game's settings (players, rules,
+#   strategies) in meta.json, so every game carries its rule/strategy ID in
+#   four bytes.
+# - Filters scan the columns they need in chunks of CHUNK_ROWS rows, so memory
+#   stays bounded whatever the size of the store and the OS page cache does the
+#   reading.
+# - build_index sorts the row numbers by (seed, game) into three more column
+#   files. A seed lookup binary-searches the seeds, and a game number or range
+#   within it binary-searches that seed's games, so "the game for seed X" reads
+#   a few pages however many games share the seed. Rows appended since are
+#   found by a scan.
+# - The sort uses one int64 key per row: the seed's rank among the distinct
+#   seeds times the span of game numbers, plus the game. Distinct seeds are
+#   found a chunk at a time, so only the key and its order are ever held in
+#   memory. A store whose keys would not fit in 64 bits is sorted with lexsort.
+
+import json
+import mmap
+import os
+import tempfile
+
+import numpy as np
+
+STORE_VERSION = 1
+CHUNK_ROWS = 1 << 22
+NO_SEED = -1
+ROOT_GAME = -1
+
+# Column name -> little-endian type, so a store can be read on any machine
+COLUMNS = {
+    "seed": "<i8",
+    "game": "<i8",
+    "config": "<i4",
+    "winner": "i1",
+    "first_player": "i1",
+    "turns": "<i4",
+    "crashes": "<i4",
+    "hands": "<i4",
+}
+INDEX_COLUMNS = {"index_seeds": "<i8", "index_games": "<i8", "index_rows": "<i8"}
+
+
+class ResultStore:
+    """
+    The ResultStore class appends finished games to a directory of column files
+    and answers filter and seed queries over them.
+
+    Parameters:
+    -----------
+    path: str
+        The store's directory. It is created if it does not exist.
+    num_players: int
+        Seats per game. Required for a new store; must match an existing one.
+
+    Raises:
+    -------
+    ValueError: If a new store has no seat count, or an existing store has a
+    different one or was written by another STORE_VERSION.
+    """
+
+    def __init__(self, path, num_players=None):
+        self.path = path
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as meta_file:
+                self.meta = json.load(meta_file)
+            if self.meta["version"] != STORE_VERSION:
+                raise ValueError(f"{path} is a version {self.meta['version']} store; "
+                                 f"this is version {STORE_VERSION}.")
+            if num_players is not None and num_players != self.meta["num_players"]:
+                raise ValueError(f"{path} holds {self.meta['num_players']}-player games, "
+                                 f"not {num_players}-player games.")
+        else:
+            if num_players is None or num_players < 1:
+                raise ValueError("A new result store needs the number of players.")
+            os.makedirs(path, exist_ok=True)
+            self.meta = {"version": STORE_VERSION, "num_players": num_players,
+                         "configs": [], "indexed": 0}
+            self._save_meta()
+        self.num_players = self.meta["num_players"]
+        self._maps = {} # column name -> (file size, mmap, array)
+
+    def __len__(self):
+        return min(self._size(name) // self._width(name) for name in COLUMNS)
+
+    def __repr__(self):
+        return f"ResultStore({self.path!r}, {len(self):,} {self.num_players}-player games)"
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _width(self, name):
+        width = np.dtype(COLUMNS.get(name) or INDEX_COLUMNS[name]).itemsize
+        return width * self.num_players if name == "hands" else width
+
+    def _size(self, name):
+        try:
+            return os.path.getsize(self._file(name))
+        except FileNotFoundError:
+            return 0
+
+    def _save_meta(self):
+        """
+        Writes meta.json in one step.
+        """
+        handle, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(handle, "w") as meta_file:
+            json.dump(self.meta, meta_file, sort_keys=True)
+        os.replace(temp_path, os.path.join(self.path, "meta.json"))
+
+    def config_id(self, config, add=True):
+        """
+        Returns the ID of a configuration: its index in the store's table.
+
+        Parameters:
+        -----------
+        config: dict
+            JSON-friendly settings, such as a sweep cell (None for unknown).
+        add: bool
+            Adds a configuration the store has not seen; otherwise returns None.
+        """
+        configs = self.meta["configs"]
+        config = json.loads(json.dumps(config)) # Compare in the form stored
+        if config in configs:
+            return configs.index(config)
+        if not add:
+            return None
+        configs.append(config)
+        self._save_meta()
+        return len(configs) - 1
+
+    def config(self, config_id):
+        """
+        Returns the configuration with this ID.
+        """
+        return self.meta["configs"][config_id]
+
+    def append(self, seed, game, winner, first_player, turns, crashes, hands, config=None):
+        """
+        Appends games given as arrays with one entry per game (hands: one row
+        per game and a column per seat). seed and game may be single numbers.
+
+        Parameters:
+        -----------
+        config: dict or int
+            The settings the games were played with, or their ID.
+
+        Returns:
+        --------
+        range: The row numbers of the new games.
+        """
+        hands = np.asarray(hands).reshape(-1, self.num_players)
+        count = len(hands)
+        config = config if isinstance(config, int) else self.config_id(config)
+        values = {"seed": seed, "game": game, "config": config, "winner": winner,
+                  "first_player": first_player, "turns": turns, "crashes": crashes,
+                  "hands": hands}
+        start = len(self)
+        for name, dtype in COLUMNS.items():
+            column = np.asarray(values[name])
+            if name != "hands":
+                column = np.broadcast_to(column, (count,))
+            with open(self._file(name), "ab") as column_file:
+                if column_file.tell() != start * self._width(name):
+                    column_file.truncate(start * self._width(name)) # Trim a cut-short write
+                column_file.write(memoryview(np.ascontiguousarray(column, dtype=dtype)))
+        return range(start, start + count)
+
+    def append_rows(self, rows, seed, first_game=0, config=None):
+        """
+        Appends a shard of batch.play_rows output: consecutive games of one seed.
+        """
+        width = 4 + self.num_players
+        table = np.frombuffer(rows, dtype=f"i{rows.itemsize}").reshape(-1, width)
+        return self.append(NO_SEED if seed is None else seed,
+                           np.arange(first_game, first_game + len(table)), table[:, 0],
+                           table[:, 1], table[:, 2], table[:, 3], table[:, 4:], config)
+
+    def append_batch(self, batch, seed, first_game=0, config=None):
+        """
+        Appends a vector_sim BatchResult. Its games have no per-game stream, so
+        they are numbered from first_game under the batch's seed.
+        """
+        return self.append(NO_SEED if seed is None else seed,
+                           np.arange(first_game, first_game + len(batch)), batch.winner,
+                           batch.first_player, batch.turns, batch.crashes, batch.hands, config)
+
+    def append_results(self, results, seed=None, first_game=0, config=None):
+        """
+        Appends GameResults, e.g. from simulation.simulate_game.
+
+        Parameters:
+        -----------
+        seed: int
+            The root seed when the games were played from its children,
+            numbered from first_game. Otherwise each game is stored under its
+            own seed as a root game.
+        """
+        results = list(results)
+        if seed is not None:
+            seeds, games = seed, np.arange(first_game, first_game + len(results))
+        else:
+            seeds = [NO_SEED if result.seed is None else result.seed for result in results]
+            games = ROOT_GAME
+        return self.append(seeds, games, [result.winner or 0 for result in results],
+                           [result.first_player for result in results],
+                           [result.turns for result in results],
+                           [result.crashes for result in results],
+                           [result.hands for result in results], config)
+
+    def writer(self, config, seed):
+        """
+        Returns an object with the write_shard(first_game, rows) method of the
+        batch writers, appending to this store.
+        """
+        config_id = self.config_id(config)
+        return _StoreWriter(self, config_id, seed)
+
+    def column(self, name):
+        """
+        Returns a column as a read-only array over the mapped file (hands:
+        shaped (games, players)). Nothing is read until it is used.
+        """
+        size = self._size(name)
+        cached = self._maps.get(name)
+        if cached is None or cached[0] != size:
+            if size == 0:
+                array = np.empty(0, dtype=COLUMNS.get(name) or INDEX_COLUMNS[name])
+                mapped = None
+            else:
+                with open(self._file(name), "rb") as column_file:
+                    mapped = mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+                array = np.frombuffer(mapped, dtype=COLUMNS.get(name) or INDEX_COLUMNS[name])
+            if name == "hands":
+                array = array.reshape(-1, self.num_players)
+            cached = self._maps[name] = (size, mapped, array)
+        return cached[2]
+
+    def close(self):
+        """
+        Releases the mapped columns. Arrays returned by column() stop working.
+        """
+        for _, mapped, _ in self._maps.values():
+            if mapped is not None:
+                try:
+                    mapped.close()
+                except BufferError: # Still in use by an array; freed with it
+                    pass
+        self._maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def row(self, index):
+        """
+        Returns one game as a dictionary, like a row of the JSONL batch output
+        with its configuration ID added.
+        """
+        names = ("seed", "game", "config", "winner", "first_player", "turns", "crashes")
+        row = {name: self.column(name)[index].item() for name in names}
+        row["winner"] = row["winner"] or None
+        row["seed"] = None if row["seed"] == NO_SEED else row["seed"]
+        row["hands"] = self.column("hands")[index].tolist()
+        return row
+
+    def rows(self, indexes):
+        """
+        Yields the games at these row numbers as dictionaries.
+        """
+        for index in indexes:
+            yield self.row(int(index))
+
+    def _select(self, conditions, rows):
+        """
+        Returns a mask of the rows (a slice or an array of row numbers) that
+        meet every condition.
+        """
+        mask = None
+        for name, value in conditions:
+            if name.startswith("hand_"):
+                column = self.column("hands")[rows, int(name[5:]) - 1]
+            else:
+                column = self.column(name)[rows]
+            if isinstance(value, tuple):
+                low, high = value
+                matches = np.ones(len(column), dtype=bool)
+                if low is not None:
+                    matches &= column >= low
+                if high is not None:
+                    matches &= column < high
+            else:
+                matches = column == value
+            mask = matches if mask is None else mask & matches
+        return mask
+
+    def _conditions(self, filters):
+        """
+        Checks filters and turns them into (column, value) pairs. Returns None
+        if no row can match.
+        """
+        conditions = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name.startswith("hand_"):
+                seat = name[5:]
+                if not seat.isdigit() or not 1 <= int(seat) <= self.num_players:
+                    raise ValueError(f"No seat {seat!r} in {self.num_players}-player games.")
+            elif name not in COLUMNS or name == "hands":
+                raise ValueError(f"Unknown column {name!r}.")
+            if name == "config" and not isinstance(value, (int, tuple)):
+                value = self.config_id(value, add=False)
+                if value is None:
+                    return None
+            if isinstance(value, tuple) and len(value) != 2:
+                raise ValueError(f"A range for {name} needs (low, high), got {value!r}.")
+            conditions.append((name, value))
+        return conditions
+
+    def where(self, limit=None, **filters):
+        """
+        Returns the row numbers of the games that meet every filter, in order.
+
+        Parameters:
+        -----------
+        filters:
+            Column name (seed, game, config, winner, first_player, turns,
+            crashes or hand_1, hand_2, ...) = a value to match, or a (low, high)
+            range with high excluded and None for an open end. config also
+            takes a configuration dictionary.
+        limit: int
+            Stops after this many matches.
+
+        Returns:
+        --------
+        numpy.ndarray: The matching row numbers.
+
+        Raises:
+        -------
+        ValueError: If a filter names an unknown column or seat.
+        """
+        conditions = self._conditions(filters)
+        if conditions is None:
+            return np.empty(0, dtype=np.int64)
+        if isinstance(filters.get("seed"), (int, np.integer)) and self._indexed():
+            return self._find(filters["seed"], filters.get("game"), conditions, limit)
+        return self._scan(conditions, 0, len(self), limit)
+
+    def count(self, **filters):
+        """
+        Returns the number of games that meet every filter (see where).
+        """
+        conditions = self._conditions(filters)
+        if conditions is None:
+            return 0
+        if isinstance(filters.get("seed"), (int, np.integer)) and self._indexed():
+            return len(self._find(filters["seed"], filters.get("game"), conditions, None))
+        total = 0
+        for start in range(0, len(self), CHUNK_ROWS):
+            mask = self._select(conditions, slice(start, min(start + CHUNK_ROWS, len(self))))
+            total += min(CHUNK_ROWS, len(self) - start) if mask is None else int(mask.sum())
+        return total
+
+    def _scan(self, conditions, start, stop, limit):
+        """
+        Filters rows start to stop - 1 a chunk at a time.
+        """
+        found = []
+        total = 0
+        for chunk in range(start, stop, CHUNK_ROWS):
+            end = min(chunk + CHUNK_ROWS, stop)
+            mask = self._select(conditions, slice(chunk, end))
+            rows = np.arange(chunk, end) if mask is None else np.flatnonzero(mask) + chunk
+            found.append(rows)
+            total += len(rows)
+            if limit is not None and total >= limit:
+                break
+        rows = np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+        return rows[:limit] if limit is not None else rows
+
+    def _indexed(self):
+        """
+        Returns the number of rows the index covers, or 0 if there is no
+        complete index.
+        """
+        indexed = self.meta["indexed"]
+        if any(self._size(name) != indexed * 8 for name in INDEX_COLUMNS):
+            return 0
+        return indexed
+
+    def _find(self, seed, game, conditions, limit):
+        """
+        Looks a seed, and a game number or range within it, up in the index,
+        then scans the rows appended since.
+        """
+        seeds = self.column("index_seeds")
+        low = int(np.searchsorted(seeds, seed, side="left"))
+        high = int(np.searchsorted(seeds, seed, side="right"))
+        if game is not None:
+            games = self.column("index_games")[low:high]
+            first, last = game if isinstance(game, tuple) else (game, game + 1)
+            if last is not None:
+                high = low + int(np.searchsorted(games, last, side="left"))
+            if first is not None:
+                low += int(np.searchsorted(games, first, side="left"))
+        candidates = np.sort(self.column("index_rows")[low:max(low, high)])
+        rows = candidates[self._select(conditions, candidates)]
+        if limit is None or len(rows) < limit:
+            tail = self._scan(conditions, self.meta["indexed"], len(self), None)
+            rows = np.concatenate([rows, tail])
+        return rows[:limit] if limit is not None else rows
+
+    def _write_index(self, name, parts):
+        """
+        Writes an index file in one step from arrays of values.
+        """
+        handle, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(handle, "wb") as index_file:
+            for part in parts:
+                index_file.write(memoryview(part.astype(INDEX_COLUMNS[name], copy=False)))
+        os.replace(temp_path, self._file(name))
+
+    def build_index(self):
+        """
+        Sorts the row numbers by (seed, game) so lookups of a seed, and of a
+        game within it, are binary searches. Rows appended later are still
+        found, by a scan, until the next build. This is the one step that
+        holds a whole column's worth of numbers (the sort key and its order)
+        in memory.
+
+        Returns:
+        --------
+        int: The number of rows indexed.
+        """
+        count = len(self)
+        seeds = self.column("seed")[:count]
+        games = self.column("game")[:count]
+        chunks = [slice(start, min(start + CHUNK_ROWS, count))
+                  for start in range(0, count, CHUNK_ROWS)]
+        distinct = []
+        low_game = high_game = 0
+        for chunk in chunks:
+            distinct.append(np.unique(seeds[chunk]))
+            low_game = min(low_game, int(games[chunk].min()))
+            high_game = max(high_game, int(games[chunk].max()))
+        distinct = np.unique(np.concatenate(distinct)) if distinct else np.empty(0, np.int64)
+        span = high_game - low_game + 1
+        if len(distinct) * span < 1 << 63:
+            key = np.empty(count, dtype=np.int64)
+            for chunk in chunks:
+                key[chunk] = np.searchsorted(distinct, seeds[chunk]) * span
+                key[chunk] += games[chunk] - low_game
+            order = np.argsort(key) # Lookups put the rows back in order
+            del key
+        else:
+            order = np.lexsort((games, seeds))
+        self._write_index("index_rows", [order])
+        for name, column in (("index_seeds", seeds), ("index_games", games)):
+            self._write_index(name, (column[order[chunk]] for chunk in chunks))
+        self.meta["indexed"] = count
+        self._save_meta()
+        return count
+
+
+class _StoreWriter:
+    """
+    Appends batch shards to a ResultStore under one configuration and seed.
+    """
+
+    def __init__(self, store, config_id, seed):
+        self.store = store
+        self.config_id = config_id
+        self.seed = seed
+
+    def write_shard(self, first_game, rows):
+        self.store.append_rows(rows, self.seed, first_game, self.config_id)
@@ -0,0 +1,226 @@
+# strategies.py
+# This file contains the COM reroll strategies. A strategy decides whether a
+# player rolls again, and any mix of strategies can play at the same table.
+
+# Dependencies:
+#   - rules (DEFAULT_RULES and its lookup tables)
+#   - mcts (MCTSStrategy, registered as "mcts")
+
+# Usage Example:
+# game.create_players(strategies={2: ThresholdStrategy(2), 3: LegacyStrategy()})
+# strategy = get_strategy("bust", max_risk=0.4)
+
+
+# Class Responsibilities:
+# - Define the strategy protocol: strategy(player, board, game) -> bool.
+# - Turn a (board occupancy, hand) state into a reroll probability once, and
+#   share that answer with every player using an identical strategy under the
+#   same board layout.
+
+from .mcts import MCTSStrategy
+from .rules import DEFAULT_RULES
+
+_MEMOS = {} # Shared decision memos, one per strategy configuration and board layout
+
+
+class Strategy:
+    """
+    The Strategy class is the base for COM reroll strategies.
+
+    Subclasses implement reroll_probability(occupancy, hand, rules). Calling a
+    strategy looks the answer up in a memo keyed on (board occupancy, hand) that
+    is shared by all strategies with the same configuration and board layout, so
+    each state is worked out once per process. A probability of 0 or 1 is a fixed
+    decision; anything in between is settled with a draw from the player's own
+    dice stream.
+
+    Attributes:
+    -----------
+    name: str
+        The name the strategy is registered under.
+    memo: dict
+        The shared memo of reroll probabilities for the rules last played.
+
+    Methods:
+    --------
+    reroll_probability(occupancy, hand, rules):
+        Returns the probability of rolling again for a board and hand.
+    __call__(player, board, game):
+        Decides whether the player rolls again.
+    """
+    name = "base"
+
+    def __init__(self):
+        self._use_rules(DEFAULT_RULES)
+
+    def _use_rules(self, rules):
+        """
+        Switches to the shared memo for a set of rules.
+        """
+        self._rules = rules
+        self._shift = rules.slots
+        self.memo = _MEMOS.setdefault(
+            (self.cache_key(), rules.slots, rules.die_faces, rules.free_slot), {})
+
+    def cache_key(self):
+        """
+        Returns a key that identifies this strategy's configuration.
+        """
+        return (type(self).__name__,) + tuple(
+            sorted(item for item in vars(self).items()
+                   if item[0] != "memo" and not item[0].startswith("_")))
+
+    def reroll_probability(self, occupancy, hand, rules=DEFAULT_RULES):
+        """
+        Returns the probability of rolling again.
+
+        Parameters:
+        -----------
+        occupancy: int
+            The board's occupancy bitmask (bit k - 1 is slot k).
+        hand: int
+            The number of pennies the player has left.
+        rules: Rules
+            The rules being played (default: the standard rules).
+        """
+        raise NotImplementedError
+
+    def __call__(self, player, board, game=None):
+        """
+        Decides whether the player rolls again.
+
+        Returns:
+        --------
+        bool
+            True to reroll, False to pass.
+        """
+        rules = board.rules
+        if rules is not self._rules:
+            self._use_rules(rules)
+        occupancy = board.occupancy
+        key = occupancy | player.hand << self._shift
+        chance = self.memo.get(key)
+        if chance is None:
+            chance = self.memo[key] = self.reroll_probability(occupancy, player.hand, rules)
+        if chance >= 1.0:
+            return True
+        if chance <= 0.0:
+            return False
+        return player.dice.random() < chance
+
+    def __repr__(self):
+        params = ", ".join(f"{key}={value!r}" for key, value in vars(self).items()
+                           if key != "memo" and not key.startswith("_"))
+        return f"{type(self).__name__}({params})"
+
+
+class RandomStrategy(Strategy):
+    """
+    Rerolls with a fixed probability, ignoring the board. The default of 0.7
+    matches the original COM choice in Player.check_reroll.
+    """
+    name = "random"
+
+    def __init__(self, chance=0.7):
+        self.chance = chance
+        super().__init__()
+
+    def reroll_probability(self, occupancy, hand, rules=DEFAULT_RULES):
+        return self.chance
+
+
+class ThresholdStrategy(Strategy):
+    """
+    Rerolls while fewer than `max_occupied` of the slots 1-5 (every slot but the
+    free one) hold a penny.
+    """
+    name = "threshold"
+
+    def __init__(self, max_occupied=2):
+        self.max_occupied = max_occupied
+        super().__init__()
+
+    def reroll_probability(self, occupancy, hand, rules=DEFAULT_RULES):
+        return 1.0 if rules.popcount[occupancy & rules.crash_mask] < self.max_occupied else 0.0
+
+
+class BustProbabilityStrategy(Strategy):
+    """
+    Rerolls while the exact chance that the next roll crashes the board is at
+    most `max_risk`. With one penny left the player always rolls, since a roll
+    that does not crash wins the game.
+    """
+    name = "bust"
+
+    def __init__(self, max_risk=1 / 3):
+        self.max_risk = max_risk
+        super().__init__()
+
+    def reroll_probability(self, occupancy, hand, rules=DEFAULT_RULES):
+        if hand == 1:
+            return 1.0
+        return 1.0 if rules.bust[occupancy] <= self.max_risk else 0.0
+
+
+class LegacyStrategy(Strategy):
+    """
+    The COM rule from the original game (old/pennygame.py): roll again when a
+    random number beats 0.16 times the number of pennies on the board.
+    """
+    name = "legacy"
+
+    def __init__(self, factor=0.16):
+        self.factor = factor
+        super().__init__()
+
+    def reroll_probability(self, occupancy, hand, rules=DEFAULT_RULES):
+        return min(1.0, max(0.0, 1.0 - self.factor * rules.popcount[occupancy]))
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (RandomStrategy, ThresholdStrategy, BustProbabilityStrategy, LegacyStrategy,
+                     MCTSStrategy)
+}
+
+
+def get_strategy(name, **params):
+    """
+    Builds a registered strategy by name.
+
+    Parameters:
+    -----------
+    name: str
+        One of the names in STRATEGIES.
+    params:
+        Passed to the strategy's constructor.
+
+    Raises:
+    -------
+    ValueError: If no strategy has that name.
+    """
+    try:
+        strategy_class = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown strategy {name!r}. Choose from: {', '.join(sorted(STRATEGIES))}."
+        ) from None
+    return strategy_class(**params)
+
+
+def build_strategy(spec):
+    """
+    Builds a strategy from a spec: a registered name or a (name, params) pair.
+    """
+    if isinstance(spec, str):
+        return get_strategy(spec)
+    name, params = spec
+    return get_strategy(name, **params)
+
+
+def clear_memos():
+    """
+    Empties every shared decision memo.
+    """
+    for memo in _MEMOS.values():
+        memo.clear()
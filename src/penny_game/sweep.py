@@ -0,0 +1,299 @@
+# sweep.py
+# This file contains the parameter-sweep scheduler. A sweep expands a grid of
+# game settings (player counts, COM counts, rules, strategies) into cells,
+# splits each cell's games into shards and plays the shards in worker
+# processes. Every finished shard is saved in a content-addressed cache, so
+# running a sweep again only plays the shards it has not seen before.
+
+# Dependencies:
+#   - hashlib, itertools, json, os, pickle, tempfile
+#   - DiceStream class
+#   - simulation (simulate_game)
+#   - stats (GameStats, confidence_sequence)
+#   - sequential (run_until_decided, Done)
+#   - rules (get_rules)
+#   - strategies (build_strategy)
+#   - policy_solver (default_cache_dir)
+
+# Usage Example:
+# cells = run_sweep({"players": [2, 3, 4], "rules": ["standard", "legacy"],
+#                    "strategies": ["random", "threshold"]}, games=100000, seed=1)
+# for cell in cells:
+#     print(cell.config, cell.stats)
+
+
+# How it works:
+# - A cell is one combination of grid values, written out in full: players,
+#   COM players, the rules as a dictionary and one strategy spec per seat.
+# - A shard is a range of game numbers in a cell. Its cache key is a hash of
+#   the cell, the seed, the range, the turn limit and SWEEP_VERSION, so the
+#   same work always has the same key and different work never shares one.
+# - Game n of every cell plays from child n of the root DiceStream, so the
+#   cells of a sweep are compared on the same dice, and a shard's result does
+#   not depend on the worker that played it.
+# - Shards are stored as pickled GameStats, which are small and merge exactly.
+#   Files are written under a temporary name and renamed into place, so an
+#   interrupted sweep never leaves a half-written shard behind.
+# - With precision, each cell stops once every seat's win rate is known to
+#   within +/- precision, checked after every shard in order, and the workers
+#   move on to the other cells. games is then a cap per cell.
+# - Bump SWEEP_VERSION whenever a change to the engine changes game results.
+
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import tempfile
+from .dice import DiceStream
+from .policy_solver import default_cache_dir
+from .rules import get_rules
+from .sequential import Done, run_until_decided
+from .simulation import simulate_game
+from .stats import GameStats, confidence_sequence
+from .strategies import build_strategy
+
+SWEEP_VERSION = 1
+GRID_KEYS = ("players", "com", "rules", "strategies")
+
+
+class SweepCell:
+    """
+    The SweepCell class holds the results of one combination of settings.
+
+    Attributes:
+    -----------
+    config: dict
+        The cell's settings: players, com, rules (a dictionary) and strategies
+        (one spec per seat, None for the default COM choice).
+    stats: GameStats
+        The merged results of every game in the cell.
+    computed: int
+        Shards played during this run.
+    cached: int
+        Shards read from the cache.
+    decided: bool
+        Whether the cell stopped early with every win rate known to the
+        requested precision.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.stats = GameStats(config["players"])
+        self.computed = 0
+        self.cached = 0
+        self.decided = False
+
+    def decide(self, precision, alpha=0.05):
+        """
+        Sets decided if every seat's win rate is known to within +/- precision
+        by an always-valid interval at error level alpha, and returns decided.
+        """
+        stats = self.stats
+        for wins in stats.wins:
+            low, high = confidence_sequence(wins, stats.games, alpha)
+            if high - low > 2 * precision:
+                return False
+        self.decided = True
+        return True
+
+    def __repr__(self):
+        return f"SweepCell({self.config}, {self.stats})"
+
+
+def _spec(spec):
+    """
+    Returns a strategy spec in its JSON form: None, a name or [name, params].
+    """
+    if spec is None or isinstance(spec, str):
+        return spec
+    name, params = spec
+    return [name, dict(params)]
+
+
+def expand_grid(grid):
+    """
+    Expands a parameter grid into the full settings of each cell.
+
+    Parameters:
+    -----------
+    grid: dict
+        Lists of values for "players" (required), "com" (default: every seat),
+        "rules" (names, dictionaries or Rules; default: the standard rules) and
+        "strategies" (a spec for every COM seat, or a list with one per seat;
+        default: the default COM choice). A single value may be given instead
+        of a list.
+
+    Returns:
+    --------
+    list: Cell settings, in grid order.
+
+    Raises:
+    -------
+    ValueError: If the grid has unknown keys or impossible cells.
+    """
+    unknown = set(grid) - set(GRID_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}.")
+    if "players" not in grid:
+        raise ValueError("A sweep needs a list of player counts.")
+
+    def values(key, default):
+        value = grid.get(key, default)
+        return value if isinstance(value, list) else [value]
+
+    cells = []
+    for players, com, rules, strategies in itertools.product(
+            values("players", None), values("com", None), values("rules", None),
+            values("strategies", None)):
+        com = players if com is None else com
+        if players < 1 or not 0 <= com <= players:
+            raise ValueError(f"Invalid cell: {players} players with {com} COM players.")
+        if isinstance(strategies, list):
+            if len(strategies) != players:
+                raise ValueError(f"Expected {players} strategies, got {len(strategies)}.")
+            seats = [_spec(spec) for spec in strategies]
+        else:
+            seats = [_spec(strategies)] * players
+        if any(seat is None for seat in seats[:players - com]):
+            raise ValueError("Human seats need a strategy to play in a sweep.")
+        cells.append({"players": players, "com": com, "rules": get_rules(rules).to_dict(),
+                      "strategies": seats})
+    return cells
+
+
+def shard_key(config, seed, first_game, num_games, max_turns):
+    """
+    Returns the content hash that names a shard in the cache.
+    """
+    content = json.dumps(
+        {"version": SWEEP_VERSION, "config": config, "seed": seed, "first": first_game,
+         "games": num_games, "max_turns": max_turns},
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def play_shard(config, seed, first_game, num_games, max_turns=10000):
+    """
+    Plays games first_game to first_game + num_games - 1 of a cell.
+
+    Returns:
+    --------
+    GameStats: The results of the shard.
+    """
+    rules = get_rules(config["rules"])
+    strategies = [
+        build_strategy(spec if isinstance(spec, str) else tuple(spec)) if spec is not None
+        else None for spec in config["strategies"]
+    ]
+    root = DiceStream(seed, faces=rules.die_faces)
+    stats = GameStats(config["players"])
+    for index in range(first_game, first_game + num_games):
+        stats.add(simulate_game(config["players"], config["com"], dice=root.child(index),
+                                strategies=strategies, max_turns=max_turns, rules=rules))
+    return stats
+
+
+def _shard_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], f"{key}.pkl")
+
+
+def _load_shard(path):
+    """
+    Returns a cached shard, or None if it is missing or unreadable.
+    """
+    try:
+        with open(path, "rb") as shard_file:
+            stats = pickle.load(shard_file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    return stats if isinstance(stats, GameStats) else None
+
+
+def _save_shard(path, stats):
+    """
+    Writes a shard to the cache in one step.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "wb") as shard_file:
+        pickle.dump(stats, shard_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def run_sweep(grid, games, seed=0, shard_size=1000, workers=None, cache_dir=None,
+              max_turns=10000, precision=None, alpha=0.05):
+    """
+    Runs every cell of a parameter grid, reusing cached shards.
+
+    Parameters:
+    -----------
+    grid: dict
+        The parameter grid, as for expand_grid().
+    games: int
+        Games per cell (with precision, at most).
+    seed: int
+        The root seed that every game's dice stream is derived from.
+    shard_size: int
+        Games per shard. Keep it fixed between runs: shards are cached by
+        their exact range, so a run with more games reuses every full shard of
+        a shorter run.
+    workers: int
+        Worker processes (default: one per CPU). With 1, shards are played in
+        this process.
+    cache_dir: str
+        Where shards are kept (default: a "sweeps" folder in the policy cache
+        directory, $PENNY_GAME_CACHE or ~/.cache/penny-game). False turns the
+        cache off.
+    max_turns: int
+        Stops a game that has not been won after this many turns.
+    precision: float
+        Stops each cell once every seat's win rate is known to within
+        +/- precision (default: play every game).
+    alpha: float
+        The error level of the precision check (default: 0.05).
+
+    Returns:
+    --------
+    list: A SweepCell for each cell, in grid order.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(default_cache_dir(), "sweeps")
+    cells = [SweepCell(config) for config in expand_grid(grid)]
+    queues = []
+    paths = []
+    for cell in cells:
+        queue = []
+        cell_paths = []
+        for first in range(0, games, shard_size):
+            count = min(shard_size, games - first)
+            path = None
+            args = (cell.config, seed, first, count, max_turns)
+            if cache_dir:
+                path = _shard_path(cache_dir, shard_key(*args))
+                stats = _load_shard(path)
+                if stats is not None:
+                    args = Done(stats)
+            queue.append(args)
+            cell_paths.append(path)
+        queues.append(queue)
+        paths.append(cell_paths)
+
+    def finish(cell_index, shard, stats, played):
+        cell = cells[cell_index]
+        if played:
+            if paths[cell_index][shard] is not None:
+                _save_shard(paths[cell_index][shard], stats)
+            cell.computed += 1
+        else:
+            cell.cached += 1
+        cell.stats.merge(stats)
+
+    def decided(cell_index):
+        return cells[cell_index].decide(precision, alpha)
+
+    run_until_decided(queues, play_shard, finish, decided if precision is not None else None,
+                      workers or os.cpu_count() or 1)
+    return cells
@@ -0,0 +1,223 @@
+# tournament.py
+# This file contains the tournament runner, which plays every pair of COM
+# strategies against each other many times, spread across worker processes.
+
+# Dependencies:
+#   - DiceStream class
+#   - simulation (simulate_game)
+#   - strategies (build_strategy)
+#   - sequential (run_until_decided)
+#   - stats (confidence_sequence)
+
+# Usage Example:
+# results = run_tournament(["random", "threshold", ("bust", {"max_risk": 0.5})],
+#                          games_per_matchup=10000, seed=1)
+# for matchup in results:
+#     print(matchup)
+# results = run_tournament(["random", "threshold"], games_per_matchup=1000000, alpha=0.01)
+
+
+# How it works:
+# - A matchup is a pair of strategies. Its games are split into shards, and each
+#   shard is a job for one worker process.
+# - Every game plays from its own child of the root DiceStream, indexed by the
+#   matchup and the game, so results do not depend on how many workers run.
+# - Seats alternate between the two strategies, and the alternation flips from
+#   one game to the next.
+# - With alpha, a matchup stops once the confidence sequence of side 0's share
+#   of the won games leaves 1/2 (one side is better), or fits inside
+#   1/2 +/- margin (the two are as good as even). games_per_matchup is then a
+#   cap, and the workers move on to the matchups still undecided.
+
+import itertools
+import os
+from array import array
+
+from .dice import DiceStream
+from .sequential import run_until_decided
+from .simulation import simulate_game
+from .stats import confidence_sequence
+from .strategies import build_strategy
+
+
+class MatchupStats:
+    """
+    The MatchupStats class totals the games of one matchup.
+
+    Attributes:
+    -----------
+    strategies: tuple
+        The two strategy specs that played.
+    games: int
+        The number of games played.
+    wins: list
+        Games won by each of the two strategies.
+    unfinished: int
+        Games that hit the turn limit without a winner.
+    total_turns: int
+        Turns summed over all games.
+    total_crashes: int
+        Crashes summed over all games.
+    decided: bool
+        Whether a sequential test stopped the matchup early.
+    leader: int
+        The side (0 or 1) found to be better, or None.
+    """
+
+    def __init__(self, strategies):
+        self.strategies = strategies
+        self.games = 0
+        self.wins = [0, 0]
+        self.unfinished = 0
+        self.total_turns = 0
+        self.total_crashes = 0
+        self.decided = False
+        self.leader = None
+
+    def add_records(self, records):
+        """
+        Adds a shard of per-game records (flat winner, turns, crashes triples).
+        """
+        for index in range(0, len(records), 3):
+            winner = records[index]
+            if winner < 0:
+                self.unfinished += 1
+            else:
+                self.wins[winner] += 1
+            self.total_turns += records[index + 1]
+            self.total_crashes += records[index + 2]
+            self.games += 1
+
+    def win_rate(self, side=0):
+        """
+        Returns the fraction of games won by one side (0 or 1).
+        """
+        return self.wins[side] / self.games if self.games else 0.0
+
+    def interval(self, alpha=0.05):
+        """
+        Returns the always-valid confidence interval (low, high) of side 0's
+        share of the games that were won.
+        """
+        return confidence_sequence(self.wins[0], self.wins[0] + self.wins[1], alpha)
+
+    def decide(self, alpha, margin=0.0):
+        """
+        Sets decided and leader if the matchup's outcome is known at error
+        level alpha, and returns decided.
+        """
+        low, high = self.interval(alpha)
+        if low > 0.5 or high < 0.5:
+            self.leader = 0 if low > 0.5 else 1
+            self.decided = True
+        elif 0.5 - margin < low and high < 0.5 + margin:
+            self.decided = True
+        return self.decided
+
+    def average_turns(self):
+        """
+        Returns the average game length in turns.
+        """
+        return self.total_turns / self.games if self.games else 0.0
+
+    def average_crashes(self):
+        """
+        Returns the average number of crashes per game.
+        """
+        return self.total_crashes / self.games if self.games else 0.0
+
+    def __repr__(self):
+        first, second = (_label(spec) for spec in self.strategies)
+        return (
+            f"{first} vs {second}: {self.win_rate(0):.3f} / {self.win_rate(1):.3f} "
+            f"over {self.games} games, {self.average_turns():.1f} turns, "
+            f"{self.average_crashes():.1f} crashes"
+        )
+
+
+def _label(spec):
+    """
+    Returns a readable name for a strategy spec.
+    """
+    if isinstance(spec, str):
+        return spec
+    name, params = spec
+    return f"{name}({', '.join(f'{key}={value}' for key, value in sorted(params.items()))})"
+
+
+def play_shard(matchup, matchup_index, first_game, num_games, num_players, root_seed,
+               max_turns=10000):
+    """
+    Plays one shard of a matchup and returns its per-game records.
+
+    Returns:
+    --------
+    array
+        Flat (winner, turns, crashes) triples, where winner is 0 or 1 for the
+        winning side, or -1 for a game that hit the turn limit.
+    """
+    sides = (build_strategy(matchup[0]), build_strategy(matchup[1]))
+    root = DiceStream(root_seed)
+    records = array("i")
+    for game_index in range(first_game, first_game + num_games):
+        seating = [(seat + game_index) % 2 for seat in range(num_players)]
+        result = simulate_game(
+            num_players,
+            dice=root.child(matchup_index, game_index),
+            strategies=[sides[side] for side in seating],
+            max_turns=max_turns,
+        )
+        winner = seating[result.winner - 1] if result.winner else -1
+        records.extend((winner, result.turns, result.crashes))
+    return records
+
+
+def run_tournament(strategies, games_per_matchup, num_players=2, seed=0, workers=None,
+                   shard_size=1000, alpha=None, margin=0.0):
+    """
+    Plays a round-robin tournament between strategies.
+
+    Parameters:
+    -----------
+    strategies: list
+        Strategy specs: registered names or (name, params) pairs.
+    games_per_matchup: int
+        The number of games each pair of strategies plays (with alpha, at most).
+    num_players: int
+        Seats per game, filled alternately by the two strategies (default: 2).
+    seed: int
+        The root seed that every game's dice stream is derived from.
+    workers: int
+        The number of worker processes (default: one per CPU). With 1, games
+        are played in this process.
+    shard_size: int
+        The number of games per job, which is also how often a matchup is
+        checked for a decision.
+    alpha: float
+        Stops each matchup once one side is better, or the two are within
+        margin of even, at this error level (default: play every game).
+    margin: float
+        How far from an even share of the wins counts as even (default: 0,
+        only a better side stops a matchup).
+
+    Returns:
+    --------
+    list: A MatchupStats for each pair of strategies.
+    """
+    matchups = list(itertools.combinations(strategies, 2))
+    stats = [MatchupStats(matchup) for matchup in matchups]
+    queues = [
+        [(matchup, index, first, min(shard_size, games_per_matchup - first), num_players, seed)
+         for first in range(0, games_per_matchup, shard_size)]
+        for index, matchup in enumerate(matchups)
+    ]
+
+    def finish(index, shard, records, played):
+        stats[index].add_records(records)
+
+    def decided(index):
+        return stats[index].decide(alpha, margin)
+
+    run_until_decided(queues, play_shard, finish, decided if alpha is not None else None,
+                      workers or os.cpu_count() or 1)
+    return stats
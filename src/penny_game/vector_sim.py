@@ -0,0 +1,190 @@
+# vector_sim.py
+# This file contains a NumPy engine that plays many games of The Penny Game at
+# once. Boards, hands and dice are stored as arrays (one row per game) and each
+# step advances every unfinished game by one roll.
+
+# Dependencies:
+#   - numpy
+
+# Usage Example:
+# batch = simulate_batch(100000, num_players=4, seed=1)
+# print(batch.win_rates())
+
+import numpy as np
+
+SLOTS = 6
+# Dice and uniforms are drawn this many at a time and consumed in slices.
+DRAW_SIZE = 1 << 20
+
+
+class BatchResult:
+    """
+    The BatchResult class holds the outcomes of a batch of simulated games.
+
+    Attributes:
+    -----------
+    winner: numpy.ndarray
+        The winning player number of each game (1-based), or 0 if the game hit the step limit.
+    first_player: numpy.ndarray
+        The player number who went first in each game.
+    turns: numpy.ndarray
+        The number of turns played in each game.
+    crashes: numpy.ndarray
+        The number of crashes in each game.
+    hands: numpy.ndarray
+        The final hands, shaped (games, players).
+    """
+
+    def __init__(self, winner, first_player, turns, crashes, hands):
+        self.winner = winner
+        self.first_player = first_player
+        self.turns = turns
+        self.crashes = crashes
+        self.hands = hands
+
+    def __len__(self):
+        return len(self.winner)
+
+    def win_rates(self):
+        """
+        Returns the fraction of finished games won by each player, in player order.
+        """
+        num_players = self.hands.shape[1]
+        wins = np.bincount(self.winner, minlength=num_players + 1)[1:]
+        finished = wins.sum()
+        return wins / finished if finished else wins.astype(float)
+
+
+class _DrawPool:
+    """
+    Hands out slices of pre-drawn random numbers, refilling in large batches.
+    """
+
+    def __init__(self, draw):
+        self._draw = draw
+        self._pool = draw(DRAW_SIZE)
+        self._pos = 0
+
+    def take(self, count):
+        if self._pos + count > len(self._pool):
+            self._pool = np.concatenate(
+                (self._pool[self._pos:], self._draw(max(DRAW_SIZE, count)))
+            )
+            self._pos = 0
+        values = self._pool[self._pos:self._pos + count]
+        self._pos += count
+        return values
+
+
+def simulate_batch(num_games, num_players, seed=None, reroll=0.7, starting_hand=20,
+                   max_steps=100000):
+    """
+    Plays many COM games at once under the same rules as GameBoard.add_penny:
+    slot 6 empties before every penny, a second penny in a slot crashes the board,
+    and the crashing player picks up every penny on it.
+
+    The first player of each game is drawn uniformly, which is exactly the
+    distribution of Game.who_first's roll-off between identical players.
+
+    Parameters:
+    -----------
+    num_games: int
+        The number of games to play.
+    num_players: int
+        The number of players in every game.
+    seed: int
+        Seeds the NumPy generator so the batch can be replayed.
+    reroll: float or array
+        The probability that a player rerolls after a roll that did not crash.
+        Either one probability (0.7 matches Player.check_reroll) or an array of
+        64 probabilities indexed by the board's occupancy bitmask, where bit
+        k - 1 is set when slot k holds a penny.
+    starting_hand: int
+        The number of pennies each player starts with (default: 20).
+    max_steps: int
+        Stops any game still running after this many rolls.
+
+    Returns:
+    --------
+    BatchResult: The outcome of every game.
+
+    Raises:
+    -------
+    ValueError: If the reroll table does not have 64 entries.
+    """
+    rng = np.random.default_rng(seed)
+    dice = _DrawPool(lambda n: rng.integers(0, SLOTS, size=n, dtype=np.intp))
+    uniforms = _DrawPool(rng.random)
+
+    by_occupancy = np.ndim(reroll) > 0
+    if by_occupancy:
+        reroll = np.asarray(reroll, dtype=float)
+        if reroll.shape != (1 << SLOTS,):
+            raise ValueError(f"A reroll table needs {1 << SLOTS} entries, not {reroll.shape}.")
+        bit_values = 1 << np.arange(SLOTS)
+
+    winner = np.zeros(num_games, dtype=np.int8)
+    turns = np.zeros(num_games, dtype=np.int32)
+    crashes = np.zeros(num_games, dtype=np.int32)
+    hands = np.full((num_games, num_players), starting_hand, dtype=np.int16)
+    first_player = rng.integers(0, num_players, size=num_games)
+
+    # Working arrays for the games still in play
+    ids = np.arange(num_games)
+    board = np.zeros((num_games, SLOTS), dtype=np.int8)
+    hand = hands.copy()
+    current = first_player.copy()
+    game_turns = np.zeros(num_games, dtype=np.int32)
+    game_crashes = np.zeros(num_games, dtype=np.int32)
+
+    for _ in range(max_steps):
+        live = len(ids)
+        if not live:
+            break
+        rows = np.arange(live)
+
+        # Roll, drop a penny and place it
+        slot = dice.take(live)
+        hand[rows, current] -= 1
+        board[:, SLOTS - 1] = 0
+        board[rows, slot] += 1
+        crashed = board[rows, slot] > 1
+
+        # Crashes: pick up the board and end the turn
+        if crashed.any():
+            hand[rows[crashed], current[crashed]] += board[crashed].sum(axis=1, dtype=np.int16)
+            board[crashed] = 0
+            game_crashes += crashed
+
+        # Wins: an empty hand after a roll that did not crash
+        won = ~crashed & (hand[rows, current] == 0)
+
+        # Everyone else decides whether to roll again
+        if by_occupancy:
+            chance = reroll[(board > 0) @ bit_values]
+        else:
+            chance = reroll
+        passes = crashed | ((uniforms.take(live) >= chance) & ~won)
+        game_turns += passes | won
+        current = np.where(passes, (current + 1) % num_players, current)
+
+        if won.any():
+            done = ids[won]
+            winner[done] = current[won] + 1
+            _record(done, won, hand, game_turns, game_crashes, hands, turns, crashes)
+            keep = ~won
+            ids, board, hand, current = ids[keep], board[keep], hand[keep], current[keep]
+            game_turns, game_crashes = game_turns[keep], game_crashes[keep]
+
+    # Games that hit the step limit keep winner 0
+    _record(ids, slice(None), hand, game_turns, game_crashes, hands, turns, crashes)
+    return BatchResult(winner, first_player + 1, turns, crashes, hands)
+
+
+def _record(done, rows, hand, game_turns, game_crashes, hands, turns, crashes):
+    """
+    Copies the working state of finished games into the result arrays.
+    """
+    hands[done] = hand[rows]
+    turns[done] = game_turns[rows]
+    crashes[done] = game_crashes[rows]
@@ -0,0 +1,98 @@
+# batch_test.py
+# This file lets me see if the streaming batch simulator is working properly.
+
+# Created: 10/18/26
+
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.batch import output_format, print_progress, run_batch
+from penny_game.dice import DiceStream
+from penny_game.simulation import simulate_game
+from penny_game.strategies import build_strategy
+from penny_game.sweep import run_sweep
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def test_jsonl_rows(self):
+        """Test that every game becomes one JSON line that replays from its seed."""
+        output = io.StringIO()
+        stats = run_batch(7, players=3, strategies="threshold", seed=5, output=output,
+                          fmt="jsonl", workers=1, shard_size=3)
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([row["game"] for row in rows], list(range(7)))
+        self.assertEqual(stats.games, 7)
+        result = simulate_game(3, dice=DiceStream(5).child(4),
+                               strategies=[build_strategy("threshold")] * 3)
+        self.assertEqual(rows[4], {"game": 4, "seed": 5, "winner": result.winner,
+                                   "first_player": result.first_player, "turns": result.turns,
+                                   "crashes": result.crashes, "hands": list(result.hands)})
+
+    def test_csv_file(self):
+        """Test CSV output to a path, with a column per hand and the format from the extension."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.csv")
+            run_batch(5, players=2, strategies=["random", "bust"], rules="legacy", output=path,
+                      workers=1)
+            with open(path, newline="") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(list(rows[0]), ["game", "seed", "winner", "first_player", "turns",
+                                         "crashes", "hand_1", "hand_2"])
+        self.assertIn(rows[0]["winner"], ("1", "2"))
+        self.assertIn(0, [int(rows[0]["hand_1"]), int(rows[0]["hand_2"])])
+
+    def test_matches_sweep(self):
+        """Test that worker processes play the same games as a sweep of the same cell."""
+        output = io.StringIO()
+        stats = run_batch(60, players=2, strategies="threshold", seed=2, output=output,
+                          fmt="jsonl", workers=2, shard_size=10)
+        sweep = run_sweep({"players": 2, "strategies": "threshold"}, 60, seed=2,
+                          shard_size=10, workers=1, cache_dir=False)[0].stats
+        self.assertEqual(stats.wins, sweep.wins)
+        self.assertEqual(stats.turn_histogram.counts, sweep.turn_histogram.counts)
+        games = [json.loads(line)["game"] for line in output.getvalue().splitlines()]
+        self.assertEqual(games, list(range(60)))
+
+    def test_interrupt_keeps_rows(self):
+        """Test that an interrupted batch keeps every whole shard already written."""
+        def interrupt(done, total, seconds):
+            if done == 4:
+                raise KeyboardInterrupt
+
+        output = io.StringIO()
+        stats = run_batch(10, output=output, fmt="jsonl", workers=1, shard_size=2,
+                          progress=interrupt)
+        self.assertTrue(stats.interrupted)
+        self.assertEqual(stats.games, 4)
+        self.assertEqual(len(output.getvalue().splitlines()), 4)
+        self.assertTrue(output.getvalue().endswith("\n"))
+
+    def test_invalid(self):
+        """Test that bad settings fail before any game is played."""
+        for settings in ({"players": 2, "com": 1}, {"players": 2, "strategies": ["random"]},
+                         {"strategies": "no_such_strategy"}, {"output": "-", "fmt": "xml"}):
+            with self.assertRaises(ValueError):
+                run_batch(3, workers=1, **settings)
+
+    def test_format_and_progress(self):
+        """Test choosing the format from a path and the progress line."""
+        self.assertEqual(output_format("games.CSV"), "csv")
+        self.assertEqual(output_format("games.out"), "jsonl")
+        stream = io.StringIO()
+        print_progress(500, 1000, 2.0, stream)
+        print_progress(1000, 1000, 4.0, stream)
+        self.assertEqual(stream.getvalue(), "\r500/1,000 games, 250 games/s, 2s left "
+                                            "\r1,000/1,000 games, 250 games/s, 0s left \n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# benchmark_test.py
+# This file lets me see if the benchmark suite is working properly.
+
+# Created: 10/18/26
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game import benchmark
+from penny_game.benchmark import BENCHMARKS, compare, load_baseline, main, run_benchmarks, save_baseline
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_every_benchmark_runs(self):
+        """Test that each benchmark runs and reports a positive throughput."""
+        results = run_benchmarks(min_time=0.001, repeat=1)
+        self.assertEqual(set(results), set(BENCHMARKS))
+        self.assertTrue(all(value > 0 for value in results.values()))
+
+    def test_games_at_every_size(self):
+        """Test that there is a whole-game benchmark for 2 to 5 players."""
+        for players in range(2, 6):
+            self.assertIn(f"games_{players}p", BENCHMARKS)
+
+    def test_unknown_benchmark(self):
+        """Test that asking for a missing benchmark raises a ValueError."""
+        with self.assertRaises(ValueError):
+            run_benchmarks(["no_such_benchmark"])
+
+    def test_compare(self):
+        """Test that only drops past the tolerance count as regressions."""
+        baseline = {"fast": 1000.0, "slow": 1000.0, "steady": 1000.0}
+        results = {"fast": 1500.0, "slow": 700.0, "steady": 900.0, "new": 5.0}
+        regressions = compare(results, baseline, tolerance=20)
+        self.assertEqual([name for name, *_ in regressions], ["slow"])
+        self.assertAlmostEqual(regressions[0][3], -30.0)
+        self.assertEqual(compare(results, baseline, tolerance=5)[1][0], "steady")
+
+    def test_baseline_file(self):
+        """Test saving, merging and loading a baseline."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            self.assertEqual(load_baseline(path), {})
+            save_baseline({"a": 10.0}, path)
+            save_baseline({"b": 20.0}, path)
+            self.assertEqual(load_baseline(path), {"a": 10.0, "b": 20.0})
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_main_fails_on_regression(self, mock_stdout):
+        """Test that the command line run exits with 1 when throughput drops."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            save_baseline({"check_reroll": 1e12}, path)
+            args = ["--only", "check_reroll", "--baseline", path, "--min-time", "0.001",
+                    "--repeat", "1"]
+            self.assertEqual(main(args), 1)
+            self.assertIn("REGRESSION check_reroll", mock_stdout.getvalue())
+            save_baseline({"check_reroll": 1.0}, path)
+            self.assertEqual(main(args), 0)
+
+    def test_repo_baseline_covers_suite(self):
+        """Test that the stored baseline has an entry for every benchmark."""
+        self.assertEqual(set(load_baseline(benchmark.DEFAULT_BASELINE)), set(BENCHMARKS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# bitmask_board_test.py
+# This file lets me see if the BitmaskBoard class behaves exactly like GameBoard.
+
+# Created: 10/18/26
+
+import io
+import os
+import random
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.bitmask_board import BitmaskBoard
+from penny_game.game_board import GameBoard
+
+
+class TestBitmaskBoard(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a new BitmaskBoard instance before each test.
+        """
+        self.board = BitmaskBoard()
+
+    def test_initial_state(self):
+        """
+        Test that the board starts empty and not crashed.
+        """
+        self.assertEqual(self.board.state, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0})
+        self.assertEqual(self.board.mask, 0)
+        self.assertFalse(self.board.crash)
+
+    def test_add_penny_crash(self):
+        """
+        Test that a second penny in a slot crashes the board and stays crashed.
+        """
+        self.board.add_penny(3)
+        self.assertEqual(self.board.mask, 0b100)
+        self.board.add_penny(3)
+        self.assertTrue(self.board.crash)
+        self.assertEqual(self.board.state[3], 2)
+        self.board.add_penny(2)
+        self.assertTrue(self.board.crash)
+
+    def test_slot_six_drop(self):
+        """
+        Test that slot 6 never crashes and empties when the next penny is added.
+        """
+        self.board.add_penny(6)
+        self.board.add_penny(6)
+        self.board.add_penny(1)
+        self.assertEqual(self.board.state[6], 0)
+        self.assertFalse(self.board.crash)
+
+    def test_add_penny_invalid_slot(self):
+        """
+        Test that invalid slots raise a ValueError.
+        """
+        for slot in (7, 0, -1, "hello", [1, 2]):
+            with self.assertRaises(ValueError):
+                self.board.add_penny(slot)
+
+    def test_penny_return(self):
+        """
+        Test that assigning a state loads it and clearing returns every penny.
+        """
+        self.board.state = {1: 6, 2: 4, 3: 3, 4: 2, 5: 1, 6: 0}
+        self.assertEqual(self.board.clear_board(), 16)
+        self.assertEqual(self.board.mask, 0)
+        self.assertFalse(self.board.crash)
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_print_board(self, mock_stdout):
+        """
+        Test that the board prints like a GameBoard.
+        """
+        self.board.add_penny(1)
+        self.board.add_penny(1)
+        self.board.add_penny(4)
+        self.board.print_board()
+        self.assertEqual(mock_stdout.getvalue(), "1 (X) 2 ( ) 3 ( ) 4 (O) 5 ( ) 6 ( ) \n")
+
+    def test_matches_game_board(self):
+        """
+        Test that random sequences of pennies leave both boards in the same state.
+        """
+        rng = random.Random(42)
+        board = GameBoard()
+        for _ in range(2000):
+            slot = rng.randint(1, 6)
+            board.add_penny(slot)
+            self.board.add_penny(slot)
+            self.assertEqual(self.board.state, board.state)
+            self.assertEqual(self.board.crash, board.crash)
+            self.assertEqual(self.board.occupancy, board.occupancy)
+            if board.crash or rng.random() < 0.05:
+                self.assertEqual(self.board.clear_board(), board.clear_board())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+# cli_test.py
+# This file lets me see if the package and its command line interface are working properly.
+
+# Created: 10/18/26
+
+import io
+import os
+import pkgutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+sys.path.insert(0, SRC)
+
+import penny_game
+from penny_game.cli import build_parser, main
+
+
+class TestPackage(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        """Test that importing the package or the CLI loads no engine or analysis modules."""
+        loaded = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, penny_game.cli; print(sorted(m for m in sys.modules if m.startswith('penny_game')))"],
+            cwd=SRC, capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(loaded.strip(), "['penny_game', 'penny_game.cli']")
+
+    def test_exports(self):
+        """Test that the package exposes the engine by name."""
+        result = penny_game.simulate_game(2, seed=3)
+        self.assertIsInstance(result, penny_game.GameResult)
+        self.assertIn("Game", dir(penny_game))
+        with self.assertRaises(AttributeError):
+            penny_game.no_such_name
+
+    def test_exports_are_not_modules(self):
+        """Test that no exported name hides a submodule of the same name."""
+        modules = {module.name for module in pkgutil.iter_modules(penny_game.__path__)}
+        self.assertFalse(modules & set(penny_game.__all__))
+        loaded = subprocess.run(
+            [sys.executable, "-c",
+             "import penny_game; penny_game.restore; penny_game.snapshot\n"
+             "import penny_game.snapshot as module; print(type(module).__name__)"],
+            cwd=SRC, capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(loaded.strip(), "module")
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def test_subcommands(self):
+        """Test that every subcommand is known and a command is required."""
+        parser = build_parser()
+        for command in ("play", "simulate", "bench"):
+            self.assertEqual(parser.parse_args([command]).command, command)
+        with patch("sys.stderr", new_callable=io.StringIO), self.assertRaises(SystemExit):
+            parser.parse_args([])
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_simulate(self, output):
+        """Test a small simulation with strategy parameters."""
+        status = main(["simulate", "--games", "40", "--players", "3", "--strategy", "bust",
+                       "--params", "max_risk=0.5", "--rules", "legacy", "--workers", "1"])
+        self.assertEqual(status, 0)
+        self.assertIn("GameStats(40 games", output.getvalue())
+        self.assertIn("player 3:", output.getvalue())
+
+    def test_simulate_cached_per_seat(self):
+        """Test that a strategy per seat gives the same numbers with and without the cache."""
+        command = ["simulate", "--games", "200", "--players", "2", "--strategy", "random",
+                   "threshold", "--workers", "1"]
+        reports = []
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for extra in ([], ["--cache-dir", cache_dir]):
+                with patch("sys.stdout", new_callable=io.StringIO) as output:
+                    self.assertEqual(main(command + extra), 0)
+                reports.append(output.getvalue())
+        self.assertEqual(reports[0], reports[1])
+        self.assertIn("GameStats(200 games", reports[1])
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_simulate_output(self, output):
+        """Test streaming rows to a CSV file with a strategy per seat."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.csv")
+            status = main(["simulate", "--games", "25", "--strategy", "random", "threshold",
+                           "--output", path, "--workers", "1"])
+            with open(path) as file:
+                lines = file.read().splitlines()
+        self.assertEqual(status, 0)
+        self.assertEqual(len(lines), 26)
+        self.assertTrue(lines[0].startswith("game,seed,winner"))
+        self.assertIn("GameStats(25 games", output.getvalue())
+
+    def test_query(self):
+        """Test storing a simulation and querying it, with filters before and after options."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.store")
+            with patch("sys.stdout", new_callable=io.StringIO):
+                main(["simulate", "--games", "30", "--output", path, "--workers", "1"])
+            with patch("sys.stdout", new_callable=io.StringIO) as output:
+                main(["query", path, "--count", "turns=:1000"])
+            self.assertEqual(output.getvalue(), "30\n")
+            with patch("sys.stdout", new_callable=io.StringIO) as output, \
+                    patch("sys.stderr", new_callable=io.StringIO):
+                main(["query", path, "seed=0", "game=12", "--index"])
+            self.assertIn('"game": 12', output.getvalue())
+            with self.assertRaises(SystemExit):
+                main(["query", path, "seat=1"])
+            with self.assertRaises(SystemExit):
+                main(["query", os.path.join(directory, "missing.store")])
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_compare(self, output):
+        """Test a small paired comparison."""
+        status = main(["compare", "threshold", "legacy", "--pairs", "20", "--players", "3",
+                       "--workers", "1"])
+        self.assertEqual(status, 0)
+        self.assertIn("threshold - legacy", output.getvalue())
+        self.assertIn("95% CI", output.getvalue())
+
+    def test_unknown_arguments(self):
+        """Test that only bench passes unknown arguments on."""
+        with patch("sys.stderr", new_callable=io.StringIO), self.assertRaises(SystemExit):
+            main(["simulate", "--bogus"])
+        with patch("penny_game.benchmark.main", return_value=1) as benchmark_main:
+            self.assertEqual(main(["bench", "--only", "who_first"]), 1)
+        benchmark_main.assert_called_once_with(["--only", "who_first"])
+
+    def test_module_entry_point(self):
+        """Test running the package with python -m."""
+        result = subprocess.run([sys.executable, "-m", "penny_game", "--help"], cwd=SRC,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertIn("simulate", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
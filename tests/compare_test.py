@@ -0,0 +1,89 @@
+# compare_test.py
+# This file lets me see if the paired strategy comparison is working properly.
+
+# Created: 10/18/26
+
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.compare import PairedComparison, compare_strategies, play_pairs
+from penny_game.dice import DiceStream
+from penny_game.simulation import simulate_game
+from penny_game.strategies import build_strategy
+
+
+class TestPairedComparison(unittest.TestCase):
+
+    def test_statistics(self):
+        """Test the rates, difference and interval of hand-made units."""
+        result = PairedComparison("threshold", "random", None, 2)
+        result.add_records([2, 1, 1, 1, 2, 0, 1, 1])
+        self.assertEqual(result.pairs, 4)
+        self.assertEqual(result.games, 16)
+        self.assertAlmostEqual(result.candidate_rate, 6 / 8)
+        self.assertAlmostEqual(result.baseline_rate, 3 / 8)
+        self.assertAlmostEqual(result.difference, 3 / 8)
+        # Unit differences 0.5, 0, 1, 0: sample variance 11/48
+        self.assertAlmostEqual(result.stderr, math.sqrt(11 / 48 / 4))
+        low, high = result.interval(0.95)
+        self.assertAlmostEqual((low + high) / 2, 3 / 8)
+        self.assertAlmostEqual(high - low, 2 * 1.959964 * result.stderr, places=5)
+        self.assertAlmostEqual(result.variance_ratio,
+                               (0.75 * 0.25 + 0.375 * 0.625) / 8 / result.stderr ** 2)
+
+    def test_merge(self):
+        """Test that merging adds units, but only of the same comparison."""
+        first = PairedComparison("bust", "legacy", None, 3)
+        first.add_records([1, 0])
+        second = PairedComparison("bust", "legacy", None, 3)
+        second.add_records([1, 0, 3, 2])
+        self.assertEqual(first.merge(second).counts, {(1, 0): 2, (3, 2): 1})
+        with self.assertRaises(ValueError):
+            first.merge(PairedComparison("bust", "legacy", None, 2))
+
+
+class TestCompareStrategies(unittest.TestCase):
+
+    def test_units_share_dice(self):
+        """Test that a unit plays every seat for both strategies on the same dice."""
+        records = play_pairs("threshold", "random", "legacy", 3, root_seed=4, first_pair=2,
+                             num_pairs=1)
+        expected = [0, 0]
+        for seat in range(3):
+            for side, name in enumerate(("threshold", "random")):
+                strategies = [build_strategy("legacy")] * 3
+                strategies[seat] = build_strategy(name)
+                result = simulate_game(3, dice=DiceStream(4).child(2), strategies=strategies)
+                expected[side] += result.winner == seat + 1
+        self.assertEqual(records, expected)
+
+    def test_worker_count_does_not_change_results(self):
+        """Test that a pool of workers finds exactly the same units as one process."""
+        alone = compare_strategies("threshold", "legacy", pairs=30, seed=3, workers=1,
+                                   shard_size=7)
+        pooled = compare_strategies("threshold", "legacy", pairs=30, seed=3, workers=2,
+                                    shard_size=7)
+        self.assertEqual(alone.counts, pooled.counts)
+        self.assertEqual(alone.pairs, 30)
+
+    def test_identical_strategies(self):
+        """Test that a strategy compared with itself differs by exactly nothing."""
+        result = compare_strategies("random", "random", num_players=3, pairs=20, workers=1)
+        self.assertEqual(result.difference, 0.0)
+        self.assertEqual(result.interval(), (0.0, 0.0))
+        self.assertEqual(result.variance_ratio, math.inf)
+
+    def test_invalid(self):
+        """Test that unknown strategies and one-seat games raise a ValueError."""
+        with self.assertRaises(ValueError):
+            compare_strategies("threshold", "nope", pairs=1, workers=1)
+        with self.assertRaises(ValueError):
+            compare_strategies("threshold", "legacy", num_players=1, pairs=1, workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# dice_test.py
+# This file lets me see if the DiceStream class is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.dice import DiceStream
+from penny_game.game import Game
+
+
+class TestDiceStream(unittest.TestCase):
+
+    def test_roll_range(self):
+        """Test that every face comes up and nothing else does."""
+        dice = DiceStream(1)
+        counts = Counter(dice.roll() for _ in range(12000))
+        self.assertEqual(sorted(counts), [1, 2, 3, 4, 5, 6])
+        for count in counts.values():
+            self.assertGreater(count, 1700)
+
+    def test_other_faces(self):
+        """Test that dice with other face counts stay in range."""
+        dice = DiceStream(1, faces=10)
+        self.assertEqual(set(dice.roll() for _ in range(5000)), set(range(1, 11)))
+        with self.assertRaises(ValueError):
+            DiceStream(1, faces=0)
+
+    def test_replayable(self):
+        """Test that the same seed gives the same rolls and random numbers."""
+        first, second = DiceStream(99), DiceStream(99)
+        self.assertEqual([first.roll() for _ in range(9000)], [second.roll() for _ in range(9000)])
+        self.assertEqual([first.random() for _ in range(600)], [second.random() for _ in range(600)])
+        other, again = DiceStream(100), DiceStream(99)
+        self.assertNotEqual([other.roll() for _ in range(50)], [again.roll() for _ in range(50)])
+
+    def test_lanes_are_separate(self):
+        """Test that drawing random numbers does not shift the rolls."""
+        plain, mixed = DiceStream(5), DiceStream(5)
+        rolls = [plain.roll() for _ in range(100)]
+        mixed_rolls = []
+        for _ in range(100):
+            mixed.random()
+            mixed_rolls.append(mixed.roll())
+        self.assertEqual(rolls, mixed_rolls)
+
+    def test_children(self):
+        """Test that children are reproducible and differ from each other."""
+        root = DiceStream(3)
+        child = root.child(1, 2)
+        again = DiceStream(3, path=(1, 2))
+        self.assertEqual([child.roll() for _ in range(40)], [again.roll() for _ in range(40)])
+        children = root.spawn(4)
+        sequences = {tuple(child.roll() for _ in range(40)) for child in children}
+        self.assertEqual(len(sequences), 4)
+
+    def test_jump(self):
+        """Test that jumping skips exactly the requested blocks."""
+        stepped, jumped = DiceStream(8), DiceStream(8)
+        stepped.roll()
+        block = stepped._rolls
+        for _ in range(len(block) - 1):
+            stepped.roll()
+        second_block_first = stepped.roll()
+        jumped.jump(1)
+        self.assertEqual(jumped.roll(), second_block_first)
+
+    def test_tell_seek(self):
+        """Test that a saved position replays the same rolls and random numbers."""
+        dice = DiceStream(21)
+        for _ in range(5000):
+            dice.roll()
+        for _ in range(700):
+            dice.random()
+        position = dice.tell()
+        expected = [(dice.roll(), dice.random()) for _ in range(300)]
+        restored = DiceStream(21)
+        restored.seek(position)
+        self.assertEqual([(restored.roll(), restored.random()) for _ in range(300)], expected)
+
+
+class TestGameDice(unittest.TestCase):
+
+    def test_seats_roll_from_children(self):
+        """Test that each player rolls from their own child of the game's stream."""
+        game = Game(dice=DiceStream(4))
+        game.numplayers = 3
+        game.create_players()
+        expected = DiceStream(4).child(2)
+        self.assertEqual([game.players[2].roll_dice() for _ in range(20)],
+                         [expected.roll() for _ in range(20)])
+
+    def test_who_first_with_dice(self):
+        """Test that who_first can roll every die from a given stream."""
+        game = Game(dice=DiceStream(4))
+        game.numplayers = 4
+        game.create_players()
+        first = game.who_first(announce=False, dice=DiceStream(7))
+        self.assertEqual(first, game.who_first(announce=False, dice=DiceStream(7)))
+
+
+if __name__ == "__main__":
+    unittest.main()
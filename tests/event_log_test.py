@@ -0,0 +1,87 @@
+# event_log_test.py
+# This file lets me see if the binary game event log is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game import event_log
+from penny_game.event_log import EventLogReader, EventLogWriter
+from penny_game.simulation import simulate_game
+
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_games(self, seeds, buffer_records=65536):
+        results = []
+        with EventLogWriter(self.path, buffer_records=buffer_records) as log:
+            for seed in seeds:
+                results.append(simulate_game(3, seed=seed, event_log=log))
+        return results
+
+    def test_game_is_recorded(self):
+        """Test that the log holds a start, every roll and the winner of a game."""
+        result = self.write_games([1])[0]
+        with EventLogReader(self.path) as reader:
+            events = list(reader)
+        self.assertEqual(events[0].kind, event_log.GAME)
+        self.assertEqual(events[0].seat, result.first_player)
+        self.assertEqual(events[-1].kind, event_log.WIN)
+        self.assertEqual(events[-1].seat, result.winner)
+        crashes = [event for event in events if event.kind == event_log.CRASH]
+        pickups = [event for event in events if event.kind == event_log.PICKUP]
+        self.assertEqual(len(crashes), result.crashes)
+        self.assertEqual(len(pickups), result.crashes)
+        rolls = [event for event in events if event.kind == event_log.ROLL]
+        places = [event for event in events if event.kind == event_log.PLACE]
+        self.assertEqual([roll.a for roll in rolls], [place.a for place in places])
+
+    def test_seek_to_game(self):
+        """Test that one game's events can be found without reading the others."""
+        results = self.write_games(range(10), buffer_records=7)
+        with EventLogReader(self.path) as reader:
+            events = reader.game_events(6)
+            self.assertTrue(all(event.game == 6 for event in events))
+            self.assertEqual(events[-1].seat, results[6].winner)
+            self.assertEqual(reader.game_events(10), [])
+
+    def test_appending_continues_numbering(self):
+        """Test that reopening a log carries on after its last game."""
+        self.write_games([1, 2])
+        self.write_games([3])
+        with EventLogReader(self.path) as reader:
+            self.assertEqual(reader[-1].game, 2)
+            self.assertEqual(reader.kind_counts()["game"], 3)
+
+    def test_kind_counts(self):
+        """Test that counting kinds agrees with reading every event."""
+        self.write_games(range(4))
+        with EventLogReader(self.path) as reader:
+            counts = reader.kind_counts(chunk_records=5)
+            self.assertEqual(sum(counts.values()), len(reader))
+            self.assertEqual(counts["roll"], sum(1 for event in reader if event.kind == event_log.ROLL))
+
+    def test_not_a_log(self):
+        """Test that other files are refused."""
+        with open(self.path, "wb") as other:
+            other.write(b"hello world, not a log")
+        with self.assertRaises(ValueError):
+            EventLogReader(self.path)
+        with self.assertRaises(ValueError):
+            EventLogWriter(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,7 +20,7 @@ from unittest.mock import patch
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
 
-from game_board import GameBoard
+from penny_game.game_board import GameBoard
 
 class TestGameBoard(unittest.TestCase):
     
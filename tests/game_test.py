@@ -12,8 +12,21 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from game import Game
-from player import Player
+from penny_game.game import Game
+from penny_game.player import Player
+
+class LoadedDice:
+    """A stand-in dice stream that always rolls the same number."""
+
+    def __init__(self, roll):
+        self.value = roll
+
+    def roll(self):
+        return self.value
+
+    def random(self):
+        return 0.0
+
 
 class TestGame(unittest.TestCase):
 
@@ -44,5 +57,92 @@ class TestGame(unittest.TestCase):
         game.get_numcom()
         self.assertEqual(game.numcom, 2)
 
+    def test_play_turn_crash(self):
+        """Test that a crash ends the turn and the player picks up the board."""
+        game = Game()
+        game.numplayers = 2
+        game.create_players()
+        game.current_player = 1
+        game.board.add_penny(3)
+        game.players[1].dice = LoadedDice(3)
+        game.play_turn(strategy=lambda player, board, game: True)
+        self.assertEqual(game.players[1].hand, 21)
+        self.assertFalse(game.board.crash)
+        self.assertEqual(game.crashes, 1)
+        self.assertEqual(game.current_player, 2)
+
+    def test_play_turn_winner(self):
+        """Test that playing the last penny wins the game."""
+        game = Game()
+        game.numplayers = 2
+        game.create_players()
+        game.current_player = 2
+        game.players[2].hand = 1
+        game.play_turn()
+        self.assertEqual(game.game_winner, 2)
+        self.assertTrue(game.players[2].is_winner)
+        self.assertEqual(game.current_player, 2)
+
+    def test_numbering_per_game(self):
+        """Test that every game numbers its own players from 1."""
+        for _ in range(2):
+            game = Game()
+            game.numplayers = 3
+            game.create_players()
+            self.assertEqual(
+                [player.player_number for player in game.players.values()], [1, 2, 3]
+            )
+
+    def test_reset(self):
+        """Test that a reset game reuses its objects and starts over."""
+        game = Game()
+        game.numplayers = 2
+        game.numcom = 2
+        game.create_players()
+        board, first = game.board, game.players[1]
+        game.current_player = 1
+        while not game.game_winner:
+            game.play_turn()
+        game.reset()
+        self.assertIs(game.board, board)
+        self.assertIs(game.players[1], first)
+        self.assertFalse(game.game_winner)
+        self.assertEqual((game.turns, game.crashes, game.current_player), (0, 0, 0))
+        self.assertTrue(all(player.hand == 20 for player in game.players.values()))
+        self.assertEqual(board.state, {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0})
+
+    def test_turn_in_steps(self):
+        """Test that playing turns one decision at a time matches play_turn."""
+        from penny_game.dice import DiceStream
+        from penny_game.metrics import GameMetrics
+        from penny_game.strategies import ThresholdStrategy
+        games = []
+        for _ in range(2):
+            game = Game(dice=DiceStream(21))
+            game.numplayers = 3
+            game.numcom = 3
+            game.create_players(strategies=[ThresholdStrategy(2)] * 3)
+            game.metrics = GameMetrics()
+            game.start(announce=False)
+            games.append(game)
+        whole, stepped = games
+        while not whole.game_winner:
+            whole.play_turn()
+        while not stepped.game_winner:
+            player = stepped.players[stepped.current_player]
+            deciding = stepped.begin_turn()
+            while deciding:
+                deciding = stepped.continue_turn(player.strategy(player, stepped.board, stepped))
+        self.assertEqual((whole.game_winner, whole.turns, whole.crashes),
+                         (stepped.game_winner, stepped.turns, stepped.crashes))
+        self.assertEqual([player.hand for player in whole.players.values()],
+                         [player.hand for player in stepped.players.values()])
+        counters = ("games", "wins", "turns", "rolls", "rerolls", "passes", "crashes",
+                    "pennies_picked_up")
+        self.assertEqual([getattr(whole.metrics, name) for name in counters],
+                         [getattr(stepped.metrics, name) for name in counters])
+        self.assertEqual(stepped.metrics.turns, stepped.turns)
+        self.assertEqual(stepped.metrics.turn_rolls.counts, whole.metrics.turn_rolls.counts)
+
 if __name__ == "__main__":
     unittest.main()
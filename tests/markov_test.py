@@ -0,0 +1,117 @@
+# markov_test.py
+# This file lets me see if the exact Markov-chain analysis is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from penny_game.bitmask_board import BitmaskBoard
+from penny_game.dice import DiceStream
+from penny_game.game import Game
+from penny_game.metrics import GameMetrics
+from penny_game.rules import Rules
+from penny_game.simulation import simulate_game
+from penny_game.strategies import build_strategy
+
+if np is not None:
+    from penny_game.markov import analyze
+
+
+def play(num_players, specs, starting_hand, games, seed=0):
+    """Plays games with a small starting hand and returns (turns, first mover won, crashes)."""
+    game = Game(board=BitmaskBoard(), dice=DiceStream(seed))
+    game.numplayers = num_players
+    game.numcom = num_players
+    game.create_players(strategies=[build_strategy(spec) for spec in specs])
+    records = []
+    for index in range(games):
+        game.reset(DiceStream(seed).child(index))
+        for player in game.players.values():
+            player.hand = starting_hand
+        first = game.start(announce=False)
+        while not game.game_winner:
+            game.play_turn()
+        records.append((game.turns, game.game_winner == first, game.game_winner, game.crashes))
+    return records
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestMarkovAnalysis(unittest.TestCase):
+
+    def test_probabilities_add_up(self):
+        """Test that every distribution sums to one."""
+        analysis = analyze(3, "legacy", starting_hand=6)
+        self.assertAlmostEqual(analysis.length.sum() + analysis.unfinished, 1.0, places=10)
+        self.assertAlmostEqual(analysis.win_by_position.sum(), analysis.length.sum(), places=12)
+        self.assertAlmostEqual(analysis.win_by_seat.sum(), analysis.length.sum(), places=12)
+        self.assertAlmostEqual(analysis.pickup.sum(), 1.0, places=12)
+        self.assertLess(analysis.unfinished, 1e-12)
+
+    def test_one_penny(self):
+        """Test that with one penny each the first roll always wins."""
+        analysis = analyze(2, starting_hand=1)
+        self.assertAlmostEqual(analysis.length[1], 1.0)
+        self.assertAlmostEqual(analysis.win_by_position[0], 1.0)
+        self.assertEqual(analysis.expected_crashes, 0.0)
+
+    def test_matches_simulation(self):
+        """Test that exact answers agree with thousands of simulated games."""
+        analysis = analyze(2, "threshold", starting_hand=5)
+        records = play(2, ["threshold"] * 2, 5, 6000)
+        turns = np.array([record[0] for record in records])
+        first_won = np.array([record[1] for record in records])
+        crashes = np.array([record[3] for record in records])
+        self.assertLess(abs(turns.mean() - analysis.expected_turns), 4 * turns.std() / 6000 ** 0.5)
+        self.assertLess(abs(first_won.mean() - analysis.win_by_position[0]), 4 * 0.5 / 6000 ** 0.5)
+        self.assertLess(abs(crashes.mean() - analysis.expected_crashes),
+                        4 * crashes.std() / 6000 ** 0.5)
+
+    def test_pickup_matches_simulation(self):
+        """Test the pennies picked up per crash against simulated games."""
+        analysis = analyze(2, "threshold", starting_hand=10)
+        metrics = GameMetrics()
+        rules = Rules(starting_hand=10)
+        strategies = [build_strategy("threshold")] * 2
+        for seed in range(3000):
+            simulate_game(2, seed=seed, strategies=strategies, metrics=metrics, rules=rules)
+        self.assertEqual(len(analysis.pickup), 7)
+        self.assertEqual(analysis.pickup[0], 0.0)
+        mean = metrics.pennies_picked_up / metrics.crashes
+        self.assertLess(abs(mean - analysis.expected_pickup), 0.05)
+
+    def test_mixed_strategies(self):
+        """Test per-seat strategies against simulation, seat by seat."""
+        specs = ["threshold", ("random", {"chance": 0.9})]
+        analysis = analyze(2, specs, starting_hand=5)
+        records = play(2, specs, 5, 6000, seed=1)
+        seat_one = np.mean([record[2] == 1 for record in records])
+        self.assertLess(abs(seat_one - analysis.win_by_seat[0]), 4 * 0.5 / 6000 ** 0.5)
+        self.assertGreater(analysis.win_by_seat[0], analysis.win_by_seat[1])
+
+    def test_memoized(self):
+        """Test that the same rules are only analyzed once."""
+        self.assertIs(analyze(2, "bust", starting_hand=4), analyze(2, "bust", starting_hand=4))
+        self.assertIsNot(analyze(2, "bust", starting_hand=4),
+                         analyze(2, ("bust", {"max_risk": 0.5}), starting_hand=4))
+
+    def test_invalid(self):
+        """Test that impossible requests raise a ValueError."""
+        with self.assertRaises(ValueError):
+            analyze(0)
+        with self.assertRaises(ValueError):
+            analyze(3, ["threshold", "legacy"], starting_hand=3)
+        with self.assertRaises(ValueError):
+            analyze(2, "mcts", starting_hand=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# mcts_test.py
+# This file lets me see if the Monte Carlo tree search COM player is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.mcts import PASS_VISITS, REROLL_VISITS, MCTSStrategy
+from penny_game.rules import DEFAULT_RULES
+from penny_game.simulation import simulate_game
+from penny_game.strategies import build_strategy, get_strategy
+
+
+def visits(node):
+    """Returns how many searches passed through a table entry."""
+    return node[REROLL_VISITS] + node[PASS_VISITS]
+
+
+class TestMCTSStrategy(unittest.TestCase):
+
+    def test_budget(self):
+        """Test that a decision stops searching once its time is up."""
+        strategy = MCTSStrategy(budget=0.002)
+        start = time.perf_counter()
+        strategy.should_reroll(0b11, [20, 20, 20], 0, DEFAULT_RULES, 1)
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertGreater(strategy.last_iterations, 0)
+
+    def test_clear_decisions(self):
+        """Test that the search finds the decisions any player would make."""
+        strategy = MCTSStrategy(budget=None, iterations=300)
+        # One penny left and an empty board: rolling wins unless it lands in a full slot
+        self.assertTrue(strategy.should_reroll(0, [1, 15], 0, DEFAULT_RULES, 1))
+        # Slots 1-5 full: five rolls in six crash and pick up six pennies
+        self.assertFalse(strategy.should_reroll(0b11111, [10, 10], 0, DEFAULT_RULES, 1))
+
+    def test_reuse_in_turn(self):
+        """Test that the next decision of a turn starts from the statistics already gathered."""
+        strategy = MCTSStrategy(budget=None, iterations=200)
+        strategy.should_reroll(0, [10, 10], 0, DEFAULT_RULES, 1)
+        self.assertEqual(visits(strategy.table[(0, (10, 10), 0)]), 200)
+        after_reroll = [key for key, node in strategy.table.items()
+                        if key[1] == (9, 10) and key[2] == 0 and visits(node) > 1]
+        self.assertTrue(after_reroll)
+        key = after_reroll[0]
+        before = visits(strategy.table[key])
+        strategy.should_reroll(key[0], key[1], 0, DEFAULT_RULES, 2)
+        self.assertEqual(visits(strategy.table[key]), before + 200)
+
+    def test_lru_table(self):
+        """Test that the table stays within its size and keeps the states in use."""
+        strategy = MCTSStrategy(budget=None, iterations=100, table_size=50)
+        strategy.should_reroll(0, [10, 10], 0, DEFAULT_RULES, 1)
+        self.assertEqual(len(strategy.table), 50)
+        self.assertIn((0, (10, 10), 0), strategy.table)
+
+    def test_reproducible_and_strong(self):
+        """Test that a capped search replays from the game seed and beats the random COM."""
+        wins = 0
+        for seed in range(20):
+            seat = seed % 2
+            results = []
+            for _ in range(2):
+                strategies = [build_strategy("random"), build_strategy("random")]
+                strategies[seat] = get_strategy("mcts", budget=None, iterations=100)
+                results.append(simulate_game(2, seed=seed, strategies=strategies,
+                                             rules="legacy"))
+            self.assertEqual(results[0].hands, results[1].hands)
+            self.assertEqual(results[0].turns, results[1].turns)
+            wins += results[0].winner == seat + 1
+        self.assertGreaterEqual(wins, 14)
+
+    def test_invalid(self):
+        """Test that a search needs some limit and room in its table."""
+        with self.assertRaises(ValueError):
+            MCTSStrategy(budget=None)
+        with self.assertRaises(ValueError):
+            MCTSStrategy(table_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
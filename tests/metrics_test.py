@@ -0,0 +1,121 @@
+# metrics_test.py
+# This file lets me see if the gameplay metrics are working properly.
+
+# Created: 10/18/26
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.bitmask_board import BitmaskBoard
+from penny_game.game_board import GameBoard
+from penny_game.metrics import GameMetrics, Histogram
+from penny_game.rules import Rules
+from penny_game.simulation import simulate_game
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_buckets(self):
+        """Test that values land in the first bucket whose bound they do not exceed."""
+        histogram = Histogram((1, 5))
+        for value in (0, 1, 2, 5, 9):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 2, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.mean(), 17 / 5)
+
+    def test_merge_needs_same_bounds(self):
+        """Test that histograms with different buckets cannot be merged."""
+        with self.assertRaises(ValueError):
+            Histogram((1, 2)).merge(Histogram((1, 3)))
+
+
+class TestGameMetrics(unittest.TestCase):
+
+    def test_counts_match_game(self):
+        """Test that the counters agree with the results of the games played."""
+        metrics = GameMetrics()
+        results = [simulate_game(3, seed=seed, metrics=metrics) for seed in range(20)]
+        self.assertEqual(metrics.games, 20)
+        self.assertEqual(metrics.wins, 20)
+        self.assertEqual(metrics.turns, sum(result.turns for result in results))
+        self.assertEqual(metrics.crashes, sum(result.crashes for result in results))
+        self.assertEqual(metrics.turn_rolls.total, metrics.rolls)
+        self.assertEqual(metrics.rolls, metrics.turns + metrics.rerolls)
+        self.assertEqual(metrics.game_turns.total, metrics.turns)
+        self.assertGreater(metrics.slot6_resets, 0)
+        self.assertGreater(metrics.phase_seconds["roll"], 0)
+        # Every turn ends with a pass, a crash or a win
+        self.assertEqual(metrics.passes + metrics.crashes + metrics.wins, metrics.turns)
+
+    def test_metrics_do_not_change_games(self):
+        """Test that measuring a game does not change how it is played."""
+        plain = simulate_game(4, seed=9)
+        metrics = GameMetrics()
+        measured = simulate_game(4, seed=9, metrics=metrics)
+        self.assertEqual((plain.turns, plain.hands), (measured.turns, measured.hands))
+        # A later game without metrics does not report to the old ones
+        simulate_game(4, seed=10)
+        self.assertEqual(metrics.games, 1)
+
+    def test_both_boards_count_slot6_resets(self):
+        """Test that a penny swept off slot 6 is counted on either board."""
+        for board_class in (GameBoard, BitmaskBoard):
+            board = board_class()
+            board.metrics = GameMetrics()
+            for slot in (6, 1, 6, 6):
+                board.add_penny(slot)
+            self.assertEqual(board.metrics.slot6_resets, 2)
+            self.assertEqual(board.metrics.pennies, [1, 0, 0, 0, 0, 3])
+
+    def test_metrics_sized_to_rules(self):
+        """Test that metrics count every slot of a larger board, and refuse a second layout."""
+        metrics = GameMetrics()
+        simulate_game(2, seed=1, metrics=metrics, rules=Rules(slots=8))
+        self.assertEqual(len(metrics.pennies), 8)
+        self.assertEqual(sum(metrics.pennies), metrics.rolls)
+        six = GameMetrics()
+        simulate_game(2, seed=1, metrics=six)
+        with self.assertRaises(ValueError):
+            simulate_game(2, seed=1, metrics=six, rules=Rules(slots=8))
+
+    def test_merge(self):
+        """Test that merging adds up two sets of metrics."""
+        first, second, both = GameMetrics(), GameMetrics(), GameMetrics()
+        simulate_game(2, seed=1, metrics=first)
+        simulate_game(2, seed=2, metrics=second)
+        simulate_game(2, seed=1, metrics=both)
+        simulate_game(2, seed=2, metrics=both)
+        first.merge(second)
+        merged, expected = first.to_dict(), both.to_dict()
+        for timed in ("phase_seconds", "turn_seconds"):
+            del merged[timed], expected[timed]
+        self.assertEqual(merged, expected)
+
+    def test_export(self):
+        """Test writing the metrics as JSON and as Prometheus text."""
+        metrics = GameMetrics()
+        simulate_game(2, seed=3, metrics=metrics)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "metrics.json")
+            prom_path = os.path.join(directory, "metrics.prom")
+            metrics.write(json_path)
+            metrics.write(prom_path)
+            with open(json_path) as file:
+                data = json.load(file)
+            with open(prom_path) as file:
+                text = file.read()
+            self.assertEqual(sorted(os.listdir(directory)), ["metrics.json", "metrics.prom"])
+        self.assertEqual(data["turns"], metrics.turns)
+        self.assertIn(f"penny_game_turns_total {metrics.turns}", text)
+        self.assertIn('penny_game_pennies_total{slot="6"}', text)
+        self.assertIn(f'penny_game_turn_rolls_bucket{{le="+Inf"}} {metrics.turns}', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,7 +15,7 @@ from unittest.mock import patch
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
 
-from player import Player
+from penny_game.player import Player
 
 
 
@@ -39,9 +39,8 @@ class BasePlayerTest(unittest.TestCase):
 
     def setUp(self):
         """Shared setup code for initializing human and computer players."""
-        Player.player_number = 0  # Reset static variable before each test
-        self.human_player = Player(is_human=True)  # Initialize a human player
-        self.com_player = Player(is_human=False)  # Initialize a computer player
+        self.human_player = Player(is_human=True, player_number=1)  # Initialize a human player
+        self.com_player = Player(is_human=False, player_number=2)  # Initialize a computer player
 
 
 class TestPlayerCreation(BasePlayerTest):
@@ -88,6 +87,29 @@ class TestPlayerCreation(BasePlayerTest):
         )
 
 
+class TestPlayerReset(BasePlayerTest):
+    """
+    Test suite for verifying that players can be reused.
+    """
+
+    def test_reset(self):
+        """
+        Test that reset restores the starting hand and clears the win flag.
+        """
+        self.com_player.hand = 0
+        self.com_player.is_winner = True
+        self.com_player.reset()
+        self.assertEqual(self.com_player.hand, 20)
+        self.assertFalse(self.com_player.is_winner)
+        self.assertEqual(self.com_player.player_number, 2)
+
+    def test_slots(self):
+        """
+        Test that players do not carry a per-instance dictionary.
+        """
+        self.assertFalse(hasattr(self.human_player, "__dict__"))
+
+
 class TestDiceRoll(BasePlayerTest):
     """
     Test suite for verifying dice rolls.
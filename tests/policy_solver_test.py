@@ -0,0 +1,102 @@
+# policy_solver_test.py
+# This file lets me see if the optimal reroll solver is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import tempfile
+import unittest
+from itertools import product
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.game import Game
+from penny_game.policy_solver import (OptimalPolicy, _index, _rank_table, load_policy,
+                                      solve_policy, table_entries)
+from penny_game.simulation import simulate_game
+
+
+class TestSolvePolicy(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.policy = solve_policy(num_players=2, starting_hand=6)
+
+    def test_empty_board_rerolls(self):
+        """Test that rolling again on an empty board is always worth it."""
+        for hand in range(1, 7):
+            self.assertTrue(self.policy.should_reroll(0, (hand, 6)))
+
+    def test_full_board_passes(self):
+        """Test that a player with pennies to spare passes on a nearly full board."""
+        self.assertFalse(self.policy.should_reroll(0b11111, (4, 3)))
+
+    def test_slot_six_is_ignored(self):
+        """Test that the slot 6 bit does not change the decision."""
+        self.assertEqual(
+            self.policy.should_reroll(0b101, (3, 4)),
+            self.policy.should_reroll(0b100101, (3, 4)),
+        )
+
+    def test_plays_as_a_strategy(self):
+        """Test that the policy can decide for every seat of a game with its rules."""
+        game = Game()
+        game.numplayers = 2
+        game.create_players()
+        for player in game.players.values():
+            player.hand = 6
+        game.current_player = 1
+        while not game.game_winner:
+            game.play_turn(self.policy)
+        self.assertEqual(game.players[game.game_winner].hand, 0)
+
+    def test_too_many_pennies(self):
+        """Test that the policy refuses games with more pennies than it was solved for."""
+        with self.assertRaises(ValueError):
+            simulate_game(2, seed=4, strategies=[self.policy, None])
+
+    def test_wrong_player_count(self):
+        """Test that the policy refuses to decide for a game of another size."""
+        game = Game()
+        game.numplayers = 3
+        game.create_players()
+        game.current_player = 1
+        with self.assertRaises(ValueError):
+            self.policy(game.players[1], game.board, game)
+
+    def test_bad_table(self):
+        """Test that a table of the wrong size raises a ValueError."""
+        with self.assertRaises(ValueError):
+            OptimalPolicy(2, 6, b"\x00" * 10)
+
+    def test_compact_table(self):
+        """Test that every reachable set of hands has its own entry and no more are kept."""
+        self.assertEqual(len(self.policy.table), table_entries(2, 6))
+        ranks = _rank_table(3, 9)
+        positions = sorted(_index(0, hands, ranks) for hands in product(range(1, 10), repeat=3)
+                           if sum(hands) <= 9)
+        self.assertEqual(positions, list(range(0, table_entries(3, 3), 32)))
+
+    def test_too_large(self):
+        """Test that a table too large to solve is refused before anything is allocated."""
+        with self.assertRaises(ValueError):
+            solve_policy(num_players=5, starting_hand=20)
+
+
+class TestPolicyCache(unittest.TestCase):
+
+    def test_cache_round_trip(self):
+        """Test that a cached table loads back identical without re-solving."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            solved = load_policy(2, 4, cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            cached = load_policy(2, 4, cache_dir=cache_dir)
+            self.assertEqual(solved.table, cached.table)
+            other = load_policy(2, 3, cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            self.assertNotEqual(len(other.table), len(solved.table))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# replay_test.py
+# This file lets me see if deterministic game replay is working properly.
+
+# Created: 10/18/26
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+sys.path.insert(0, SRC)
+
+from penny_game.bitmask_board import BitmaskBoard
+from penny_game.replay import GameRecord, replay
+from penny_game.simulation import simulate_game
+from penny_game.strategies import ThresholdStrategy, get_strategy
+
+
+class TestReplay(unittest.TestCase):
+
+    def record_game(self, seed, com_strategy=None):
+        """Plays a game with two recorded human seats and one COM seat."""
+        record = GameRecord(seed, num_players=3, num_com=1, strategies=[com_strategy])
+        result = simulate_game(3, num_com=1, seed=seed, strategies=[
+            record.recorder(ThresholdStrategy(2)), record.recorder(ThresholdStrategy(3)),
+            get_strategy(com_strategy[0], **com_strategy[1]) if com_strategy else None,
+        ])
+        return record, result
+
+    def test_replay_matches_original(self):
+        """Test that a replayed game ends exactly as the recorded one did."""
+        record, result = self.record_game(11)
+        game = replay(record)
+        self.assertEqual(game.game_winner, result.winner)
+        self.assertEqual(game.turns, result.turns)
+        self.assertEqual(game.crashes, result.crashes)
+        self.assertEqual(tuple(player.hand for player in game.players.values()), result.hands)
+
+    def test_fast_forward(self):
+        """Test that stopping at turn N gives the same state as playing N turns by hand."""
+        record, result = self.record_game(3)
+        turn = result.turns // 2
+        stopped = replay(record, turn=turn)
+        full = replay(record, board=BitmaskBoard())
+        self.assertEqual(stopped.turns, turn)
+        self.assertFalse(stopped.game_winner)
+        # Carrying on from the stopped game reaches the same ending
+        while not stopped.game_winner:
+            stopped.play_turn()
+        self.assertEqual(stopped.turns, full.turns)
+        self.assertEqual(stopped.board.state, full.board.state)
+        for number, player in stopped.players.items():
+            self.assertEqual(player.hand, full.players[number].hand)
+            self.assertEqual(player.dice.tell(), full.players[number].dice.tell())
+
+    def test_save_and_load(self):
+        """Test that a record survives a round trip through JSON."""
+        record, result = self.record_game(5, ("legacy", {"factor": 0.2}))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.json")
+            record.save(path)
+            loaded = GameRecord.load(path)
+        self.assertEqual(loaded.to_dict(), record.to_dict())
+        self.assertEqual(replay(loaded).turns, result.turns)
+
+    def test_missing_decisions(self):
+        """Test that a record without enough human decisions is reported."""
+        record, _ = self.record_game(8)
+        record.decisions = record.decisions[:1]
+        with self.assertRaises(ValueError):
+            replay(record)
+
+    def test_interactive_game_replays(self):
+        """Test that a game played with `python -m penny_game play` can be replayed from its record."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.json")
+            answers = "\n2\n1\n" + "n\n" * 2000 # One human who never rerolls
+            output = subprocess.run(
+                [sys.executable, "-m", "penny_game", "play"], cwd=SRC, input=answers, capture_output=True,
+                text=True, env=dict(os.environ, PENNY_GAME_RECORD=path), timeout=60,
+            ).stdout
+            record = GameRecord.load(path)
+        self.assertNotIn(True, record.decisions)
+        game = replay(record)
+        scores = output.split("------------")[1].split("Game record")[0].split()
+        final = {int(scores[i]): int(scores[i + 2]) for i in range(0, len(scores), 3)}
+        self.assertEqual(final, {number: player.hand for number, player in game.players.items()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+# rules_test.py
+# This file lets me see if the rule variants are working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.bitmask_board import BitmaskBoard
+from penny_game.dice import DiceStream
+from penny_game.game import Game
+from penny_game.game_board import GameBoard
+from penny_game.metrics import GameMetrics
+from penny_game.player import Player
+from penny_game.replay import GameRecord, replay
+from penny_game.rules import DEFAULT_RULES, Rules, get_rules
+from penny_game.simulation import simulate_game
+from penny_game.snapshot import restore, snapshot
+from penny_game.strategies import BustProbabilityStrategy, ThresholdStrategy
+
+
+class TestRules(unittest.TestCase):
+
+    def test_standard_tables(self):
+        """Test the lookup tables of the standard rules."""
+        rules = Rules()
+        self.assertEqual(rules, DEFAULT_RULES)
+        self.assertEqual(rules.free_bit, 32)
+        self.assertEqual(rules.crash_mask, 0x1F)
+        self.assertEqual(rules.popcount[0b101101], 4)
+        self.assertEqual(rules.bust[0], 0.0)
+        self.assertAlmostEqual(rules.bust[0b100011], 2 / 6) # Slot 6 never crashes
+        self.assertAlmostEqual(rules.bust[0b011111], 5 / 6)
+
+    def test_variant_tables(self):
+        """Test tables for more slots, a smaller die and no free slot."""
+        rules = Rules(slots=8, die_faces=4, free_slot=0)
+        self.assertEqual(rules.free_bit, 0)
+        self.assertEqual(rules.crash_mask, 0xFF)
+        self.assertEqual(len(rules.popcount), 256)
+        self.assertAlmostEqual(rules.bust[0b11110011], 2 / 4) # Only faces 1-4 land
+        self.assertIs(rules.bust, Rules(slots=8, starting_hand=5, die_faces=4, free_slot=0).bust)
+
+    def test_invalid(self):
+        """Test that impossible rules raise a ValueError."""
+        for params in ({"slots": 0}, {"slots": 1}, {"slots": 9}, {"starting_hand": 0},
+                       {"die_faces": 1}, {"die_faces": 7}, {"free_slot": 7}):
+            with self.assertRaises(ValueError):
+                Rules(**params)
+        with self.assertRaises(ValueError):
+            get_rules("chess")
+
+    def test_get_rules(self):
+        """Test building rules from names, dictionaries and objects."""
+        self.assertIs(get_rules(None), DEFAULT_RULES)
+        self.assertEqual(get_rules("legacy").starting_hand, 10)
+        variant = Rules(slots=4, starting_hand=7)
+        self.assertIs(get_rules(variant), variant)
+        self.assertEqual(get_rules(variant.to_dict()), variant)
+        self.assertEqual(len({variant, Rules(slots=4, starting_hand=7)}), 1)
+
+
+class TestRuleVariants(unittest.TestCase):
+
+    def test_boards(self):
+        """Test that both boards follow the slots and free slot of their rules."""
+        rules = Rules(slots=4, free_slot=0)
+        for board_class in (GameBoard, BitmaskBoard):
+            board = board_class(rules=rules)
+            self.assertEqual(board.state, {1: 0, 2: 0, 3: 0, 4: 0})
+            board.add_penny(4)
+            board.add_penny(1)
+            self.assertEqual(board.occupancy, 0b1001) # Slot 4 does not empty itself
+            board.add_penny(4)
+            self.assertTrue(board.crash)
+            self.assertEqual(board.clear_board(), 3)
+            with self.assertRaises(ValueError):
+                board.add_penny(5)
+
+    def test_free_slot_moves(self):
+        """Test a free slot other than the last one."""
+        for board_class in (GameBoard, BitmaskBoard):
+            board = board_class(rules=Rules(free_slot=2))
+            for slot in (2, 6, 2):
+                board.add_penny(slot)
+            self.assertFalse(board.crash)
+            board.add_penny(6)
+            self.assertTrue(board.crash)
+
+    def test_players_and_game(self):
+        """Test that the game hands its rules to its board, players and dice."""
+        rules = get_rules("legacy")
+        self.assertEqual(Player(rules=rules).hand, 10)
+        game = Game(rules=rules, dice=DiceStream(1))
+        game.numplayers = game.numcom = 3
+        game.create_players()
+        self.assertIs(game.board.rules, rules)
+        self.assertEqual([player.hand for player in game.players.values()], [10] * 3)
+        game.players[1].hand = 0
+        game.reset()
+        self.assertEqual(game.players[1].hand, 10)
+
+    def test_mismatches(self):
+        """Test that a game refuses a board or dice that break its rules."""
+        with self.assertRaises(ValueError):
+            Game(board=GameBoard(), rules=Rules(slots=5))
+        with self.assertRaises(ValueError):
+            Game(rules=Rules(slots=8), dice=DiceStream(1))
+        game = Game(rules=Rules(slots=8))
+        self.assertEqual(game.dice.faces, 8)
+        self.assertIs(Game(board=BitmaskBoard(rules=Rules(slots=5))).rules.slots, 5)
+
+    def test_simulate_variants(self):
+        """Test that variant games play to the end, reproducibly."""
+        for rules in ("legacy", Rules(slots=8), Rules(slots=4, die_faces=3, free_slot=0),
+                      Rules(slots=2)):
+            rules = get_rules(rules)
+            metrics = GameMetrics(slots=rules.slots)
+            result = simulate_game(3, seed=4, strategies=[ThresholdStrategy(2)] * 3,
+                                   rules=rules, metrics=metrics)
+            self.assertIsNotNone(result.winner)
+            self.assertEqual(result.hands, simulate_game(
+                3, seed=4, strategies=[ThresholdStrategy(2)] * 3, rules=rules).hands)
+            self.assertEqual(metrics.rolls, metrics.turns + metrics.rerolls)
+        self.assertNotEqual(simulate_game(2, seed=4).turns,
+                            simulate_game(2, seed=4, rules="legacy").turns)
+
+    def test_strategies_per_rules(self):
+        """Test that strategies decide from the rules of the board they play on."""
+        strategy = BustProbabilityStrategy(max_risk=0.3)
+        player = Player(dice=DiceStream(0))
+        standard = BitmaskBoard()
+        standard.mask = 0b11 # 2 of 6 faces crash
+        wide = BitmaskBoard(rules=Rules(slots=8))
+        wide.mask = 0b11 # 2 of 8 faces crash
+        self.assertFalse(strategy(player, standard))
+        self.assertTrue(strategy(player, wide))
+        self.assertFalse(strategy(player, standard))
+
+    def test_replay_and_snapshot(self):
+        """Test that records and snapshots carry variant games exactly."""
+        rules = Rules(slots=7, starting_hand=8)
+        record = GameRecord(5, 2, 2, ["threshold", "bust"], rules=rules)
+        restored = GameRecord.from_dict(record.to_dict())
+        self.assertEqual(restored.rules, rules)
+        self.assertNotIn("rules", GameRecord(5, 2, 2).to_dict())
+        finished = replay(restored)
+        halfway = replay(restored, turn=finished.turns // 2)
+        game = restore(snapshot(halfway), strategies=[ThresholdStrategy(2)] * 2,
+                       board=BitmaskBoard(rules=rules))
+        self.assertEqual(game.board.occupancy, halfway.board.occupancy)
+        self.assertEqual(game.dice.faces, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+# sequential_test.py
+# This file lets me see if the early-stopping scheduler is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.sequential import Done, run_until_decided
+
+
+def _square(value):
+    return value * value
+
+
+class TestRunUntilDecided(unittest.TestCase):
+
+    def run_units(self, queues, limit, workers):
+        finished = []
+        totals = [0] * len(queues)
+
+        def finish(unit, index, result, played):
+            finished.append((unit, index, result, played))
+            totals[unit] += result
+
+        def decided(unit):
+            return totals[unit] >= limit
+
+        counts = run_until_decided(queues, _square, finish, decided, workers)
+        return counts, totals, finished
+
+    def test_stops_each_unit(self):
+        """Test that each unit stops at the first result that decides it."""
+        queues = [[(1,), (2,), (3,), (4,)], [(5,), (1,)], [(1,), (1,)]]
+        counts, totals, finished = self.run_units(queues, 5, workers=1)
+        self.assertEqual(counts, [2, 1, 2])
+        self.assertEqual(totals, [5, 25, 2])
+        # Units take turns, so no unit waits for another to finish
+        self.assertEqual([unit for unit, _, _, _ in finished[:3]], [0, 1, 2])
+
+    def test_done_jobs(self):
+        """Test that known results are finished in order without being played."""
+        queues = [[Done(9), (2,), Done(16)]]
+        counts, totals, finished = self.run_units(queues, 100, workers=1)
+        self.assertEqual(counts, [3])
+        self.assertEqual([(index, played) for _, index, _, played in finished],
+                         [(0, False), (1, True), (2, False)])
+
+    def test_workers_match_one_process(self):
+        """Test that worker processes stop every unit at the same job."""
+        queues = [[(value,) for value in range(1, 30)], [(2,)] * 40, [Done(1), (3,), (1,)]]
+        alone = self.run_units(queues, 50, workers=1)
+        pooled = self.run_units(queues, 50, workers=2)
+        self.assertEqual(alone[:2], pooled[:2])
+        self.assertEqual(sorted(alone[2]), sorted(pooled[2]))
+
+    def test_without_decision(self):
+        """Test that every job is played when nothing decides the units."""
+        counts = run_until_decided([[(2,), (3,)], []], _square, lambda *args: None)
+        self.assertEqual(counts, [2, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
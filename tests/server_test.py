@@ -0,0 +1,169 @@
+# server_test.py
+# This file lets me see if the asyncio game server is working properly.
+
+# Created: 10/18/26
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.replay import GameRecord, replay
+from penny_game.server import GameServer, run_load
+
+
+async def send(writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def receive(reader):
+    return json.loads(await reader.readline())
+
+
+class TestGameServer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "penny.sock")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def serve(self, client):
+        """Runs `client(server)` against a server on a Unix socket."""
+        async def run():
+            server = await GameServer(path=self.path).start()
+            try:
+                return await client(server)
+            finally:
+                await server.close()
+        return asyncio.run(run())
+
+    def test_game_replays(self):
+        """Test that a served game can be replayed from its seed and the client's answers."""
+        async def client(server):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            await send(writer, {"op": "new", "players": 3, "seed": 17, "strategy": "legacy"})
+            answers = []
+            while True:
+                message = await receive(reader)
+                if message["event"] == "decide":
+                    answers.append(message["board"] & 0x1F == 0)
+                    await send(writer, {"reroll": answers[-1]})
+                elif message["event"] == "end":
+                    writer.close()
+                    return message, answers, server.games_played
+
+        end, answers, played = self.serve(client)
+        self.assertEqual(played, 1)
+        game = replay(GameRecord(17, 3, 2, ["legacy", "legacy"], answers))
+        self.assertEqual(end["winner"], game.game_winner)
+        self.assertEqual(end["turns"], game.turns)
+        self.assertEqual(end["hands"], [player.hand for player in game.players.values()])
+
+    def test_bad_requests(self):
+        """Test that bad requests get an error and the connection stays usable."""
+        async def client(server):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            await send(writer, {"op": "join"})
+            first = await receive(reader)
+            await send(writer, {"op": "new", "players": 9})
+            second = await receive(reader)
+            await send(writer, {"op": "new", "players": 2, "seed": 1})
+            start = await receive(reader)
+            writer.close()
+            return first, second, start
+
+        first, second, start = self.serve(client)
+        self.assertEqual(first["event"], "error")
+        self.assertIn("players", second["message"])
+        self.assertEqual(start["event"], "start")
+
+    def test_messages_not_objects(self):
+        """Test that JSON values other than objects get an error, not a dropped connection."""
+        async def client(server):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            replies = []
+            for message in ([1], "new"):
+                await send(writer, message)
+                replies.append(await receive(reader))
+            await send(writer, {"op": "new", "players": 2, "seed": 3})
+            message = await receive(reader)
+            while message["event"] != "decide":
+                message = await receive(reader)
+            await send(writer, [True])
+            replies.append(await receive(reader))
+            writer.close()
+            return replies
+
+        for reply in self.serve(client):
+            self.assertEqual(reply["event"], "error")
+
+    def test_strategy_allow_list(self):
+        """Test that clients can only pick the strategies the server offers."""
+        async def client(server):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            replies = []
+            for strategy in (["mcts", {"budget": 10, "table_size": 10 ** 8}], "no_such", "bust"):
+                await send(writer, {"op": "new", "players": 2, "seed": 1, "strategy": strategy})
+                replies.append(await receive(reader))
+            writer.close()
+            return replies, list(server._strategies)
+
+        replies, built = self.serve(client)
+        self.assertEqual([reply["event"] for reply in replies], ["error", "error", "start"])
+        self.assertIn("bust", replies[0]["message"])
+        self.assertNotIn("mcts", replies[0]["message"])
+        self.assertEqual(built, ["bust"])
+
+    def test_offered_strategy(self):
+        """Test that an operator can offer a strategy that is not offered by default."""
+        server = GameServer(path=self.path, strategies={"search": ("mcts", {"budget": 0.001})})
+        self.assertEqual(server._strategy("search").budget, 0.001)
+        with self.assertRaises(ValueError):
+            server._strategy("threshold")
+
+    def test_malformed_bytes(self):
+        """Test that bad UTF-8, bad JSON and overlong lines get an error and the connection lives."""
+        async def client(server):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            replies = []
+            for line in (b'{"op":"\xff"}\n', b"{not json\n", b"[" * (1 << 17) + b"\n"):
+                writer.write(line)
+                await writer.drain()
+                replies.append(await receive(reader))
+            await send(writer, {"op": "new", "players": 2, "seed": 1})
+            # The rest of an overlong line may arrive late and earn errors of its own
+            replies.append(await receive(reader))
+            while replies[-1]["event"] == "error":
+                replies.append(await receive(reader))
+            writer.close()
+            return replies
+
+        replies = self.serve(client)
+        self.assertEqual([reply["event"] for reply in replies[:3]], ["error"] * 3)
+        self.assertEqual(replies[-1]["event"], "start")
+
+    def test_many_tables(self):
+        """Test that the load generator can play many tables at once."""
+        async def client(server):
+            report = await run_load(200, games=2, players=4, path=self.path)
+            for _ in range(100): # Let the server notice the last clients leaving
+                if not server.tables:
+                    break
+                await asyncio.sleep(0.01)
+            return report, server.games_played, server.tables
+
+        report, played, tables = self.serve(client)
+        self.assertEqual(played, 400)
+        self.assertEqual(tables, 0)
+        self.assertGreater(report["messages"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# simulation_test.py
+# This file lets me see if the headless simulation engine is working properly.
+
+# Created: 10/18/26
+
+import io
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.dice import DiceStream
+from penny_game.simulation import GamePool, GameResult, simulate_game
+
+
+class TestSimulateGame(unittest.TestCase):
+
+    def test_game_has_a_winner(self):
+        """Test that a simulated game ends with a winner who has no pennies left."""
+        result = simulate_game(3, seed=7)
+        self.assertIsInstance(result, GameResult)
+        self.assertIn(result.winner, range(1, 4))
+        self.assertEqual(result.hands[result.winner - 1], 0)
+        self.assertGreater(result.turns, 0)
+
+    def test_same_seed_same_game(self):
+        """Test that a seed fully determines the game."""
+        first = simulate_game(4, seed=123)
+        second = simulate_game(4, seed=123)
+        self.assertEqual(
+            (first.winner, first.first_player, first.turns, first.crashes, first.hands),
+            (second.winner, second.first_player, second.turns, second.crashes, second.hands),
+        )
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_no_output(self, mock_stdout):
+        """Test that a simulated game never prints."""
+        simulate_game(5, seed=1)
+        self.assertEqual(mock_stdout.getvalue(), "")
+
+    def test_strategies_are_used(self):
+        """Test that the strategy is asked after each roll that does not crash."""
+        calls = []
+
+        def never(player, board, game):
+            calls.append(player.player_number)
+            return False
+
+        result = simulate_game(2, seed=3, strategies=[never, never], max_turns=4)
+        self.assertEqual(result.turns, 4)
+        self.assertTrue(calls)
+        self.assertLessEqual(len(calls), 4)
+
+    def test_human_needs_strategy(self):
+        """Test that human seats cannot be played headless without a strategy."""
+        with self.assertRaises(ValueError):
+            simulate_game(2, num_com=1, seed=1)
+        result = simulate_game(2, num_com=1, seed=1, strategies={1: lambda p, b, g: False})
+        self.assertIn(result.winner, (1, 2))
+
+    def test_invalid_sizes(self):
+        """Test that impossible player counts raise a ValueError."""
+        with self.assertRaises(ValueError):
+            simulate_game(0)
+        with self.assertRaises(ValueError):
+            simulate_game(2, num_com=3)
+
+
+class TestGamePool(unittest.TestCase):
+
+    def test_reuses_games(self):
+        """Test that a released game is reset and handed out again."""
+        pool = GamePool()
+        game = pool.acquire(3, 3, DiceStream(1))
+        game.players[2].hand = 4
+        game.turns = 9
+        pool.release(game)
+        again = pool.acquire(3, 3, DiceStream(2))
+        self.assertIs(again, game)
+        self.assertEqual(again.players[2].hand, 20)
+        self.assertEqual(again.turns, 0)
+        self.assertIsNot(pool.acquire(3, 3, DiceStream(3)), game)
+
+    def test_pooled_games_replay(self):
+        """Test that a reused game plays exactly like a fresh one."""
+        fresh = simulate_game(3, seed=77)
+        simulate_game(3, seed=78)
+        reused = simulate_game(3, seed=77)
+        self.assertEqual((fresh.turns, fresh.hands), (reused.turns, reused.hands))
+
+
+if __name__ == "__main__":
+    unittest.main()
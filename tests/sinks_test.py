@@ -0,0 +1,97 @@
+# sinks_test.py
+# This file lets me see if the output sinks are working properly.
+
+# Created: 10/18/26
+
+import io
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.dice import DiceStream
+from penny_game.game import Game
+from penny_game.sinks import BufferedSink, ConsoleSink, NullSink
+
+
+class Unprintable:
+    """A value that fails the test if anything tries to format it."""
+
+    def __format__(self, spec):
+        raise AssertionError("A message was formatted for a sink that drops it.")
+
+
+class CountingStream(io.StringIO):
+    """A stream that counts how many times it is written to."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def make_game(sink):
+    game = Game(sink=sink)
+    game.numplayers = 3
+    game.numcom = 3
+    game.create_players()
+    return game
+
+
+class TestSinks(unittest.TestCase):
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_console_prints_immediately(self, mock_stdout):
+        """Test that the console sink prints each message as it arrives."""
+        sink = ConsoleSink()
+        sink.emit("Player {} rolled a {}!", 2, 5)
+        self.assertEqual(mock_stdout.getvalue(), "Player 2 rolled a 5!\n")
+        sink.emit("{ not a template }")
+        self.assertEqual(mock_stdout.getvalue().splitlines()[-1], "{ not a template }")
+
+    def test_null_sink_never_formats(self):
+        """Test that the null sink drops messages without building them."""
+        NullSink().emit("Player {} rolled a {}!", Unprintable(), Unprintable())
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_silent_game(self, mock_stdout):
+        """Test that a game, its players and its board send nothing to the console."""
+        game = make_game(NullSink())
+        game.start(announce=True)
+        game.players[1].announce_hand()
+        game.board.add_penny(3)
+        game.board.print_board()
+        game.final_scores()
+        self.assertEqual(mock_stdout.getvalue(), "")
+
+    def test_buffered_sink_writes_in_blocks(self):
+        """Test that the buffered sink holds output until it has a large block."""
+        stream = CountingStream()
+        with BufferedSink(stream, buffer_size=1000) as sink:
+            for index in range(100):
+                sink.emit("line {}", index)
+            self.assertLessEqual(stream.writes, 1)
+        self.assertEqual(stream.getvalue().splitlines(), [f"line {index}" for index in range(100)])
+        self.assertLessEqual(stream.writes, 2)
+
+    def test_buffered_game_matches_console(self):
+        """Test that buffering a game's output does not change it."""
+        with patch("sys.stdout", new_callable=io.StringIO) as console:
+            game = make_game(ConsoleSink())
+            game.who_first(dice=DiceStream(4))
+            game.final_scores()
+        stream = io.StringIO()
+        with BufferedSink(stream) as sink:
+            game = make_game(sink)
+            game.who_first(dice=DiceStream(4))
+            game.final_scores()
+        self.assertEqual(stream.getvalue(), console.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# snapshot_test.py
+# This file lets me see if game snapshots are working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.bitmask_board import BitmaskBoard
+from penny_game.dice import DiceStream
+from penny_game.game import Game
+from penny_game.snapshot import VERSION, restore, snapshot
+from penny_game.strategies import ThresholdStrategy
+
+
+def make_game(num_players=3, seed=5, dice=None):
+    game = Game(board=BitmaskBoard(), dice=dice if dice is not None else DiceStream(seed))
+    game.numplayers = num_players
+    game.numcom = num_players
+    game.create_players()
+    game.start(announce=False)
+    return game
+
+
+def finish(game):
+    while not game.game_winner:
+        game.play_turn()
+    return (game.game_winner, game.turns, game.crashes,
+            [player.hand for player in game.players.values()])
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_restored_game_plays_on_identically(self):
+        """Test that a game restored between turns finishes exactly like the original."""
+        game = make_game()
+        for _ in range(15):
+            game.play_turn()
+        data = snapshot(game)
+        restored = restore(data)
+        self.assertEqual(restored.board.state, game.board.state)
+        self.assertEqual(restored.current_player, game.current_player)
+        self.assertEqual(finish(restored), finish(game))
+
+    def test_compact(self):
+        """Test that a snapshot takes only tens of bytes."""
+        game = make_game(num_players=2, seed=2 ** 64 - 1)
+        for _ in range(10):
+            game.play_turn()
+        self.assertLess(len(snapshot(game)), 40)
+        self.assertLess(len(snapshot(make_game(num_players=5))), 64)
+
+    def test_mid_turn(self):
+        """Test that a game waiting for a reroll decision can be restored and answered."""
+        strategy = ThresholdStrategy(3)
+        game = make_game(seed=11)
+        while not game.begin_turn():
+            pass
+        restored = restore(snapshot(game), board=BitmaskBoard())
+        self.assertTrue(restored.deciding)
+        for current in (game, restored):
+            player = current.players[current.current_player]
+            deciding = True
+            while deciding:
+                deciding = current.continue_turn(strategy(player, current.board, current))
+        self.assertEqual(finish(restored), finish(game))
+
+    def test_child_stream_and_negative_seed(self):
+        """Test games played from a child stream of a negative seed."""
+        game = make_game(dice=DiceStream(-42).child(3, 9))
+        for _ in range(5):
+            game.play_turn()
+        restored = restore(snapshot(game))
+        self.assertEqual((restored.dice.seed, restored.dice.path), (-42, (3, 9)))
+        self.assertEqual(finish(restored), finish(game))
+
+    def test_finished_game(self):
+        """Test that a won game keeps its winner."""
+        game = make_game()
+        finish(game)
+        restored = restore(snapshot(game))
+        self.assertEqual(restored.game_winner, game.game_winner)
+        self.assertTrue(restored.players[game.game_winner].is_winner)
+
+    def test_bad_data(self):
+        """Test that unreadable snapshots raise a ValueError."""
+        data = snapshot(make_game())
+        for bad in (b"", b"\x09" + data[1:], data[:-3], data[:-1] + b"\x80"):
+            with self.assertRaises(ValueError):
+                restore(bad)
+        with self.assertRaises(ValueError):
+            snapshot(make_game(dice=DiceStream("not a number")))
+
+    def test_truncated(self):
+        """Test that a snapshot cut off anywhere, even between values, raises a ValueError."""
+        data = snapshot(make_game())
+        for bad in (bytes([VERSION]), bytes([VERSION, 2]), bytes([VERSION, 2, 0])):
+            with self.assertRaisesRegex(ValueError, "truncated"):
+                restore(bad)
+        for end in range(1, len(data)):
+            with self.assertRaises(ValueError):
+                restore(data[:end])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+# stats_test.py
+# This file lets me see if the streaming statistics are working properly.
+
+# Created: 10/18/26
+
+import os
+import pickle
+import random
+import statistics
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from penny_game.simulation import simulate_game
+from penny_game.stats import (GameStats, QuantileSketch, RunningMoments, confidence_sequence,
+                              wilson_interval)
+
+if np is not None:
+    from penny_game.vector_sim import simulate_batch
+
+
+class TestRunningMoments(unittest.TestCase):
+
+    def test_matches_statistics(self):
+        """Test that the running mean and variance match the statistics module."""
+        values = [random.Random(1).gauss(50, 10) for _ in range(1000)]
+        moments = RunningMoments()
+        for value in values:
+            moments.add(value)
+        self.assertAlmostEqual(moments.mean, statistics.fmean(values))
+        self.assertAlmostEqual(moments.variance, statistics.variance(values))
+        self.assertEqual((moments.minimum, moments.maximum), (min(values), max(values)))
+
+    def test_merge(self):
+        """Test that merging two halves gives the same result as one stream."""
+        values = list(range(1, 101))
+        whole, first, second = RunningMoments(), RunningMoments(), RunningMoments()
+        for value in values:
+            whole.add(value)
+            (first if value <= 30 else second).add(value)
+        first.merge(second)
+        first.merge(RunningMoments())
+        self.assertEqual(first.count, whole.count)
+        self.assertAlmostEqual(first.mean, whole.mean)
+        self.assertAlmostEqual(first.variance, whole.variance)
+        self.assertEqual((first.minimum, first.maximum), (1, 100))
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_relative_accuracy(self):
+        """Test that quantiles are within the requested relative error."""
+        rng = random.Random(2)
+        values = sorted(rng.expovariate(0.01) for _ in range(20000))
+        sketch = QuantileSketch(accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        for fraction in (0.1, 0.5, 0.9, 0.99):
+            exact = values[int(fraction * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(fraction) - exact), 0.01 * exact + 1e-9)
+        self.assertLess(len(sketch.buckets), 1500)
+
+    def test_zeros_and_merge(self):
+        """Test zero values and merging sketches."""
+        first, second = QuantileSketch(), QuantileSketch()
+        first.add(0, 3)
+        second.add(10, 1)
+        first.merge(second)
+        self.assertEqual(first.count, 4)
+        self.assertEqual(first.quantile(0.5), 0.0)
+        self.assertAlmostEqual(first.quantile(1.0), 10, delta=0.1)
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+        with self.assertRaises(ValueError):
+            first.merge(QuantileSketch(accuracy=0.05))
+        with self.assertRaises(ValueError):
+            first.add(-1)
+
+    def test_bounded_buckets(self):
+        """Test that the lowest buckets are folded once the sketch is full."""
+        sketch = QuantileSketch(accuracy=0.01, max_buckets=10)
+        for value in range(1, 1000):
+            sketch.add(value)
+        self.assertEqual(len(sketch.buckets), 10)
+        self.assertEqual(sketch.count, 999)
+        self.assertAlmostEqual(sketch.quantile(1.0), 999, delta=10)
+
+
+class TestWilsonInterval(unittest.TestCase):
+
+    def test_interval(self):
+        """Test the Wilson interval against known values."""
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=4)
+        self.assertAlmostEqual(high, 0.5962, places=4)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        self.assertAlmostEqual(wilson_interval(0, 10)[0], 0.0)
+        self.assertLess(wilson_interval(0, 10)[1], 0.35)
+
+
+class TestConfidenceSequence(unittest.TestCase):
+
+    def test_interval(self):
+        """Test that the sequence is wider than Wilson's and narrows with more trials."""
+        self.assertEqual(confidence_sequence(0, 0), (0.0, 1.0))
+        wilson = wilson_interval(5000, 10000)
+        low, high = confidence_sequence(5000, 10000)
+        self.assertLess(low, wilson[0])
+        self.assertGreater(high, wilson[1])
+        self.assertAlmostEqual((low + high) / 2, 0.5)
+        self.assertLess(confidence_sequence(50000, 100000)[1], high)
+        self.assertGreater(confidence_sequence(5000, 10000, alpha=0.001)[1], high)
+
+    def test_holds_when_checked_often(self):
+        """Test that checking after every 50 trials rarely ever excludes the true rate."""
+        rng = random.Random(3)
+        excluded = 0
+        for _ in range(200):
+            successes = 0
+            for trials in range(1, 5001):
+                successes += rng.random() < 0.3
+                if trials % 50 == 0:
+                    low, high = confidence_sequence(successes, trials, alpha=0.05)
+                    if not low <= 0.3 <= high:
+                        excluded += 1
+                        break
+        self.assertLessEqual(excluded, 10)
+
+
+class TestGameStats(unittest.TestCase):
+
+    def setUp(self):
+        self.results = [simulate_game(3, seed=seed) for seed in range(300)]
+
+    def test_add(self):
+        """Test that the aggregate agrees with the individual results."""
+        stats = GameStats(3).add_all(iter(self.results))
+        self.assertEqual(stats.games, 300)
+        self.assertEqual(sum(stats.wins) + stats.unfinished, 300)
+        self.assertEqual(sum(stats.wins_by_position), sum(stats.wins))
+        self.assertEqual(stats.wins[0], sum(result.winner == 1 for result in self.results))
+        self.assertAlmostEqual(stats.turns.mean, statistics.fmean(r.turns for r in self.results))
+        self.assertEqual(stats.hands.count, 600)
+        self.assertEqual(stats.turn_histogram.count, 300)
+        low, high = stats.win_interval(1)
+        self.assertLess(low, stats.win_rate(1))
+        self.assertLess(stats.win_rate(1), high)
+        self.assertEqual(stats.to_dict()["games"], 300)
+
+    def test_merge(self):
+        """Test that stats from workers merge into the stats of the whole run."""
+        whole = GameStats(3).add_all(self.results)
+        parts = [GameStats(3).add_all(self.results[start:start + 100])
+                 for start in range(0, 300, 100)]
+        merged = pickle.loads(pickle.dumps(parts[0]))
+        for part in parts[1:]:
+            merged.merge(part)
+        self.assertEqual(merged.wins, whole.wins)
+        self.assertAlmostEqual(merged.turns.variance, whole.turns.variance)
+        self.assertEqual(merged.turn_quantiles.buckets, whole.turn_quantiles.buckets)
+        self.assertEqual(merged.hand_histogram.counts, whole.hand_histogram.counts)
+        with self.assertRaises(ValueError):
+            merged.merge(GameStats(2))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_add_batch(self):
+        """Test that a batch adds up the same as its games one by one."""
+        batch = simulate_batch(500, num_players=3, seed=3)
+        by_batch = GameStats(3)
+        by_batch.add_batch(batch)
+        one_by_one = GameStats(3)
+        for index in range(len(batch)):
+            one_by_one.add(_Row(batch, index))
+        self.assertEqual(by_batch.wins, one_by_one.wins)
+        self.assertEqual(by_batch.wins_by_position, one_by_one.wins_by_position)
+        self.assertAlmostEqual(by_batch.turns.variance, one_by_one.turns.variance)
+        self.assertAlmostEqual(by_batch.hands.mean, one_by_one.hands.mean)
+        self.assertEqual(by_batch.hand_histogram.counts, one_by_one.hand_histogram.counts)
+        self.assertEqual(by_batch.turn_quantiles.buckets, one_by_one.turn_quantiles.buckets)
+
+
+class _Row:
+    """One game of a BatchResult, looking like a GameResult."""
+
+    def __init__(self, batch, index):
+        self.winner = int(batch.winner[index])
+        self.first_player = int(batch.first_player[index])
+        self.turns = int(batch.turns[index])
+        self.crashes = int(batch.crashes[index])
+        self.hands = tuple(int(hand) for hand in batch.hands[index])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# store_test.py
+# This file lets me see if the result store is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+
+from penny_game import store as store_module
+from penny_game.batch import run_batch
+from penny_game.simulation import simulate_game
+from penny_game.store import ResultStore
+
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.store")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_batch_rows(self):
+        """Test that a batch appends every game with its seed, number and settings."""
+        store = ResultStore(self.path, num_players=3)
+        stats = run_batch(40, players=3, strategies="threshold", seed=9, output=store,
+                          workers=1, shard_size=15)
+        self.assertEqual(len(store), 40)
+        self.assertEqual(list(store.where(seed=9)), list(range(40)))
+        self.assertEqual(store.config(0)["strategies"], ["threshold"] * 3)
+        wins = [store.count(winner=seat) for seat in (1, 2, 3)]
+        self.assertEqual(wins, stats.wins)
+        row = store.row(7)
+        self.assertEqual((row["seed"], row["game"], row["config"]), (9, 7, 0))
+        self.assertEqual(row["hands"][row["winner"] - 1], 0)
+
+    def test_results_and_path_output(self):
+        """Test appending GameResults and opening a store from a path in run_batch."""
+        results = [simulate_game(2, seed=seed) for seed in (11, 12)]
+        store = ResultStore(self.path, num_players=2)
+        store.append_results(results, config={"source": "tests"})
+        run_batch(5, players=2, seed=3, output=self.path, workers=1)
+        store = ResultStore(self.path)
+        self.assertEqual(len(store), 7)
+        self.assertEqual(store.row(1)["game"], store_module.ROOT_GAME)
+        self.assertEqual(store.row(1)["turns"], results[1].turns)
+        self.assertEqual(store.count(config={"source": "tests"}), 2)
+        self.assertEqual(store.count(config={"source": "elsewhere"}), 0)
+        self.assertEqual(store.count(config=1), 5)
+
+    def test_filters(self):
+        """Test equality and half-open range filters, limits and seat columns."""
+        store = ResultStore(self.path, num_players=2)
+        store.append(5, np.arange(6), [1, 2, 1, 2, 0, 1], 1, [10, 20, 30, 40, 50, 60],
+                     [1, 2, 3, 4, 5, 6], [[0, 3], [4, 0], [0, 9], [1, 0], [2, 2], [0, 5]])
+        self.assertEqual(list(store.where(winner=1, turns=(None, 60))), [0, 2])
+        self.assertEqual(list(store.where(turns=(30, None))), [2, 3, 4, 5])
+        self.assertEqual(list(store.where(hand_2=(3, 6))), [0, 5])
+        self.assertEqual(list(store.where(winner=1, limit=2)), [0, 2])
+        self.assertEqual(store.count(), 6)
+        self.assertIsNone(store.row(4)["winner"])
+        for filters in ({"hand_3": 1}, {"hands": 1}, {"colour": 1}, {"turns": (1, 2, 3)}):
+            with self.assertRaises(ValueError):
+                store.where(**filters)
+
+    def test_index(self):
+        """Test that seed lookups agree before, after and beyond the index."""
+        store = ResultStore(self.path, num_players=2)
+        for seed in (3, 1, 2):
+            store.append(seed, np.arange(4), 1, 1, 10, 0, [[0, 1]] * 4)
+        unindexed = list(store.where(seed=1, game=(1, 3)))
+        self.assertEqual(store.build_index(), 12)
+        self.assertEqual(list(store.where(seed=1, game=(1, 3))), unindexed)
+        self.assertEqual(unindexed, [5, 6])
+        store.append(1, 4, 2, 1, 10, 0, [[1, 0]])
+        self.assertEqual(list(store.where(seed=1)), [4, 5, 6, 7, 12])
+        self.assertEqual(store.count(seed=1, winner=2), 1)
+        self.assertEqual(store.count(seed=4), 0)
+
+    def test_index_by_game(self):
+        """Test that seed and game lookups through the index agree with a full scan."""
+        store = ResultStore(self.path, num_players=2)
+        rng = np.random.default_rng(4)
+        for _ in range(6):
+            size = int(rng.integers(1, 40))
+            store.append(int(rng.integers(-3, 3)), rng.integers(-1, 20, size), 1, 1,
+                         rng.integers(1, 90, size), 0, np.zeros((size, 2)))
+        queries = [{"seed": seed, "game": game}
+                   for seed in range(-4, 4) for game in (None, -1, 0, 7, (3, 9), (None, 5),
+                                                         (12, None), (9, 3))]
+        scanned = [list(store.where(**query)) for query in queries]
+        store.build_index()
+        for query, rows in zip(queries, scanned):
+            self.assertEqual(list(store.where(**query)), rows, query)
+            self.assertEqual(list(store.where(turns=(None, 50), **query)),
+                             [row for row in rows if store.row(row)["turns"] < 50])
+            self.assertEqual(store.count(**query), len(rows))
+
+    def test_cut_short_write(self):
+        """Test that a partly written append is ignored, then trimmed by the next one."""
+        store = ResultStore(self.path, num_players=2)
+        store.append(1, [0, 1], 1, 1, 10, 0, [[0, 1], [0, 2]])
+        with open(os.path.join(self.path, "seed.bin"), "ab") as column_file:
+            column_file.write(np.int64(1).tobytes())
+        self.assertEqual(len(store), 2)
+        store.append(2, 0, 2, 1, 30, 0, [[4, 0]])
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.row(2)["seed"], 2)
+        self.assertEqual(store.row(2)["turns"], 30)
+
+    def test_chunked_scan(self):
+        """Test that scans give the same answer whatever the chunk size."""
+        store = ResultStore(self.path, num_players=2)
+        store.append(0, np.arange(100), np.arange(100) % 2 + 1, 1, np.arange(100), 0,
+                     np.zeros((100, 2)))
+        expected = list(store.where(winner=2, turns=(10, 90)))
+        chunk_rows = store_module.CHUNK_ROWS
+        store_module.CHUNK_ROWS = 7
+        try:
+            self.assertEqual(list(store.where(winner=2, turns=(10, 90))), expected)
+            self.assertEqual(store.count(winner=2, turns=(10, 90)), len(expected))
+            self.assertEqual(len(store.where(winner=2, limit=10)), 10)
+        finally:
+            store_module.CHUNK_ROWS = chunk_rows
+
+    def test_open(self):
+        """Test that a store needs a seat count when new and keeps it after."""
+        with self.assertRaises(ValueError):
+            ResultStore(self.path)
+        ResultStore(self.path, num_players=4)
+        self.assertEqual(ResultStore(self.path).num_players, 4)
+        self.assertEqual(len(ResultStore(self.path)), 0)
+        with self.assertRaises(ValueError):
+            ResultStore(self.path, num_players=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
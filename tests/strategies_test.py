@@ -0,0 +1,111 @@
+# strategies_test.py
+# This file lets me see if the COM reroll strategies are working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.bitmask_board import BitmaskBoard
+from penny_game.dice import DiceStream
+from penny_game.game import Game
+from penny_game.player import Player
+from penny_game.simulation import simulate_game
+from penny_game.strategies import (
+    BustProbabilityStrategy,
+    LegacyStrategy,
+    RandomStrategy,
+    ThresholdStrategy,
+    get_strategy,
+)
+
+
+def board_with(*slots):
+    """Build a board with one penny in each of the given slots."""
+    board = BitmaskBoard()
+    for slot in slots:
+        board.add_penny(slot)
+    return board
+
+
+class TestStrategies(unittest.TestCase):
+
+    def setUp(self):
+        self.player = Player(dice=DiceStream(0))
+
+    def test_threshold(self):
+        """Test that the threshold strategy stops at the set number of occupied slots."""
+        strategy = ThresholdStrategy(2)
+        self.assertTrue(strategy(self.player, board_with(1)))
+        self.assertFalse(strategy(self.player, board_with(1, 2)))
+        # Slot 6 does not count as occupied
+        self.assertTrue(strategy(self.player, board_with(1, 6)))
+
+    def test_bust_probability(self):
+        """Test that the bust strategy compares the exact crash chance to its limit."""
+        strategy = BustProbabilityStrategy(max_risk=2 / 6)
+        self.assertTrue(strategy(self.player, board_with(1, 2)))
+        self.assertFalse(strategy(self.player, board_with(1, 2, 3)))
+        self.player.hand = 1
+        self.assertTrue(strategy(self.player, board_with(1, 2, 3, 4, 5)))
+
+    def test_legacy_probability(self):
+        """Test that the legacy rule scales its risk by the pennies on the board."""
+        strategy = LegacyStrategy()
+        self.assertEqual(strategy.reroll_probability(0, 20), 1.0)
+        self.assertAlmostEqual(strategy.reroll_probability(0b111, 20), 1 - 3 * 0.16)
+        self.assertAlmostEqual(strategy.reroll_probability(0b111111, 20), 0.04)
+
+    def test_memo_is_shared(self):
+        """Test that identical strategies share one memo and different ones do not."""
+        first, second = ThresholdStrategy(3), ThresholdStrategy(3)
+        self.assertIs(first.memo, second.memo)
+        self.assertIsNot(first.memo, ThresholdStrategy(4).memo)
+        first(self.player, board_with(2))
+        self.assertIn(0b10 | self.player.hand << 6, second.memo)
+
+    def test_random_uses_player_dice(self):
+        """Test that a random strategy draws from the player's dice stream."""
+        strategy = RandomStrategy(0.5)
+        decisions = [strategy(self.player, board_with()) for _ in range(200)]
+        self.assertIn(True, decisions)
+        self.assertIn(False, decisions)
+
+    def test_get_strategy(self):
+        """Test that strategies can be built by name."""
+        self.assertIsInstance(get_strategy("threshold", max_occupied=3), ThresholdStrategy)
+        with self.assertRaises(ValueError):
+            get_strategy("psychic")
+
+
+class TestMixedTable(unittest.TestCase):
+
+    def test_create_players_with_strategies(self):
+        """Test that Game.create_players gives each seat its strategy."""
+        game = Game()
+        game.numplayers = 3
+        game.numcom = 3
+        threshold, legacy = ThresholdStrategy(), LegacyStrategy()
+        game.create_players(strategies={1: threshold, 3: legacy})
+        self.assertIs(game.players[1].strategy, threshold)
+        self.assertIsNone(game.players[2].strategy)
+        self.assertIs(game.players[3].strategy, legacy)
+
+    def test_check_reroll_uses_strategy(self):
+        """Test that check_reroll asks the strategy when it is given the board."""
+        player = Player(strategy=ThresholdStrategy(1))
+        self.assertFalse(player.check_reroll(board=board_with(4)))
+
+    def test_mixed_simulation(self):
+        """Test that a table mixing every strategy plays to a winner."""
+        strategies = [RandomStrategy(), ThresholdStrategy(), BustProbabilityStrategy(),
+                      LegacyStrategy()]
+        result = simulate_game(4, seed=11, strategies=strategies)
+        self.assertIn(result.winner, range(1, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+# sweep_test.py
+# This file lets me see if the parameter sweeps and their cache are working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.sweep import expand_grid, play_shard, run_sweep, shard_key
+
+
+class TestExpandGrid(unittest.TestCase):
+
+    def test_cells(self):
+        """Test that a grid expands into fully written-out cells."""
+        cells = expand_grid({"players": [2, 3], "rules": ["standard", "legacy"],
+                             "strategies": ["random", ("bust", {"max_risk": 0.5})]})
+        self.assertEqual(len(cells), 8)
+        self.assertEqual(cells[0], {
+            "players": 2, "com": 2,
+            "rules": {"slots": 6, "starting_hand": 20, "die_faces": 6, "free_slot": 6},
+            "strategies": ["random", "random"],
+        })
+        self.assertEqual(cells[1]["strategies"], [["bust", {"max_risk": 0.5}]] * 2)
+        self.assertEqual(cells[2]["rules"]["starting_hand"], 10)
+
+    def test_invalid(self):
+        """Test that impossible grids raise a ValueError."""
+        for grid in ({"seats": [2]}, {"rules": ["legacy"]}, {"players": 2, "com": 3},
+                     {"players": 2, "com": 1}, {"players": 2, "strategies": [["random"]]}):
+            with self.assertRaises(ValueError):
+                expand_grid(grid)
+
+    def test_keys(self):
+        """Test that shard keys change with every part of the work."""
+        config = expand_grid({"players": 2})[0]
+        key = shard_key(config, 1, 0, 100, 10000)
+        self.assertEqual(key, shard_key(dict(reversed(list(config.items()))), 1, 0, 100, 10000))
+        for changed in ((config, 2, 0, 100, 10000), (config, 1, 100, 100, 10000),
+                        (config, 1, 0, 50, 10000), (config, 1, 0, 100, 500),
+                        (expand_grid({"players": 3})[0], 1, 0, 100, 10000)):
+            self.assertNotEqual(shard_key(*changed), key)
+
+
+class TestRunSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cache_reuse(self):
+        """Test that a sweep only plays the shards it has not played before."""
+        grid = {"players": [2, 3], "strategies": ["threshold"]}
+        first = run_sweep(grid, games=30, seed=2, shard_size=10, workers=1, cache_dir=self.cache)
+        self.assertEqual([(cell.computed, cell.cached) for cell in first], [(3, 0), (3, 0)])
+
+        again = run_sweep(grid, games=30, seed=2, shard_size=10, workers=1, cache_dir=self.cache)
+        self.assertEqual([(cell.computed, cell.cached) for cell in again], [(0, 3), (0, 3)])
+        for old, new in zip(first, again):
+            self.assertEqual(old.stats.wins, new.stats.wins)
+            self.assertAlmostEqual(old.stats.turns.mean, new.stats.turns.mean)
+
+        grid["strategies"].append("random")
+        grown = run_sweep(grid, games=40, seed=2, shard_size=10, workers=1, cache_dir=self.cache)
+        self.assertEqual([(cell.computed, cell.cached) for cell in grown],
+                         [(1, 3), (4, 0), (1, 3), (4, 0)])
+        self.assertEqual(grown[0].stats.games, 40)
+
+    def test_matches_direct_play(self):
+        """Test that sharded results equal one shard of the same games."""
+        cell = run_sweep({"players": 3, "rules": "legacy"}, games=25, seed=7, shard_size=10,
+                         workers=1, cache_dir=False)[0]
+        whole = play_shard(cell.config, 7, 0, 25)
+        self.assertEqual(cell.stats.wins, whole.wins)
+        self.assertEqual(cell.stats.turn_histogram.counts, whole.turn_histogram.counts)
+        self.assertEqual(cell.computed, 3)
+
+    def test_workers(self):
+        """Test that worker processes give the same results as one process."""
+        grid = {"players": 2, "strategies": ["random", "legacy"]}
+        alone = run_sweep(grid, games=20, seed=3, shard_size=5, workers=1, cache_dir=False)
+        pooled = run_sweep(grid, games=20, seed=3, shard_size=5, workers=2,
+                           cache_dir=self.cache)
+        for one, other in zip(alone, pooled):
+            self.assertEqual(one.stats.wins, other.stats.wins)
+            self.assertEqual(one.stats.crashes.count, other.stats.crashes.count)
+        self.assertEqual(sum(len(files) for _, _, files in os.walk(self.cache)), 8)
+
+    def test_precision_stop(self):
+        """Test that cells stop once their win rates are known, cached shards included."""
+        grid = {"players": [2, 3], "strategies": "threshold"}
+        cells = run_sweep(grid, games=20000, seed=4, shard_size=500, workers=1,
+                          cache_dir=self.cache, precision=0.05)
+        for cell in cells:
+            self.assertTrue(cell.decided)
+            self.assertLess(cell.stats.games, 20000)
+            self.assertEqual(cell.stats.games, cell.computed * 500)
+        again = run_sweep(grid, games=20000, seed=4, shard_size=500, workers=2,
+                          cache_dir=self.cache, precision=0.05)
+        for old, new in zip(cells, again):
+            self.assertEqual((new.computed, new.stats.wins), (0, old.stats.wins))
+
+    def test_corrupt_shard(self):
+        """Test that an unreadable shard is played again."""
+        run_sweep({"players": 2}, games=10, seed=1, shard_size=10, workers=1,
+                  cache_dir=self.cache)
+        for root, _, files in os.walk(self.cache):
+            for name in files:
+                with open(os.path.join(root, name), "wb") as shard_file:
+                    shard_file.write(b"not a shard")
+        cell = run_sweep({"players": 2}, games=10, seed=1, shard_size=10, workers=1,
+                         cache_dir=self.cache)[0]
+        self.assertEqual((cell.computed, cell.cached), (1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
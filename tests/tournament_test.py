@@ -0,0 +1,70 @@
+# tournament_test.py
+# This file lets me see if the tournament runner is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from penny_game.tournament import play_shard, run_tournament
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_round_robin(self):
+        """Test that every pair of strategies plays the requested number of games."""
+        results = run_tournament(["random", "threshold", "legacy"], games_per_matchup=30,
+                                 seed=1, workers=1, shard_size=8)
+        self.assertEqual(len(results), 3)
+        for matchup in results:
+            self.assertEqual(matchup.games, 30)
+            self.assertEqual(sum(matchup.wins) + matchup.unfinished, 30)
+            self.assertGreater(matchup.average_turns(), 0)
+
+    def test_worker_count_does_not_change_results(self):
+        """Test that a pool of workers plays exactly the same games as one process."""
+        specs = ["random", ("threshold", {"max_occupied": 3})]
+        alone = run_tournament(specs, games_per_matchup=20, seed=5, workers=1, shard_size=6)
+        pooled = run_tournament(specs, games_per_matchup=20, seed=5, workers=2, shard_size=6)
+        self.assertEqual(alone[0].wins, pooled[0].wins)
+        self.assertEqual(alone[0].total_turns, pooled[0].total_turns)
+        self.assertEqual(alone[0].total_crashes, pooled[0].total_crashes)
+
+    def test_shard_records(self):
+        """Test that a shard returns one (winner, turns, crashes) triple per game."""
+        records = play_shard(("random", "legacy"), 0, 0, 5, 3, root_seed=2)
+        self.assertEqual(len(records), 15)
+        self.assertTrue(all(winner in (0, 1) for winner in records[::3]))
+
+    def test_sequential_stop(self):
+        """Test that a lopsided matchup stops early with the right leader."""
+        results = run_tournament(["random", "threshold"], games_per_matchup=5000, seed=1,
+                                 workers=1, shard_size=100, alpha=0.01)
+        matchup = results[0]
+        self.assertTrue(matchup.decided)
+        self.assertEqual(matchup.leader, 1)
+        self.assertLess(matchup.games, 5000)
+        low, high = matchup.interval(0.01)
+        self.assertLess(high, 0.5)
+
+    def test_sequential_tie_and_workers(self):
+        """Test that identical strategies stop only by the margin, the same with workers."""
+        alone = run_tournament(["legacy", "legacy"], games_per_matchup=4000, seed=2, workers=1,
+                               shard_size=200, alpha=0.05, margin=0.1)[0]
+        pooled = run_tournament(["legacy", "legacy"], games_per_matchup=4000, seed=2,
+                                workers=2, shard_size=200, alpha=0.05, margin=0.1)[0]
+        self.assertTrue(alone.decided)
+        self.assertIsNone(alone.leader)
+        self.assertLess(alone.games, 4000)
+        self.assertEqual((alone.games, alone.wins), (pooled.games, pooled.wins))
+        undecided = run_tournament(["legacy", "legacy"], games_per_matchup=400, seed=2,
+                                   workers=1, shard_size=200, alpha=0.05)[0]
+        self.assertFalse(undecided.decided)
+        self.assertEqual(undecided.games, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# vector_sim_test.py
+# This file lets me see if the NumPy batch simulator is working properly.
+
+# Created: 10/18/26
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+if np is not None:
+    from penny_game.vector_sim import simulate_batch
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSimulateBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.batch = simulate_batch(2000, num_players=3, seed=5)
+
+    def test_every_game_has_a_winner(self):
+        """Test that each winner finished with an empty hand."""
+        self.assertEqual(len(self.batch), 2000)
+        self.assertTrue(np.all((self.batch.winner >= 1) & (self.batch.winner <= 3)))
+        winner_hands = self.batch.hands[np.arange(2000), self.batch.winner - 1]
+        self.assertTrue(np.all(winner_hands == 0))
+        self.assertTrue(np.all(self.batch.turns >= 1))
+
+    def test_win_rates(self):
+        """Test that the win rates cover every game."""
+        rates = self.batch.win_rates()
+        self.assertEqual(rates.shape, (3,))
+        self.assertAlmostEqual(rates.sum(), 1.0)
+
+    def test_same_seed_same_batch(self):
+        """Test that a seed fully determines the batch."""
+        again = simulate_batch(2000, num_players=3, seed=5)
+        self.assertTrue(np.array_equal(self.batch.turns, again.turns))
+        self.assertTrue(np.array_equal(self.batch.hands, again.hands))
+
+    def test_occupancy_table(self):
+        """Test that a flat reroll table plays exactly like a single probability."""
+        table = simulate_batch(500, num_players=2, seed=9, reroll=np.full(64, 0.7))
+        flat = simulate_batch(500, num_players=2, seed=9, reroll=0.7)
+        self.assertTrue(np.array_equal(table.winner, flat.winner))
+        self.assertTrue(np.array_equal(table.turns, flat.turns))
+
+    def test_bad_table(self):
+        """Test that a reroll table of the wrong size raises a ValueError."""
+        with self.assertRaises(ValueError):
+            simulate_batch(10, num_players=2, reroll=[0.5] * 6)
+
+    def test_step_limit(self):
+        """Test that games cut off by the step limit have no winner."""
+        batch = simulate_batch(50, num_players=2, seed=1, max_steps=3)
+        self.assertTrue(np.all(batch.winner == 0))
+
+
+if __name__ == "__main__":
+    unittest.main()